@@ -0,0 +1,544 @@
+"""
+MarkdownPro 성능 측정 스크립트
+사용법: python benchmark.py [항목 ...]   (항목을 생략하면 전체 실행)
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+import markdown
+from PyQt6.QtCore import QEventLoop, QRegularExpression, Qt, QTimer
+from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QTextCursor, QTextDocument
+from PyQt6.QtWidgets import QApplication, QPlainTextDocumentLayout, QPlainTextEdit, QTreeWidget, QTreeWidgetItem
+
+import markdown_editor as me
+import markdown_render as mr
+
+SAMPLE_BLOCK = """## 설치
+
+`pip install` 로 **의존성**을 설치합니다.
+
+| 이름 | 설명 |
+|------|------|
+| a | b |
+
+```python
+def hello():
+    print("Hello")
+```
+"""
+
+
+def timed(func, repeat):
+    """func를 repeat번 실행하고 1회당 평균 시간(ms)을 반환"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_converter(repeat=300):
+    """렌더마다 markdown.Markdown 생성 vs 공유 변환기 reset()"""
+    fresh = timed(lambda: markdown.Markdown(extensions=mr.MARKDOWN_EXTENSIONS).convert(SAMPLE_BLOCK), repeat)
+    converter = mr.MarkdownConverter()
+    shared = timed(lambda: converter.convert(SAMPLE_BLOCK), repeat)
+    setup = timed(lambda: markdown.Markdown(extensions=mr.MARKDOWN_EXTENSIONS), repeat)
+    print(f"[converter] 매번 생성: {fresh:.3f} ms/렌더, 공유 변환기: {shared:.3f} ms/렌더, "
+          f"생성 비용만: {setup:.3f} ms ({fresh / shared:.1f}배)")
+
+
+# ----- 구조 스캔 이전의 방식 (비교용) -----
+
+def regex_stats(text):
+    lines = text.split('\n')
+    words = text.split()
+    return {
+        'lines': len(lines),
+        'words': len(words),
+        'chars_no_space': len(text.replace(' ', '').replace('\n', '')),
+        'paragraphs': len([p for p in text.split('\n\n') if p.strip()]),
+        'headers': len(re.findall(r'^#{1,6}\s', text, re.MULTILINE)),
+        'links': len(re.findall(r'\[([^\]]+)\]\([^)]+\)', text)),
+        'images': len(re.findall(r'!\[([^\]]*)\]\([^)]+\)', text)),
+        'code_blocks': len(re.findall(r'```[\s\S]*?```', text)),
+        'mermaid_blocks': len(re.findall(r'```mermaid[\s\S]*?```', text)),
+    }
+
+
+def regex_outline(text):
+    headings = []
+    for i, line in enumerate(text.split('\n')):
+        match = re.match(r'^(#{1,6})\s+(.+)$', line)
+        if match:
+            headings.append((i, len(match.group(1)), match.group(2)))
+    return headings
+
+
+def regex_split_blocks(text):
+    lines = text.split('\n')
+    spans = []
+    start = None
+    fence = None
+    for i, line in enumerate(lines):
+        if fence is not None:
+            if line.rstrip(' ') == fence:
+                spans.append((start, i + 1, True))
+                start = fence = None
+            continue
+        m = me.FENCE_OPEN_PATTERN.match(line)
+        if m:
+            if start is not None:
+                spans.append((start, i, False))
+            start = i
+            fence = m.group(1)
+            continue
+        if not line.strip():
+            if start is not None:
+                spans.append((start, i, False))
+                start = None
+            continue
+        if start is None:
+            start = i
+            if spans and not spans[-1][2]:
+                prev_first = lines[spans[-1][0]]
+                if line[0] in ' \t' or (me.LIST_ITEM_PATTERN.match(prev_first) and me.LIST_ITEM_PATTERN.match(line)):
+                    start = spans.pop()[0]
+    if start is not None:
+        spans.append((start, len(lines), fence is not None))
+    return [(s, '\n'.join(lines[s:e])) for s, e, _ in spans]
+
+
+def regex_pipeline(text):
+    """입력 한 번에 통계 + 개요 + 미리보기 분할 + Mermaid 추출을 각각 따로 훑던 방식"""
+    regex_stats(text)
+    regex_outline(text)
+    if not me.DOC_SCOPE_PATTERN.search(text):
+        regex_split_blocks(text)
+    re.findall(r'```mermaid\n([\s\S]*?)```', text)
+
+
+def scan_pipeline(text):
+    scan = me.scan_markdown(text)
+    me.DocumentStats.calculate(text, scan)
+    scan.headings
+    if not scan.doc_scope:
+        scan.block_texts()
+    scan.mermaid_sources()
+
+
+def large_document(sections):
+    parts = []
+    for i in range(sections):
+        parts.append(f"# 장 {i}\n\n본문 [링크](https://example.com/{i}) 과 ![그림](img{i}.png) 이 있는 문단입니다.\n"
+                     f"두 번째 줄은 조금 더 길게 써서 단어 수를 늘립니다.\n\n"
+                     f"- 항목 하나\n- 항목 둘\n  - 하위 항목\n\n")
+        parts.append(SAMPLE_BLOCK)
+        if i % 10 == 0:
+            parts.append("```mermaid\nflowchart TD\n    A --> B\n```\n\n")
+    return '\n'.join(parts)
+
+
+def bench_scanner(repeat=10):
+    """키 입력마다 도는 문서 분석: 정규식 여러 번 vs 단일 구조 스캔"""
+    for sections in (200, 2000):
+        text = large_document(sections)
+        assert me.scan_markdown(text).block_texts() == regex_split_blocks(text)
+        old = timed(lambda: regex_pipeline(text), repeat)
+        new = timed(lambda: scan_pipeline(text), repeat)
+        print(f"[scanner] {len(text) // 1024} KB: 정규식 파이프라인 {old:.2f} ms, "
+              f"구조 스캔 {new:.2f} ms ({old / new:.1f}배)")
+
+
+CODE_SAMPLES = [
+    ("python", "def area(r):\n    import math\n    return math.pi * r ** 2\n\nprint(area(3))"),
+    ("javascript", "const xs = [1, 2, 3].map(x => x * 2);\nconsole.log(xs.join(', '));"),
+    ("bash", "for f in *.md; do\n  echo \"$f\"\ndone"),
+    ("", "plain text without a language"),
+]
+
+
+def bench_highlight(repeat=5):
+    """문서 전체 변환([TOC]가 있는 문서)에서 프로즈만 고친 뒤 다시 변환: 매번 Pygments vs 하이라이트 캐시"""
+    parts = ["[TOC]\n"]
+    for i in range(100):
+        lang, code = CODE_SAMPLES[i % len(CODE_SAMPLES)]
+        parts.append(f"## 예제 {i}\n\n설명 문단 {i}\n\n```{lang}\n{code}\n# {i}\n```\n")
+    text = '\n'.join(parts)
+
+    plain = markdown.Markdown(extensions=mr.MARKDOWN_EXTENSIONS)
+
+    def convert_plain():
+        plain.reset()
+        return plain.convert(text)
+
+    converter = mr.MarkdownConverter()
+    assert converter.convert(text) == convert_plain()
+    cache = mr.CodeHighlightCache.shared()
+    cache.hits = cache.misses = 0
+    old = timed(convert_plain, repeat)
+    new = timed(lambda: converter.convert(text), repeat)
+    print(f"[highlight] 코드 블록 100개: codehilite {old:.1f} ms, 캐시 {new:.1f} ms ({old / new:.1f}배), "
+          f"적중 {cache.hits} / 미스 {cache.misses}")
+
+
+class LegacyHighlighter(me.MarkdownHighlighter):
+    """규칙을 블록마다 QRegularExpression으로 새로 만들던 방식 (비교용)"""
+    RULES = [
+        (r'^#{1,6}\s.*$', 'header'),
+        (r'\*\*[^*]+\*\*', 'bold'),
+        (r'(?<!\*)\*(?!\*)[^*]+\*(?!\*)', 'italic'),
+        (r'`[^`]+`', 'code'),
+        (r'\[([^\]]+)\]\([^)]+\)', 'link'),
+        (r'^\s*[-*+]\s', 'list'),
+        (r'^\s*\d+\.\s', 'list'),
+        (r'^```mermaid', 'mermaid'),
+        (r'^```.*$', 'code'),
+    ]
+
+    def highlightBlock(self, text):
+        for pattern, fmt_name in self.RULES:
+            regex = QRegularExpression(pattern)
+            it = regex.globalMatch(text)
+            while it.hasNext():
+                match = it.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(),
+                               self.formats.get(fmt_name, QTextCharFormat()))
+
+
+def highlighter_document(lines):
+    rows = [
+        "# 제목 **굵게** 와 `코드`",
+        "일반 문장에 **굵은 글씨** 와 *기울임* 그리고 [링크](https://example.com) 가 있습니다.",
+        "- 목록 항목 `inline` 코드",
+        "1. 번호 목록",
+        "아무 서식 없는 평범한 줄입니다. 대부분의 줄은 이렇게 생겼습니다.",
+        "",
+        "```python",
+        "def f(x): return x * 2",
+        "```",
+    ]
+    return '\n'.join(rows[i % len(rows)] for i in range(lines))
+
+
+def bench_highlighter(lines=20000):
+    """에디터 구문 강조 rehighlight(): 블록마다 규칙 컴파일 vs 미리 컴파일한 단일 스캐너"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    text = highlighter_document(lines)
+    for name, cls in (('블록마다 컴파일', LegacyHighlighter), ('단일 스캐너', me.MarkdownHighlighter)):
+        doc = QTextDocument()
+        doc.setPlainText(text)
+        highlighter = cls(doc)
+        ms = timed(highlighter.rehighlight, 1)
+        print(f"[highlighter] {name}: {lines}줄 {ms:.0f} ms ({doc.blockCount() / ms * 1000:,.0f} 블록/초)")
+
+
+def bench_model(repeat=200):
+    """키 입력 한 번의 구조 분석: 문서 전체 scan_markdown vs DocumentModel 증분 갱신"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    for sections in (200, 2000):
+        text = large_document(sections)
+        doc = QTextDocument()
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))  # 에디터와 같은 레이아웃 (있어야 contentsChange가 나온다)
+        doc.setPlainText(text)
+        model = me.DocumentModel(doc)
+        cursor = QTextCursor(doc.findBlockByNumber(doc.blockCount() // 2))
+        before = model.parsed_lines
+        cursor.insertText("a")
+        parsed = model.parsed_lines - before
+        position = cursor.position() - 1
+        typed = timed(lambda: model.on_contents_change(position, 1, 1), repeat)
+        full = timed(lambda: me.scan_markdown(doc.toPlainText()), 5)
+        print(f"[model] {doc.blockCount()}줄: 전체 스캔 {full:.2f} ms, 증분 갱신 {typed:.3f} ms/키 입력 "
+              f"(입력당 {parsed}줄 분석)")
+
+
+def bench_live_stats(repeat=200):
+    """상태 표시줄 갱신 한 번: 전체 DocumentStats.calculate vs 증분 단어/글자 수"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    text = large_document(5000)  # 책 한 권 분량
+    doc = QTextDocument()
+    doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+    doc.setPlainText(text)
+    model = me.DocumentModel(doc)
+    cursor = QTextCursor(doc.findBlockByNumber(doc.blockCount() // 2))
+    cursor.insertText("a")
+    position = cursor.position() - 1
+
+    def live():
+        model.on_contents_change(position, 1, 1)
+        return model.word_count, model.character_count()
+
+    full = timed(lambda: me.DocumentStats.calculate(doc.toPlainText()), 5)
+    delta = timed(live, repeat)
+    assert live() == (len(doc.toPlainText().split()), len(doc.toPlainText()))
+    print(f"[live_stats] {len(text) // 1024} KB: 전체 계산 {full:.1f} ms, 증분 {delta * 1000:.1f} µs/키 입력")
+
+
+def legacy_outline(tree, headings):
+    """기존 OutlinePanel.update_outline - 매번 트리 전체를 다시 만든다"""
+    tree.clear()
+    stack = [(None, -1)]
+    for i, level, title in headings:
+        item = QTreeWidgetItem([title])
+        item.setData(0, Qt.ItemDataRole.UserRole, i)
+        while stack and stack[-1][1] >= level:
+            stack.pop()
+        if stack and stack[-1][0]:
+            stack[-1][0].addChild(item)
+        else:
+            tree.addTopLevelItem(item)
+        stack.append((item, level))
+    tree.expandAll()
+
+
+def bench_outline(count=30000, repeat=20):
+    """제목 하나 수정/추가 시 개요 갱신: 트리 전체 재생성 vs 모델 비교 갱신"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    headings = [(i * 4, 1 + i % 3, f"제목 {i}") for i in range(count)]
+    middle = count // 2
+    edited = list(headings)
+    edited[middle] = (middle * 4, edited[middle][1], "바뀐 제목")
+    inserted = headings[:middle] + [(middle * 4 - 2, 2, "새 제목")] + headings[middle:]
+
+    tree = QTreeWidget()
+    legacy = timed(lambda: legacy_outline(tree, edited), 2)
+
+    panel = me.OutlinePanel()
+    panel.update_outline(headings)
+    results = []
+    for changed in (edited, inserted):
+        variants = iter([changed, headings] * repeat)
+        results.append(timed(lambda: panel.update_outline(next(variants)), repeat * 2))
+    print(f"[outline] 제목 {count:,}개: 전체 재생성 {legacy:.0f} ms, 비교 갱신 - 제목 수정 {results[0]:.1f} ms, "
+          f"제목 추가/삭제 {results[1]:.1f} ms (전체 리셋 {panel.model.resets}회)")
+
+def bench_goto(lines=100000, repeat=20):
+    """줄 이동: NextBlock 반복 vs findBlockByNumber"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    doc = QTextDocument()
+    doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+    doc.setPlainText('\n'.join(f"줄 {i}" for i in range(lines)))
+    target = lines - 10
+
+    def walk():
+        cursor = QTextCursor(doc)
+        for _ in range(target):
+            cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
+        return cursor
+
+    def lookup():
+        return QTextCursor(doc.findBlockByNumber(target))
+
+    assert walk().blockNumber() == lookup().blockNumber() == target
+    print(f"[goto] {lines:,}줄 문서의 {target:,}번 줄: NextBlock 반복 {timed(walk, 2):.1f} ms, "
+          f"findBlockByNumber {timed(lookup, repeat) * 1000:.1f} µs")
+
+
+def bench_emoji(repeat=200):
+    """이모지 검색: 항목마다 이름 비교 vs EmojiIndex (find + 이분 탐색)"""
+    entries = me.EmojiIndex.build_catalog()
+    index = me.EmojiIndex(entries)
+    names = [(e, n.lower(), c) for e, n, c in entries]
+    queries = ['heart', 'face', 'arrow', '표정', 'zzz']
+
+    def scan():
+        for q in queries:
+            [i for i, (e, n, c) in enumerate(names) if q in e or q in n or q in c]
+
+    def indexed():
+        for q in queries:
+            index.search(q)
+
+    build = timed(me.EmojiIndex.build_catalog, 5)
+    print(f"[emoji] {len(entries):,}개: 카탈로그 생성 {build:.1f} ms, 검색 5회 - 전체 비교 {timed(scan, repeat) * 1000:.0f} µs, "
+          f"색인 {timed(indexed, repeat) * 1000:.0f} µs")
+
+
+def bench_replace_all(replacements=100000):
+    """10 MB 문서에서 모두 바꾸기: subn + setPlainText vs 찾은 구간만 편집 (강조기/문서 모델 연결 상태, 탐색은 worker 프로세스)"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    line = "필드 alpha 값을 기록합니다 " + "-" * 60
+    text = '\n'.join([line] * replacements)
+    pad = 10 * 1024 * 1024 - len(text.encode('utf-8'))
+    if pad > 0:
+        text += '\n' + '\n'.join(["내용 " * 20] * (pad // 100))
+
+    def setup():
+        editor = QPlainTextEdit()
+        model = me.DocumentModel(editor.document())
+        me.MarkdownHighlighter(editor.document())
+        editor.setPlainText(text)
+        return editor, model
+
+    editor, model = setup()
+    start = time.perf_counter()
+    new_text, count = re.subn('alpha', 'beta', editor.toPlainText())
+    editor.setPlainText(new_text)
+    legacy = time.perf_counter() - start
+    assert count == replacements
+
+    editor, model = setup()
+    dialog = me.FindReplaceDialog(editor, model)
+    dialog.find_edit.setText('alpha')
+    dialog.replace_edit.setText('beta')
+    start = time.perf_counter()
+    dialog.replace_all()
+    while dialog._replace_job is not None:
+        app.processEvents()
+    ranged = time.perf_counter() - start
+    dialog.regex_worker.shutdown()
+    assert editor.toPlainText() == new_text
+    editor.undo()
+    assert editor.toPlainText() == text
+    print(f"[replace_all] {len(text.encode('utf-8')) >> 20} MB, {replacements:,}개: subn+setPlainText {legacy:.1f} s (실행 취소 불가), "
+          f"찾은 구간만 편집 {ranged:.1f} s (실행 취소 1단계)")
+
+
+def bench_regex_guard(length=23):
+    """폭주 역추적 패턴 (a+)+$: UI 스레드에서 실행 vs RegexWorker 프로세스 (이벤트 루프 최대 정지 시간)"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    text = "a" * length + "b"
+    pattern = me.compile_search_pattern(r'(a+)+$', regex=True)
+    start = time.perf_counter()
+    me.find_line_matches(pattern, text)
+    inline = time.perf_counter() - start
+
+    worker = me.RegexWorker(budget=inline / 2)
+    done = []
+    worker.finished.connect(lambda job, result: done.append('done'))
+    worker.timed_out.connect(lambda job: done.append('timeout'))
+    ticks = []
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    timer.start(10)
+    start = time.perf_counter()
+    worker.submit('lines', pattern, text)
+    while not done:
+        app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents)
+    isolated = time.perf_counter() - start
+    timer.stop()
+    worker.shutdown()
+    stall = max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    cached = timed(lambda: me.compile_search_pattern(r'(\w+)@(\w+)\.com', False, True, True), 10000)
+    uncached = timed(lambda: me.compile_search_pattern.__wrapped__(r'(\w+)@(\w+)\.com', False, True, True), 10000)
+    print(f"[regex_guard] (a+)+$ {length}자: UI 스레드 {inline * 1000:.0f} ms 정지, "
+          f"worker {done[0]} {isolated * 1000:.0f} ms (최대 정지 {stall * 1000:.0f} ms); "
+          f"패턴 컴파일 캐시 {cached * 1000:.1f} µs vs {uncached * 1000:.1f} µs")
+
+
+def bench_workspace_search(files=3000):
+    """폴더 검색: 파일을 모두 읽어 찾기 vs 위치 역색인 (첫 색인, 저장된 색인 읽기, 검색, 파일 하나 갱신)"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    root = tempfile.mkdtemp()
+    me.SEARCH_INDEX_DIR = os.path.join(root, '.index')
+    words = "설치 설정 문서 예제 서버 클라이언트 요청 응답 캐시 색인 검색 결과 alpha beta gamma delta".split()
+    paths = []
+    for i in range(files):
+        path = os.path.join(root, f"dir{i % 30}", f"note{i}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        body = '\n'.join(' '.join(words[(i * 7 + j * 3 + k) % len(words)] for k in range(12)) for j in range(60))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"# 노트 {i}\n\n{body}\nrelease {i} quick brown fox\n")
+        paths.append(path)
+    try:
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                'quick brown fox 17' in f.read()
+        scan = time.perf_counter() - start
+
+        index = me.WorkspaceIndex(root)
+        start = time.perf_counter()
+        index._reindex(paths, [])
+        build = time.perf_counter() - start
+        workers = min(os.cpu_count() or 1, 8)
+        start = time.perf_counter()
+        index._save()
+        save = time.perf_counter() - start
+
+        loaded = me.WorkspaceIndex(root)
+        start = time.perf_counter()
+        loaded._load()
+        load = time.perf_counter() - start
+        assert loaded.file_count() == files
+
+        queries = ['fox', '"quick brown fox"', '설치 서버', '"release 1234"', '색']
+        per_query = {q: timed(lambda q=q: loaded.search(q), 20) for q in queries}
+
+        with open(paths[0], 'a', encoding='utf-8') as f:
+            f.write("unicorn\n")
+        start = time.perf_counter()
+        loaded._reindex([paths[0]], [])
+        update = time.perf_counter() - start
+        assert loaded.search('unicorn')[1] == 1
+        size = os.path.getsize(loaded.path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print(f"[workspace_search] {files:,}개 파일: 매번 모두 읽기 {scan * 1000:.0f} ms | 색인 만들기 {build:.2f} s "
+          f"(프로세스 {workers}개), 저장 {save * 1000:.0f} ms, 저장된 색인 읽기 {load * 1000:.0f} ms ({size >> 10} KB), 파일 하나 갱신 {update * 1000:.0f} ms")
+    print("    검색: " + ', '.join(f"{q} {ms:.2f} ms" for q, ms in per_query.items()))
+
+
+def bench_quick_open(files=50000, repeat=20):
+    """빠른 열기: 모든 항목 점수 매기기 vs trigram 후보 추리기 (5만 개 경로 + 첫 제목)"""
+    words = "guide setup server client cache index search result release notes api design draft meeting".split()
+    korean = "설치 설정 문서 예제 서버 회의록 초안 배포 검색".split()
+    entries = []
+    for i in range(files):
+        a, b, c = words[i % 14], words[(i // 14) % 14], korean[(i // 7) % 9]
+        entries.append((f"projects/p{i % 400}/{a}/{b}-{c}-{i}.md", f"{c} {b} {a} {i}"))
+    start = time.perf_counter()
+    index = me.QuickOpenIndex()
+    index._on_built(index._generation, index.build('/ws', entries))
+    build = time.perf_counter() - start
+    recent = [f"/ws/{entries[i][0]}" for i in range(0, 10000, 1000)]
+
+    def linear(query):
+        query = query.lower()
+        terms = query.split()
+        grams = set().union(*(me.trigrams(t) for t in terms))
+        scores = [(index.score(query, terms, grams, key, name), i)
+                  for i, (key, name) in enumerate(zip(index.keys, index.names))]
+        return sorted((s for s in scores if s[0]), reverse=True)[:me.QUICK_OPEN_LIMIT]
+
+    queries = ['cache-배포', 'p123 notes', 'relase nots', 'draft 4242', 'api']
+    print(f"[quick_open] {files:,}개 항목, 색인 만들기 {build * 1000:.0f} ms")
+    for query in queries:
+        full = timed(lambda: linear(query), 3)
+        fast = timed(lambda: index.search(query, recent), repeat)
+        top = index.search(query, recent)[:1]
+        print(f"    {query!r}: 전체 점수 {full:.1f} ms vs trigram {fast:.2f} ms -> {top[0][1] if top else '-'}")
+
+
+BENCHMARKS = {
+    'converter': bench_converter,
+    'scanner': bench_scanner,
+    'highlight': bench_highlight,
+    'highlighter': bench_highlighter,
+    'model': bench_model,
+    'live_stats': bench_live_stats,
+    'outline': bench_outline,
+    'goto': bench_goto,
+    'emoji': bench_emoji,
+    'replace_all': bench_replace_all,
+    'regex_guard': bench_regex_guard,
+    'workspace_search': bench_workspace_search,
+    'quick_open': bench_quick_open,
+}
+
+
+def main(names):
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"알 수 없는 항목: {name} (가능: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
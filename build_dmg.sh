@@ -35,6 +35,9 @@ pip install --upgrade pip wheel setuptools
 pip install -r requirements.txt
 pip install py2app
 
+# Mermaid.js 번들 (오프라인 미리보기용)
+python fetch_assets.py
+
 # ===== 4. 아이콘 생성 =====
 if [ ! -f "icon.icns" ]; then
     echo "🎨 아이콘 생성 중..."
@@ -8,7 +8,9 @@ pip install --upgrade pip
 pip install -r requirements.txt
 pip install pyinstaller
 
-pyinstaller --noconfirm --windowed --name "Nebula Note" --icon "icon.ico" --splash "splash.png" --add-data "icon.ico;." markdown_editor.py
+python fetch_assets.py
+
+pyinstaller --noconfirm --windowed --name "Nebula Note" --icon "icon.ico" --splash "splash.png" --add-data "icon.ico;." --add-data "assets;assets" markdown_editor.py
 
 if exist "dist\Nebula Note\Nebula Note.exe" (
     echo.
@@ -0,0 +1 @@
+# 저장소 루트를 sys.path에 두어 tests/에서 regex_jobs 같은 최상위 모듈을 불러올 수 있게 한다
@@ -0,0 +1,44 @@
+"""
+번들 JS 자산 내려받기 - 빌드 전에 한 번 실행
+사용법: python fetch_assets.py
+
+미리보기/Mermaid 뷰어는 mdpro://assets/ 스킴으로 assets/ 폴더의 파일을 읽는다.
+파일이 없으면 실행 시 CDN으로 대체되므로 오프라인에서는 반드시 이 스크립트로 준비할 것.
+"""
+
+import os
+import sys
+import urllib.request
+
+from markdown_editor import MERMAID_CDN_URL, MERMAID_VERSION
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+
+def fetch(url, filename):
+    target = os.path.join(ASSET_DIR, filename)
+    if os.path.exists(target) and os.path.getsize(target) > 0:
+        print(f"이미 있음: {target}")
+        return
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    print(f"다운로드 중: {url}")
+    with urllib.request.urlopen(url, timeout=60) as resp:
+        data = resp.read()
+    tmp = target + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, target)
+    print(f"저장 완료: {target} ({len(data) // 1024} KB)")
+
+
+def main():
+    try:
+        fetch(MERMAID_CDN_URL, 'mermaid.min.js')
+    except Exception as e:
+        print(f"Mermaid {MERMAID_VERSION} 다운로드 실패: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,10 +11,28 @@ import json
 import re
 import base64
 import hashlib
+import functools
+import itertools
+import time
+import threading
+import multiprocessing
 import unicodedata
+import zlib
+import mmap
+import codecs
+import queue
+from bisect import bisect_left, bisect_right
+from html import escape as html_escape
 from pathlib import Path
 from datetime import datetime
-from collections import Counter
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from regex_jobs import find_line_matches, replacement_edits, regex_server_main, run_regex_job, template_error
+from markdown_render import (
+    CodeHighlightCache, mermaid_div, mermaid_source_key, pygments_css, pygments_lexer,
+    render_markdown_block, render_server_main,
+)
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -23,23 +41,37 @@ from PyQt6.QtWidgets import (
     QComboBox, QSpinBox, QLineEdit, QListWidget, QListWidgetItem,
     QTabWidget, QGridLayout, QFrame, QScrollArea, QMenu,
     QMenuBar, QCompleter, QDialogButtonBox, QGroupBox, QCheckBox,
-    QSlider, QTreeWidget, QTreeWidgetItem, QProgressBar, QTextBrowser
+    QSlider, QTreeWidget, QTreeWidgetItem, QTreeView, QListView, QTabBar, QProgressBar, QTextBrowser, QInputDialog
 )
 from PyQt6.QtCore import (
-    Qt, QTimer, QSize, QUrl, pyqtSignal, QRegularExpression, QObject, pyqtSlot
+    Qt, QTimer, QSize, QUrl, QPoint, pyqtSignal, QRegularExpression, QObject, pyqtSlot,
+    QBuffer, QFile, QIODevice, QAbstractItemModel, QAbstractListModel, QModelIndex, QFileSystemWatcher
 )
 from PyQt6.QtGui import (
     QFont, QAction, QKeySequence, QTextCharFormat, QSyntaxHighlighter,
-    QColor, QTextCursor, QShortcut, QTextDocument
+    QColor, QTextCursor, QShortcut, QTextDocument, QTextFormat
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebEngineCore import (
+    QWebEngineProfile, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+)
 from PyQt6.QtWebChannel import QWebChannel
 
-import markdown
+from pygments.token import Token
 
 CONFIG_FILE = os.path.expanduser("~/.markdownpro_config.json")
 BACKUP_DIR = os.path.expanduser("~/.markdownpro_backups")
 SNIPPETS_FILE = os.path.expanduser("~/.markdownpro_snippets.json")
+MERMAID_CACHE_DIR = os.path.expanduser("~/.markdownpro_mermaid_cache")
+EMOJI_INDEX_FILE = os.path.expanduser("~/.markdownpro_emoji_index.json")
+SEARCH_INDEX_DIR = os.path.expanduser("~/.markdownpro_search_index")
+
+MERMAID_VERSION = "10.9.1"
+MERMAID_CDN_URL = f"https://cdn.jsdelivr.net/npm/mermaid@{MERMAID_VERSION}/dist/mermaid.min.js"
+
+# 번들 JS 자산 (python fetch_assets.py로 assets/에 내려받음)
+ASSET_SCHEME = b"mdpro"
+ASSET_BASE_URL = "mdpro://assets/"
 
 # 스타일
 LIGHT_STYLE = """
@@ -57,8 +89,8 @@ QSplitter::handle { background-color: #e0e0e0; }
 QPushButton { background-color: #007AFF; color: white; border: none; border-radius: 6px; padding: 8px 16px; font-weight: bold; }
 QPushButton:hover { background-color: #0056b3; }
 QComboBox, QSpinBox, QLineEdit { border: 1px solid #e0e0e0; border-radius: 4px; padding: 6px; background-color: white; }
-QListWidget, QTreeWidget { border: 1px solid #e0e0e0; border-radius: 4px; background-color: white; }
-QListWidget::item:selected, QTreeWidget::item:selected { background-color: #007AFF; color: white; }
+QListWidget, QTreeView { border: 1px solid #e0e0e0; border-radius: 4px; background-color: white; }
+QListWidget::item:selected, QTreeView::item:selected { background-color: #007AFF; color: white; }
 QTabWidget::pane { border: 1px solid #e0e0e0; }
 QTabBar::tab { background-color: #f0f0f0; border: 1px solid #e0e0e0; padding: 8px 16px; margin-right: 2px; }
 QTabBar::tab:selected { background-color: white; }
@@ -85,8 +117,8 @@ QSplitter::handle { background-color: #3c3c3c; }
 QPushButton { background-color: #0e639c; color: white; border: none; border-radius: 6px; padding: 8px 16px; font-weight: bold; }
 QPushButton:hover { background-color: #1177bb; }
 QComboBox, QSpinBox, QLineEdit { border: 1px solid #3c3c3c; border-radius: 4px; padding: 6px; background-color: #3c3c3c; color: #d4d4d4; }
-QListWidget, QTreeWidget { border: 1px solid #3c3c3c; border-radius: 4px; background-color: #252526; color: #d4d4d4; }
-QListWidget::item:selected, QTreeWidget::item:selected { background-color: #264f78; color: white; }
+QListWidget, QTreeView { border: 1px solid #3c3c3c; border-radius: 4px; background-color: #252526; color: #d4d4d4; }
+QListWidget::item:selected, QTreeView::item:selected { background-color: #264f78; color: white; }
 QTabWidget::pane { border: 1px solid #3c3c3c; }
 QTabBar::tab { background-color: #2d2d2d; border: 1px solid #3c3c3c; color: #d4d4d4; padding: 8px 16px; margin-right: 2px; }
 QTabBar::tab:selected { background-color: #1e1e1e; }
@@ -799,6 +831,18 @@ EMOJI_LIST = {
     "화살표": ["➡️", "⬅️", "⬆️", "⬇️", "↗️", "↘️", "↙️", "↖️", "↕️", "↔️", "🔄", "🔃", "◀️", "▶️", "🔼", "🔽"],
 }
 
+# 전체 카탈로그를 만들 유니코드 범위 (EMOJI_LIST 뒤에 붙는다)
+EMOJI_RANGES = (
+    ("표정", 0x1F600, 0x1F64F),
+    ("자연·사물", 0x1F300, 0x1F5FF),
+    ("교통·지도", 0x1F680, 0x1F6FF),
+    ("사람·활동", 0x1F900, 0x1F9FF),
+    ("사람·활동", 0x1FA70, 0x1FAFF),
+    ("심볼", 0x1F7E0, 0x1F7EB),
+    ("심볼", 0x2600, 0x27BF),
+    ("화살표", 0x2190, 0x21FF),
+)
+
 # 기본 스니펫
 DEFAULT_SNIPPETS = {
     "todo": "- [ ] ",
@@ -820,7 +864,82 @@ DEFAULT_SNIPPETS = {
 
 # ============== 유틸리티 클래스 ==============
 
+def utf16_len(text):
+    """Qt 문자열 위치(UTF-16 코드 단위) 기준 길이 - 이모지 같은 BMP 밖 문자는 2"""
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-16-le', 'surrogatepass')) // 2
+
+
+# 코드 펜스 시작 (fenced_code 확장과 동일하게 0열에서만 인식)
+FENCE_OPEN_PATTERN = re.compile(r'^(`{3,}|~{3,})')
+# HTML 블록 시작 (빈 줄까지 이어짐)
+HTML_BLOCK_PATTERN = re.compile(
+    r' {0,3}<(?:!--|/?(?:address|article|aside|blockquote|center|details|dialog|div|dl|figure|footer|form|'
+    r'h[1-6]|header|hr|iframe|li|nav|ol|p|pre|script|section|style|summary|table|tbody|td|th|thead|tr|ul)\b)',
+    re.IGNORECASE)
+
+# Pygments 토큰 -> 에디터 서식 이름 (가장 가까운 상위 토큰 기준)
+TOKEN_KINDS = {
+    Token.Keyword: 'keyword',
+    Token.Operator.Word: 'keyword',
+    Token.Name.Tag: 'keyword',
+    Token.Name.Function: 'function',
+    Token.Name.Class: 'function',
+    Token.Name.Attribute: 'function',
+    Token.Name.Builtin: 'builtin',
+    Token.Name.Decorator: 'builtin',
+    Token.Literal.String: 'string',
+    Token.Literal.Number: 'number',
+    Token.Comment: 'comment',
+}
+
+
+@functools.lru_cache(maxsize=512)
+def token_kind(ttype):
+    while ttype is not None:
+        kind = TOKEN_KINDS.get(ttype)
+        if kind:
+            return kind
+        ttype = ttype.parent
+    return None
+
+
 class MarkdownHighlighter(QSyntaxHighlighter):
+    """에디터 구문 강조
+
+    규칙은 클래스 생성 시 한 번만 컴파일한다. 줄 단위 규칙(제목, 목록)은 줄 앞에 고정된
+    정규식 하나로, 인라인 규칙(코드, 링크, 굵게, 기울임)은 이름 있는 그룹으로 묶은 정규식
+    하나로 훑는다. 굵게/기울임 안의 코드와 링크는 안쪽만 다시 훑어 덮어쓴다.
+
+    코드 펜스, 프런트매터, HTML 블록은 블록 상태(setCurrentBlockState)로 이어받는다.
+    상태가 그대로인 블록에서 Qt가 재강조를 멈추므로 편집 영향이 필요한 범위로 한정된다.
+    펜스 안의 코드는 줄 단위 Pygments 토큰(캐시)으로 칠한다.
+    """
+    LINE_RULE = QRegularExpression(r'^(?:(?<header>#{1,6}\s.*$)|(?<list>\s*(?:[-*+]|\d+\.)\s))')
+    INLINE_RULE = QRegularExpression(
+        r'(?<code>`[^`]+`)|(?<link>\[[^\]]+\]\([^)]+\))|(?<bold>\*\*[^*]+\*\*)|(?<italic>(?<!\*)\*(?!\*)[^*]+\*(?!\*))')
+    NESTED_RULE = QRegularExpression(r'(?<code>`[^`]+`)|(?<link>\[[^\]]+\]\([^)]+\))')
+    LINE_GROUPS = ('header', 'list')
+    INLINE_GROUPS = ('code', 'link', 'bold', 'italic')
+    NESTED_GROUPS = ('code', 'link')
+    LINE_START_CHARS = frozenset('#-*+0123456789 \t')
+    INLINE_CHARS = ('`', '[', '*')
+
+    for _rule in (LINE_RULE, INLINE_RULE, NESTED_RULE):
+        _rule.optimize()
+    del _rule
+
+    # 블록 상태: 펜스는 FENCE_FLAG | 틸드 여부(7번 비트) | 펜스 길이(0~6번 비트) | 언어 번호(16번 비트부터)
+    NORMAL, FRONT_MATTER, HTML_BLOCK, HTML_COMMENT = 0, 1, 2, 3
+    FENCE_FLAG = 1 << 8
+    MAX_FENCE_LANGUAGES = 0x7FFF      # 블록 상태(int32)에 들어가는 언어 번호 개수
+    fence_languages = ['']            # 언어 번호 -> 언어 이름 (0은 언어 없음)
+    fence_language_ids = {'': 0}      # 언어 이름 -> 언어 번호
+
+    TOKEN_CACHE_SIZE = 20000
+    _token_cache = OrderedDict()  # (언어, 줄) -> [(시작, 길이, 서식 이름), ...] (UTF-16 위치)
+
     def __init__(self, parent=None, dark_mode=False):
         super().__init__(parent)
         self.dark_mode = dark_mode
@@ -836,6 +955,13 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             'link': '#4ec9b0' if self.dark_mode else '#0277bd',
             'list': '#c586c0' if self.dark_mode else '#6a1b9a',
             'mermaid': '#dcdcaa' if self.dark_mode else '#795548',
+            'meta': '#808080' if self.dark_mode else '#78909c',
+            'keyword': '#569cd6' if self.dark_mode else '#0000ff',
+            'function': '#dcdcaa' if self.dark_mode else '#795e26',
+            'builtin': '#4ec9b0' if self.dark_mode else '#267f99',
+            'string': '#ce9178' if self.dark_mode else '#a31515',
+            'number': '#b5cea8' if self.dark_mode else '#098658',
+            'comment': '#6a9955' if self.dark_mode else '#008000',
         }
         
         for name, color in colors.items():
@@ -843,35 +969,181 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             fmt.setForeground(QColor(color))
             if name in ['header', 'mermaid']:
                 fmt.setFontWeight(QFont.Weight.Bold)
-            if name == 'italic':
+            if name in ['italic', 'meta', 'comment']:
                 fmt.setFontItalic(True)
             self.formats[name] = fmt
         
-        self.rules = [
-            (r'^#{1,6}\s.*$', 'header'),
-            (r'\*\*[^*]+\*\*', 'bold'),
-            (r'(?<!\*)\*(?!\*)[^*]+\*(?!\*)', 'italic'),
-            (r'`[^`]+`', 'code'),
-            (r'\[([^\]]+)\]\([^)]+\)', 'link'),
-            (r'^\s*[-*+]\s', 'list'),
-            (r'^\s*\d+\.\s', 'list'),
-            (r'^```mermaid', 'mermaid'),
-            (r'^```.*$', 'code'),
-        ]
+        # 그룹 이름 -> 서식
+        self._line_formats = [(g, self.formats[g]) for g in self.LINE_GROUPS]
+        self._inline_formats = [(g, self.formats[g]) for g in self.INLINE_GROUPS]
+        self._nested_formats = [(g, self.formats[g]) for g in self.NESTED_GROUPS]
+    
+    @classmethod
+    def fence_state(cls, marker, lang):
+        # 해시 대신 번호표를 쓴다 - 해시가 겹치면 엉뚱한 렉서로 칠하고, 언어를 바꿔도 상태가 같아 다시 칠하지 않는다
+        lang_id = cls.fence_language_ids.get(lang)
+        if lang_id is None:
+            if len(cls.fence_languages) > cls.MAX_FENCE_LANGUAGES:
+                lang_id = 0  # 번호가 바닥나면 언어 없는 코드로 칠한다
+            else:
+                lang_id = cls.fence_language_ids[lang] = len(cls.fence_languages)
+                cls.fence_languages.append(lang)
+        return cls.FENCE_FLAG | ((marker[0] == '~') << 7) | min(len(marker), 127) | (lang_id << 16)
+    
+    @classmethod
+    def fence_info(cls, state):
+        """블록 상태 -> (닫는 펜스, 언어)"""
+        marker = ('~' if state & (1 << 7) else '`') * (state & 127)
+        lang_id = state >> 16
+        return marker, cls.fence_languages[lang_id] if lang_id < len(cls.fence_languages) else ''
     
     def highlightBlock(self, text):
-        for pattern, fmt_name in self.rules:
-            regex = QRegularExpression(pattern)
-            it = regex.globalMatch(text)
-            while it.hasNext():
-                match = it.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), 
-                             self.formats.get(fmt_name, QTextCharFormat()))
+        prev = self.previousBlockState()
+        if prev > 0:
+            if prev & self.FENCE_FLAG:
+                self._highlight_fence_line(text, prev)
+                return
+            if self._highlight_region_line(text, prev):
+                return
+        
+        self.setCurrentBlockState(self.NORMAL)
+        if not text:
+            return
+        
+        first = text[0]
+        if first == '`' or first == '~':
+            m = FENCE_OPEN_PATTERN.match(text)
+            if m:
+                info = text[m.end():].split(None, 1)
+                lang = info[0] if info else ''
+                self.setCurrentBlockState(self.fence_state(m.group(1), lang))
+                self.setFormat(0, utf16_len(text), self.formats['mermaid' if lang == 'mermaid' else 'code'])
+                return
+        elif first == '-' and text.rstrip() == '---' and self.currentBlock().blockNumber() == 0:
+            self.setCurrentBlockState(self.FRONT_MATTER)
+            self.setFormat(0, utf16_len(text), self.formats['meta'])
+            return
+        elif '<' in text[:4] and HTML_BLOCK_PATTERN.match(text):
+            if text.lstrip().startswith('<!--'):
+                if '-->' not in text:
+                    self.setCurrentBlockState(self.HTML_COMMENT)
+                self.setFormat(0, utf16_len(text), self.formats['comment'])
+            else:
+                self.setCurrentBlockState(self.HTML_BLOCK)
+                self._highlight_code(text, 'html')
+            return
+        
+        line_format = None
+        if first in self.LINE_START_CHARS:
+            match = self.LINE_RULE.match(text)
+            if match.hasMatch():
+                for group, fmt in self._line_formats:
+                    start = match.capturedStart(group)
+                    if start >= 0:
+                        line_format = (group, start, match.capturedLength(group), fmt)
+                        self.setFormat(start, line_format[2], fmt)
+                        break
+        
+        if any(c in text for c in self.INLINE_CHARS):
+            self._highlight_inline(text, self.INLINE_RULE, self._inline_formats, 0, None)
+            if line_format is not None and line_format[0] == 'list':
+                _, start, length, fmt = line_format
+                self.setFormat(start, length, fmt)  # 목록 기호는 인라인 서식보다 우선
+    
+    def _highlight_fence_line(self, text, state):
+        marker, lang = self.fence_info(state)
+        if text.rstrip(' ') == marker:
+            self.setCurrentBlockState(self.NORMAL)
+            self.setFormat(0, utf16_len(text), self.formats['mermaid' if lang == 'mermaid' else 'code'])
+            return
+        self.setCurrentBlockState(state)
+        if lang == 'mermaid':
+            self.setFormat(0, utf16_len(text), self.formats['mermaid'])
+        else:
+            self._highlight_code(text, lang)
+    
+    def _highlight_region_line(self, text, state):
+        """프런트매터/HTML 블록 안의 줄 - 처리했으면 True (HTML 블록이 빈 줄로 끝나면 False)"""
+        if state == self.FRONT_MATTER:
+            self.setCurrentBlockState(self.NORMAL if text.rstrip() in ('---', '...') else state)
+            self.setFormat(0, utf16_len(text), self.formats['meta'])
+            return True
+        if state == self.HTML_COMMENT:
+            self.setCurrentBlockState(self.NORMAL if '-->' in text else state)
+            self.setFormat(0, utf16_len(text), self.formats['comment'])
+            return True
+        if state == self.HTML_BLOCK and text.strip():
+            self.setCurrentBlockState(state)
+            self._highlight_code(text, 'html')
+            return True
+        return False
+    
+    def _highlight_code(self, text, lang):
+        if not text:
+            return
+        spans = self.code_tokens(lang, text) if lang else None
+        if spans is None:
+            self.setFormat(0, utf16_len(text), self.formats['code'])
+            return
+        formats = self.formats
+        for start, length, kind in spans:
+            self.setFormat(start, length, formats[kind])
+    
+    @classmethod
+    def code_tokens(cls, lang, line):
+        """줄 하나의 Pygments 토큰 -> [(UTF-16 시작, 길이, 서식 이름), ...] (모르는 언어면 None)"""
+        key = (lang, line)
+        cache = cls._token_cache
+        spans = cache.get(key)
+        if spans is not None:
+            cache.move_to_end(key)
+            return spans
+        
+        lexer = pygments_lexer(lang)
+        if lexer is None:
+            return None
+        spans = []
+        pos = 0
+        for ttype, value in lexer.get_tokens(line):
+            size = utf16_len(value)
+            kind = token_kind(ttype)
+            if kind and value.strip():
+                spans.append((pos, size, kind))
+            pos += size
+        cache[key] = spans
+        if len(cache) > cls.TOKEN_CACHE_SIZE:
+            cache.popitem(last=False)
+        return spans
+    
+    def _highlight_inline(self, text, rule, formats, offset, end):
+        it = rule.globalMatch(text, offset)
+        while it.hasNext():
+            match = it.next()
+            if end is not None and match.capturedStart() >= end:
+                return
+            for group, fmt in formats:
+                start = match.capturedStart(group)
+                if start >= 0:
+                    length = match.capturedLength(group)
+                    self.setFormat(start, length, fmt)
+                    if group == 'bold':
+                        self._highlight_inline(text, self.NESTED_RULE, self._nested_formats, start + 2, start + length - 2)
+                    elif group == 'italic':
+                        self._highlight_inline(text, self.NESTED_RULE, self._nested_formats, start + 1, start + length - 1)
+                    break
 
 
 class WebBridge(QObject):
     svg_ready = pyqtSignal(str)
     png_ready = pyqtSignal(str)
+    preview_ready = pyqtSignal()
+    mermaid_svg_ready = pyqtSignal(str, str, str)  # 소스 키, 테마, SVG
+    preview_scrolled = pyqtSignal(float)  # 미리보기 맨 위의 원본 줄
+    
+    # Python -> JS: 미리보기 DOM 패치 (JSON)
+    previewPatch = pyqtSignal(str)
+    # Python -> JS: 원본 줄(소수 = 줄 안의 비율)이 맨 위에 오도록 스크롤
+    previewScroll = pyqtSignal(float)
     
     @pyqtSlot(str)
     def receiveSvg(self, data):
@@ -880,263 +1152,2456 @@ class WebBridge(QObject):
     @pyqtSlot(str)
     def receivePng(self, data):
         self.png_ready.emit(data)
+    
+    @pyqtSlot()
+    def previewLoaded(self):
+        self.preview_ready.emit()
+    
+    @pyqtSlot(str, str, str)
+    def storeMermaidSvg(self, source_key, theme, svg):
+        self.mermaid_svg_ready.emit(source_key, theme, svg)
+    
+    @pyqtSlot(float)
+    def previewScrolled(self, line):
+        self.preview_scrolled.emit(line)
+
+
+class AssetSchemeHandler(QWebEngineUrlSchemeHandler):
+    """mdpro://assets/ 요청을 앱에 번들된 JS로 응답 (프로세스당 한 번 읽어 메모리에 보관)
+
+    번들 파일이 없는 개발 환경에서는 CDN으로 리다이렉트한다.
+    """
+    ASSETS = {
+        'mermaid.min.js': ('assets/mermaid.min.js', MERMAID_CDN_URL),
+        'qwebchannel.js': (':/qtwebchannel/qwebchannel.js', None),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache = {}
+
+    def _load(self, name):
+        if name in self._cache:
+            return self._cache[name]
+        path, _ = self.ASSETS[name]
+        data = None
+        if path.startswith(':'):
+            f = QFile(path)
+            if f.open(QIODevice.OpenModeFlag.ReadOnly):
+                data = bytes(f.readAll())
+                f.close()
+        else:
+            try:
+                with open(resource_path(path), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                pass
+        self._cache[name] = data
+        return data
+
+    def requestStarted(self, job):
+        name = job.requestUrl().path().lstrip('/')
+        if name not in self.ASSETS:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        data = self._load(name)
+        if data is None:
+            fallback = self.ASSETS[name][1]
+            if fallback:
+                job.redirect(QUrl(fallback))
+            else:
+                job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        buf = QBuffer(job)
+        buf.setData(data)
+        buf.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(b"application/javascript", buf)
+
+
+def register_asset_scheme():
+    """mdpro 스킴 등록 - QApplication 생성 전에 호출해야 한다"""
+    scheme = QWebEngineUrlScheme(ASSET_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme
+                    | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+                    | QWebEngineUrlScheme.Flag.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def install_asset_scheme_handler(app):
+    handler = AssetSchemeHandler(app)
+    QWebEngineProfile.defaultProfile().installUrlSchemeHandler(ASSET_SCHEME, handler)
+    return handler
 
 
 class DocumentStats:
     """문서 통계 계산"""
     
     @staticmethod
-    def calculate(text):
-        lines = text.split('\n')
-        words = text.split()
+    def calculate(text, scan=None):
+        if scan is None:
+            scan = scan_markdown(text)
+        words = len(text.split())
         chars = len(text)
-        chars_no_space = len(text.replace(' ', '').replace('\n', ''))
+        chars_no_space = chars - text.count(' ') - text.count('\n')
         
         # 읽기 시간 (평균 200단어/분)
-        read_time = max(1, len(words) // 200)
-        
-        # 문단 수
-        paragraphs = len([p for p in text.split('\n\n') if p.strip()])
-        
-        # 헤더 수
-        headers = len(re.findall(r'^#{1,6}\s', text, re.MULTILINE))
-        
-        # 링크 수
-        links = len(re.findall(r'\[([^\]]+)\]\([^)]+\)', text))
-        
-        # 이미지 수
-        images = len(re.findall(r'!\[([^\]]*)\]\([^)]+\)', text))
-        
-        # 코드 블록 수
-        code_blocks = len(re.findall(r'```[\s\S]*?```', text))
-        
-        # Mermaid 블록 수
-        mermaid_blocks = len(re.findall(r'```mermaid[\s\S]*?```', text))
+        read_time = max(1, words // 200)
         
         return {
-            'lines': len(lines),
-            'words': len(words),
+            'lines': len(scan.lines),
+            'words': words,
             'chars': chars,
             'chars_no_space': chars_no_space,
-            'paragraphs': paragraphs,
-            'headers': headers,
-            'links': links,
-            'images': images,
-            'code_blocks': code_blocks,
-            'mermaid_blocks': mermaid_blocks,
+            'paragraphs': scan.paragraphs,
+            'headers': len(scan.headings),
+            'links': len(scan.links),
+            'images': len(scan.images),
+            'code_blocks': len(scan.fences),
+            'mermaid_blocks': sum(1 for fence in scan.fences if fence[2] == 'mermaid'),
             'read_time': read_time,
         }
 
 
-# ============== 다이얼로그 ==============
+# ============== 마크다운 구조 스캔 ==============
+
+LIST_ITEM_PATTERN = re.compile(r'^ {0,3}(?:[-*+]|\d+[.)])\s')
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+INLINE_LINK_PATTERN = re.compile(r'(!?)\[([^\]\n]*)\]\(([^)\n]+)\)')
+# [TOC], 참조 링크 정의처럼 문서 전체를 봐야 하는 구문
+DOC_SCOPE_PATTERN = re.compile(r'^ {0,3}\[(?:TOC\]|[^\]\n]+\]:)', re.MULTILINE)
+LIST_START_CHARS = frozenset(' -*+0123456789')
+
+
+class MarkdownScan:
+    """scan_markdown() 결과 - 줄 번호는 0부터, 구간은 [시작, 끝)"""
+
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.split('\n')
+        self.blocks = []      # (시작 줄, 끝 줄, 펜스 여부) - 미리보기 블록 단위
+        self.headings = []    # (줄, 레벨, 제목)
+        self.fences = []      # (시작 줄, 끝 줄, 언어, 닫힘 여부)
+        self.links = []       # (줄, 열, 텍스트, 주소)
+        self.images = []      # (줄, 열, 대체 텍스트, 주소)
+        self.list_items = []  # (줄, 들여쓰기)
+        self.paragraphs = 0
+        self.doc_scope = False  # [TOC]나 참조 링크 정의가 있으면 블록 단위 변환 불가
+
+    def block_texts(self):
+        """[(시작 줄, 블록 텍스트), ...]"""
+        lines = self.lines
+        return [(start, '\n'.join(lines[start:end])) for start, end, _ in self.blocks]
+
+    def fence_body(self, fence):
+        start, end, _, closed = fence
+        return '\n'.join(self.lines[start + 1:end - 1 if closed else end])
+
+    def mermaid_sources(self):
+        return [self.fence_body(fence) for fence in self.fences if fence[2] == 'mermaid']
+
+
+def scan_markdown(text):
+    """문서를 줄 단위로 한 번만 훑어 구조를 수집 (통계, 개요, 미리보기 분할, Mermaid 뷰어 공용)
+
+    블록은 빈 줄을 경계로 나누되 코드 펜스는 하나의 블록으로 유지하고,
+    들여쓴 줄과 이어지는 목록 항목은 직전 블록에 붙여 변환 결과가 달라지지 않게 한다.
+    펜스 안의 내용은 제목/링크/목록으로 세지 않는다.
+    """
+    scan = MarkdownScan(text)
+    lines = scan.lines
+    blocks = scan.blocks
+    headings = scan.headings
+    list_items = scan.list_items
+    start = None
+    fence = None
+    fence_start = 0
+    fence_lang = ''
+    paragraphs = 0
+
+    for i, line in enumerate(lines):
+        if fence is not None:
+            if line.rstrip(' ') == fence:
+                blocks.append((start, i + 1, True))
+                scan.fences.append((fence_start, i + 1, fence_lang, True))
+                start = fence = None
+            continue
+
+        if not line or line.isspace():
+            if start is not None:
+                blocks.append((start, i, False))
+                start = None
+            continue
+
+        first = line[0]
+        if first == '`' or first == '~':
+            m = FENCE_OPEN_PATTERN.match(line)
+            if m:
+                if start is not None:
+                    blocks.append((start, i, False))
+                fence = m.group(1)
+                start = fence_start = i
+                info = line[len(fence):].split(None, 1)
+                fence_lang = info[0] if info else ''
+                paragraphs += 1
+                continue
+
+        if start is None:
+            start = i
+            paragraphs += 1
+            if blocks and not blocks[-1][2]:
+                if first in ' \t' or (LIST_ITEM_PATTERN.match(lines[blocks[-1][0]]) and LIST_ITEM_PATTERN.match(line)):
+                    start = blocks.pop()[0]
+
+        if first == '#':
+            m = HEADING_PATTERN.match(line)
+            if m:
+                headings.append((i, len(m.group(1)), m.group(2)))
+        elif first in LIST_START_CHARS and LIST_ITEM_PATTERN.match(line):
+            list_items.append((i, len(line) - len(line.lstrip(' '))))
+
+        if '[' in line:
+            if not scan.doc_scope and DOC_SCOPE_PATTERN.match(line):
+                scan.doc_scope = True
+            for m in INLINE_LINK_PATTERN.finditer(line):
+                target = scan.images if m.group(1) else scan.links
+                target.append((i, m.start(), m.group(2), m.group(3)))
+
+    if start is not None:
+        blocks.append((start, len(lines), fence is not None))
+        if fence is not None:
+            scan.fences.append((fence_start, len(lines), fence_lang, False))
+
+    scan.paragraphs = paragraphs
+    return scan
+
+
+# ============== 문서 모델 ==============
+
+def parse_markdown_line(text, fence):
+    """줄 하나 분석 (scan_markdown과 같은 규칙)
+
+    fence: 이 줄에 들어올 때 열려 있는 펜스 (닫는 펜스 문자열, 언어) 또는 None
+    반환: (줄 끝 펜스 상태, 제목 (레벨, 제목) 또는 None, 펜스 표시 ('open'/'close', 언어) 또는 None,
+           링크 [(열, 텍스트, 주소)], 이미지 [(열, 대체 텍스트, 주소)])
+    """
+    if fence is not None:
+        if text.rstrip(' ') == fence[0]:
+            return None, None, ('close', fence[1]), (), ()
+        return fence, None, None, (), ()
+    if not text:
+        return None, None, None, (), ()
+
+    first = text[0]
+    if first == '`' or first == '~':
+        m = FENCE_OPEN_PATTERN.match(text)
+        if m:
+            info = text[m.end():].split(None, 1)
+            lang = info[0] if info else ''
+            return (m.group(1), lang), None, ('open', lang), (), ()
+
+    heading = None
+    if first == '#':
+        m = HEADING_PATTERN.match(text)
+        if m:
+            heading = (len(m.group(1)), m.group(2))
+
+    links = images = ()
+    if '[' in text:
+        links = []
+        images = []
+        for m in INLINE_LINK_PATTERN.finditer(text):
+            (images if m.group(1) else links).append((m.start(), m.group(2), m.group(3)))
+    return None, heading, None, links, images
+
+
+def splice_line_items(items, first, old_end, new_end, new_items):
+    """줄 번호순 [(줄, ...), ...] 목록의 [first, old_end) 구간을 new_items로 바꾸고 뒤쪽 줄 번호를 민다"""
+    lo = bisect_left(items, (first,))
+    hi = bisect_left(items, (old_end,), lo)
+    removed = items[lo:hi]
+    delta = new_end - old_end
+    if delta:
+        items[lo:] = new_items + [(item[0] + delta,) + item[1:] for item in items[hi:]]
+    else:
+        items[lo:hi] = new_items
+    return removed
+
+
+class DocumentModel(QObject):
+    """QTextDocument를 따라가는 줄(블록) 단위 증분 구조 모델
+
+    contentsChange(위치, 삭제, 추가)마다 바뀐 블록만 다시 분석하고, 펜스 상태가 달라진 경우에만
+    뒤쪽 줄로 이어서 분석한다. 제목/펜스/링크/이미지는 줄 번호순 목록으로 유지해 편집 구간만 갈아 끼운다.
+    단어/글자 수는 줄별로 세어 두고 편집 구간의 차이만 더한다 (상태 표시줄용).
+    """
+    changed = pyqtSignal(int, int, int)  # 첫 줄, 없어진 줄 수, 새 줄 수
+    headingsChanged = pyqtSignal()
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.parsed_lines = 0  # 누적 분석 줄 수 (증분 확인용)
+        self.reset()
+        document.contentsChange.connect(self.on_contents_change)
+
+    def reset(self):
+        """문서 전체를 다시 분석"""
+        block = self.document.begin()
+        texts = []
+        while block.isValid():
+            texts.append(block.text())
+            block = block.next()
+        old_count = len(getattr(self, '_texts', ()))
+        self._texts = [None] * len(texts)
+        self._states = [None] * len(texts)  # 줄 끝 펜스 상태
+        self._hashes = [0] * len(texts)     # 줄 crc32
+        self._words = [0] * len(texts)      # 줄 단어 수
+        self._chars = [0] * len(texts)      # 줄 글자 수 (코드 포인트)
+        self.word_count = 0
+        self._char_total = 0
+        self._headings = []     # (줄, 레벨, 제목)
+        self._fence_marks = []  # (줄, 'open'/'close', 언어)
+        self._links = []        # (줄, 열, 텍스트, 주소)
+        self._images = []       # (줄, 열, 대체 텍스트, 주소)
+        self._replace(0, len(texts), texts, notify=False)
+        self.changed.emit(0, old_count, len(texts))
+        self.headingsChanged.emit()
+
+    # ----- 조회 -----
+    def line_count(self):
+        return len(self._texts)
+
+    def line_text(self, line):
+        return self._texts[line]
+
+    def lines(self):
+        """줄 텍스트 목록 (읽기 전용으로 사용)"""
+        return self._texts
+
+    def line_hash(self, line):
+        return self._hashes[line]
+
+    def character_count(self):
+        """len(toPlainText())와 같은 값 - characterCount()는 UTF-16 단위라 이모지가 2로 세어진다"""
+        return self._char_total + len(self._texts) - 1
+
+    def headings(self):
+        return self._headings
+
+    def links(self):
+        return self._links
+
+    def images(self):
+        return self._images
+
+    def fences(self):
+        """[(시작 줄, 끝 줄, 언어, 닫힘 여부)] - scan_markdown().fences와 같은 형식"""
+        fences = []
+        start = lang = None
+        for line, kind, fence_lang in self._fence_marks:
+            if kind == 'open':
+                start, lang = line, fence_lang
+            elif start is not None:
+                fences.append((start, line + 1, lang, True))
+                start = None
+        if start is not None:
+            fences.append((start, len(self._texts), lang, False))
+        return fences
+
+    def fence_body(self, fence):
+        start, end, _, closed = fence
+        return '\n'.join(self._texts[start + 1:end - 1 if closed else end])
+
+    def mermaid_sources(self):
+        return [self.fence_body(fence) for fence in self.fences() if fence[2] == 'mermaid']
+
+    # ----- 갱신 -----
+    def on_contents_change(self, position, removed, added):
+        doc = self.document
+        delta = doc.blockCount() - len(self._texts)
+        first = doc.findBlock(position).blockNumber()
+        last = doc.findBlock(min(position + added, doc.characterCount() - 1)).blockNumber()
+        old_end = last + 1 - delta
+        if first < 0 or last < first or old_end <= first or old_end > len(self._texts):
+            self.reset()  # 위치 계산이 맞지 않으면 전체 재분석
+            return
 
-class TableDialog(QDialog):
-    def __init__(self, parent=None):
+        texts = []
+        block = doc.findBlockByNumber(first)
+        for _ in range(last + 1 - first):
+            texts.append(block.text())
+            block = block.next()
+        self._replace(first, old_end, texts)
+
+    def _replace(self, first, old_end, texts, notify=True):
+        """옛 줄 [first, old_end)를 texts로 바꿔 분석 - 펜스 상태가 이어지면 뒤쪽 줄까지 다시 분석"""
+        old_texts = self._texts
+        old_states = self._states
+        state = old_states[first - 1] if first > 0 else None
+        # 편집 구간 바로 다음 줄에 원래 들어가던 상태
+        old_in = old_states[old_end - 1] if old_end > 0 else None
+
+        new_states = []
+        new_hashes = []
+        new_words = []
+        new_chars = []
+        headings, marks, links, images = [], [], [], []
+        line = first
+
+        def analyze(text):
+            nonlocal state
+            state, heading, mark, line_links, line_images = parse_markdown_line(text, state)
+            new_states.append(state)
+            new_hashes.append(zlib.crc32(text.encode('utf-8', 'surrogatepass')))
+            new_words.append(len(text.split()))
+            new_chars.append(len(text))
+            if heading:
+                headings.append((line,) + heading)
+            if mark:
+                marks.append((line,) + mark)
+            for link in line_links:
+                links.append((line,) + link)
+            for image in line_images:
+                images.append((line,) + image)
+
+        for text in texts:
+            analyze(text)
+            line += 1
+
+        stop = old_end
+        while stop < len(old_texts) and state != old_in:
+            old_in = old_states[stop]
+            texts.append(old_texts[stop])
+            analyze(old_texts[stop])
+            line += 1
+            stop += 1
+
+        new_end = first + len(texts)
+        self.parsed_lines += len(texts)
+        self._texts[first:stop] = texts
+        self._states[first:stop] = new_states
+        self._hashes[first:stop] = new_hashes
+        self.word_count += sum(new_words) - sum(self._words[first:stop])
+        self._words[first:stop] = new_words
+        self._char_total += sum(new_chars) - sum(self._chars[first:stop])
+        self._chars[first:stop] = new_chars
+        old_headings = splice_line_items(self._headings, first, stop, new_end, headings)
+        splice_line_items(self._fence_marks, first, stop, new_end, marks)
+        splice_line_items(self._links, first, stop, new_end, links)
+        splice_line_items(self._images, first, stop, new_end, images)
+
+        if not notify:
+            return
+        self.changed.emit(first, stop - first, new_end - first)
+        # 제목이 바뀌었거나 줄 수가 바뀌어 뒤쪽 제목의 줄 번호가 밀린 경우
+        if old_headings != headings or (new_end != stop and self._headings and self._headings[-1][0] >= new_end):
+            self.headingsChanged.emit()
+
+
+class DocumentAnalysis:
+    """리비전 하나의 분석 결과 (통계, 제목, Mermaid 블록) - 전체 통계는 처음 요청될 때 계산"""
+
+    def __init__(self, revision, text):
+        self.revision = revision
+        self.text = text
+        self.scan = scan_markdown(text)
+        self._stats = None
+
+    @property
+    def stats(self):
+        if self._stats is None:
+            self._stats = DocumentStats.calculate(self.text, self.scan)
+        return self._stats
+
+    @property
+    def headings(self):
+        return self.scan.headings
+
+    def mermaid_sources(self):
+        return self.scan.mermaid_sources()
+
+
+class DocumentBus(QObject):
+    """문서 리비전마다 텍스트 스냅샷과 분석을 한 번씩만 만들어 구독자에게 나눠준다
+
+    구독자는 리비전 번호를, analysis=True로 구독하면 DocumentAnalysis를 받는다.
+    스냅샷/분석은 처음 요청될 때 만들고 같은 리비전 동안 재사용한다.
+    키 입력마다 부르는 구독자는 되도록 리비전 번호만 받고 DocumentModel의 증분 값을 쓴다.
+    """
+    RATE_WINDOW = 5.0  # 초당 횟수 계산 구간 (초)
+
+    def __init__(self, document, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("테이블 삽입")
-        self.setMinimumWidth(300)
-        layout = QVBoxLayout(self)
-        
-        grid = QGridLayout()
-        grid.addWidget(QLabel("행:"), 0, 0)
-        self.rows = QSpinBox()
-        self.rows.setRange(1, 20)
-        self.rows.setValue(3)
-        grid.addWidget(self.rows, 0, 1)
-        
-        grid.addWidget(QLabel("열:"), 1, 0)
-        self.cols = QSpinBox()
-        self.cols.setRange(1, 10)
-        self.cols.setValue(3)
-        grid.addWidget(self.cols, 1, 1)
-        layout.addLayout(grid)
-        
-        self.header_check = QCheckBox("헤더 포함")
-        self.header_check.setChecked(True)
-        layout.addWidget(self.header_check)
-        
-        self.align_combo = QComboBox()
-        self.align_combo.addItems(["왼쪽 정렬", "가운데 정렬", "오른쪽 정렬"])
-        layout.addWidget(self.align_combo)
-        
-        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
-    
-    def get_markdown(self):
-        r, c = self.rows.value(), self.cols.value()
-        align = self.align_combo.currentIndex()
-        
-        if align == 0:
-            sep = ":------"
-        elif align == 1:
-            sep = ":------:"
+        self.document = document
+        self.revision = 0
+        self._subscribers = []
+        self._snapshot = None  # (리비전, 텍스트)
+        self._analysis = None
+        self.snapshots = 0
+        self.analyses = 0
+        self._events = {'snapshots': deque(), 'analyses': deque()}
+        document.contentsChanged.connect(self.publish)
+
+    def subscribe(self, callback, analysis=False):
+        self._subscribers.append((callback, analysis))
+
+    def snapshot(self):
+        """현재 리비전의 전체 텍스트"""
+        if self._snapshot is None or self._snapshot[0] != self.revision:
+            self._snapshot = (self.revision, self.document.toPlainText())
+            self.snapshots += 1
+            self._mark('snapshots')
+        return self._snapshot[1]
+
+    def analysis(self):
+        if self._analysis is None or self._analysis.revision != self.revision:
+            self._analysis = DocumentAnalysis(self.revision, self.snapshot())
+            self.analyses += 1
+            self._mark('analyses')
+        return self._analysis
+
+    def publish(self):
+        self.revision += 1
+        for callback, wants_analysis in self._subscribers:
+            callback(self.analysis() if wants_analysis else self.revision)
+
+    def _mark(self, name):
+        now = time.monotonic()
+        events = self._events[name]
+        events.append(now)
+        while events[0] < now - self.RATE_WINDOW:
+            events.popleft()
+
+    def rates(self):
+        """최근 RATE_WINDOW초 동안 초당 스냅샷/분석 횟수"""
+        now = time.monotonic()
+        rates = {}
+        for name, events in self._events.items():
+            while events and events[0] < now - self.RATE_WINDOW:
+                events.popleft()
+            rates[name] = len(events) / self.RATE_WINDOW
+        return rates
+
+
+# ============== 대용량 파일 ==============
+
+LARGE_FILE_MB = 32  # 이 크기 이상이면 대용량 파일 모드 (설정에서 변경 가능)
+LARGE_FILE_PAGE_BYTES = 512 * 1024
+
+
+class MappedTextFile:
+    """mmap으로 연 읽기 전용 텍스트 파일 - 줄 경계에 맞춘 페이지 단위로 읽는다
+
+    파일 전체를 읽어 들이지 않으므로 파일 크기와 상관없이
+    메모리에는 화면에 띄운 페이지 하나만 올라간다.
+    열 때는 첫 페이지의 끝만 찾고, 나머지 페이지 경계와 줄 수는 index_pages()가 작업 스레드에서 이어 센다.
+    줄바꿈과 문자 경계는 인코딩 단위로 찾는다 (UTF-16은 2바이트 정렬).
+    """
+
+    INDEX_PROGRESS_SECONDS = 0.2  # index_pages가 진행 상황을 알리는 간격
+
+    def __init__(self, path, page_bytes=LARGE_FILE_PAGE_BYTES, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.page_bytes = page_bytes
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        # 페이지는 BOM 없이 디코딩하므로 UTF-16은 BOM으로 바이트 순서를 정하고, BOM 뒤부터 2바이트씩 정렬
+        self._codec = encoding
+        self._base = 0
+        if encoding == 'utf-16':
+            self._codec = 'utf-16-be' if self._map[:2] == b'\xfe\xff' else 'utf-16-le'
+            self._base = 2
+        self._unit = 2 if self._codec.startswith('utf-16') else 1
+        self._newline = '\n'.encode(self._codec)
+        # 작업 스레드는 덧붙이기만 하고, UI 스레드는 끝이 정해진 페이지(page_count)만 읽는다
+        self.page_starts = [0]
+        self._first_lines = [0]
+        self.complete = False
+        self.closed = False
+        self._extend()
+
+    def _next_start(self, start):
+        """start에서 시작하는 페이지의 끝(= 다음 페이지 시작), 파일 끝까지면 None"""
+        pos = start + self.page_bytes
+        if pos >= self.size:
+            return None
+        newline = self._find_newline(pos, pos + self.page_bytes)
+        if newline >= 0:
+            start = newline + len(self._newline)
         else:
-            sep = "------:"
-        
-        lines = []
-        if self.header_check.isChecked():
-            lines.append("| " + " | ".join([f"헤더{i+1}" for i in range(c)]) + " |")
-            lines.append("| " + " | ".join([sep for _ in range(c)]) + " |")
-            r -= 1
-        for _ in range(r):
-            lines.append("| " + " | ".join(["     " for _ in range(c)]) + " |")
-        return "\n".join(lines)
+            # 줄바꿈 없이 아주 긴 줄 - 디코더에 남는 바이트만큼 물러나 문자 중간을 피한다
+            decoder = codecs.getincrementaldecoder(self._codec)('replace')
+            decoder.decode(self._map[start:pos])
+            start = pos - len(decoder.getstate()[0])
+        return start if start < self.size else None
+
+    def _find_newline(self, start, end):
+        newline = self._map.find(self._newline, start, end)
+        while newline >= 0 and (newline - self._base) % self._unit:
+            newline = self._map.find(self._newline, newline + 1, end)
+        return newline
+
+    def _count_lines(self, start, end):
+        if self._unit == 1:
+            # UTF-8/CP949는 0x0A가 다른 문자의 일부로 나오지 않는다
+            return self._map[start:end].count(b'\n')
+        return self._map[start:end].decode(self._codec, errors='replace').count('\n')
+
+    def _extend(self):
+        """페이지 경계 하나를 더 찾는다 - 더 없으면 complete"""
+        start = self.page_starts[-1]
+        end = self._next_start(start)
+        if end is None:
+            self.complete = True
+            return False
+        self._first_lines.append(self._first_lines[-1] + self._count_lines(start, end))
+        self.page_starts.append(end)
+        return True
 
+    def index_pages(self):
+        """남은 페이지 경계와 줄 수를 센다 (작업 스레드용) - INDEX_PROGRESS_SECONDS마다, 끝나면 한 번 더 yield"""
+        reported = time.monotonic()
+        try:
+            while not self.closed and self._extend():
+                if time.monotonic() - reported >= self.INDEX_PROGRESS_SECONDS:
+                    reported = time.monotonic()
+                    yield
+        except ValueError:  # 세는 도중 close()로 매핑이 닫힘
+            return
+        yield
 
-class LinkDialog(QDialog):
-    def __init__(self, parent=None, selected=""):
-        super().__init__(parent)
-        self.setWindowTitle("링크 삽입")
-        self.setMinimumWidth(400)
-        layout = QVBoxLayout(self)
-        
-        layout.addWidget(QLabel("표시 텍스트:"))
-        self.text_edit = QLineEdit(selected)
-        layout.addWidget(self.text_edit)
-        
-        layout.addWidget(QLabel("URL:"))
-        self.url_edit = QLineEdit()
-        self.url_edit.setPlaceholderText("https://")
-        layout.addWidget(self.url_edit)
-        
-        layout.addWidget(QLabel("제목 (선택):"))
-        self.title_edit = QLineEdit()
-        self.title_edit.setPlaceholderText("마우스 오버시 표시")
-        layout.addWidget(self.title_edit)
-        
-        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
-    
-    def get_markdown(self):
-        text = self.text_edit.text() or "링크"
-        url = self.url_edit.text() or "#"
-        title = self.title_edit.text()
-        if title:
-            return f'[{text}]({url} "{title}")'
-        return f"[{text}]({url})"
+    @property
+    def page_count(self):
+        """끝이 정해져 읽을 수 있는 페이지 수 (색인이 끝나면 전체 페이지 수)"""
+        return len(self.page_starts) if self.complete else len(self.page_starts) - 1
 
+    def page_range(self, page):
+        end = self.page_starts[page + 1] if page + 1 < len(self.page_starts) else self.size
+        return self.page_starts[page], end
 
-class ImageDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("이미지 삽입")
-        self.setMinimumWidth(400)
-        layout = QVBoxLayout(self)
-        
-        layout.addWidget(QLabel("대체 텍스트:"))
-        self.alt = QLineEdit()
-        layout.addWidget(self.alt)
-        
-        layout.addWidget(QLabel("경로/URL:"))
-        url_layout = QHBoxLayout()
-        self.url = QLineEdit()
-        url_layout.addWidget(self.url)
-        browse = QPushButton("찾기")
-        browse.clicked.connect(self.browse)
-        url_layout.addWidget(browse)
-        layout.addLayout(url_layout)
-        
-        layout.addWidget(QLabel("크기 (선택):"))
-        size_layout = QHBoxLayout()
-        self.width = QSpinBox()
-        self.width.setRange(0, 2000)
-        self.width.setSpecialValueText("자동")
-        size_layout.addWidget(QLabel("너비:"))
-        size_layout.addWidget(self.width)
-        self.height = QSpinBox()
-        self.height.setRange(0, 2000)
-        self.height.setSpecialValueText("자동")
-        size_layout.addWidget(QLabel("높이:"))
-        size_layout.addWidget(self.height)
-        layout.addLayout(size_layout)
-        
-        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
+    def read_page(self, page):
+        start, end = self.page_range(page)
+        data = self._map[start:end]
+        # 페이지 끝의 줄바꿈은 다음 페이지의 시작이므로 에디터에는 넣지 않는다
+        if data.endswith(self._newline) and page + 1 < len(self.page_starts):
+            data = data[:-len(self._newline)]
+        text = data.decode(self._codec, errors='replace')
+        return text[1:] if page == 0 and text.startswith('\ufeff') else text
+
+    def first_line(self, page):
+        """page의 첫 줄 번호 (0부터)"""
+        return self._first_lines[page]
+
+    def page_of_line(self, line):
+        """파일 전체 기준 줄 번호(0부터)의 시작이 들어 있는 페이지 - 아직 세지 못한 곳이면 None
+
+        긴 줄이 여러 페이지에 걸치면 그 페이지들의 첫 줄 번호가 같으므로, 줄이 시작하는 앞 페이지를 고른다.
+        """
+        known = len(self._first_lines)
+        page = bisect_left(self._first_lines, line, 0, known)
+        if page == known or self._first_lines[page] != line or not self._starts_line(page):
+            page -= 1
+        return page if page < self.page_count else None
+
+    def _starts_line(self, page):
+        """page가 줄 처음에서 시작하는지 (앞 페이지가 줄바꿈으로 끝남)"""
+        start = self.page_starts[page]
+        return page == 0 or self._map[start - len(self._newline):start] == self._newline
+
+    def close(self):
+        self.closed = True
+        if self.size:
+            self._map.close()
+        self._file.close()
+
+
+class PageIndexer(QObject):
+    """MappedTextFile.index_pages()를 작업 스레드에서 돌리고 진행 상황을 UI 스레드로 알린다"""
+    progress = pyqtSignal(object)  # MappedTextFile (다 셌으면 complete)
+
+    def start(self, mapped):
+        threading.Thread(target=self._run, args=(mapped,), daemon=True).start()
+
+    def _run(self, mapped):
+        for _ in mapped.index_pages():
+            self.progress.emit(mapped)
+
+
+# ============== 파일 불러오기 ==============
+
+LOAD_CHUNK_CHARS = 64 * 1024  # UI 스레드에서 한 번에 넣는 분량 (한 번에 수십 ms)
+
+TEXT_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16'),
+)
+
+ENCODING_NAMES = {
+    'utf-8': 'UTF-8', 'utf-8-sig': 'UTF-8 BOM', 'utf-16': 'UTF-16',
+    'utf-16-le': 'UTF-16 LE', 'utf-16-be': 'UTF-16 BE', 'cp949': 'CP949',
+}
+
+
+def detect_encoding(data):
+    """BOM → UTF-16(NUL 바이트 분포) → UTF-8 → CP949 순서로 인코딩 추정
+
+    data가 파일 앞부분만 잘라 온 표본이어도 된다 (끝에서 잘린 UTF-8 문자는 무시).
+    """
+    for bom, encoding in TEXT_BOMS:
+        if data.startswith(bom):
+            return encoding
     
-    def browse(self):
-        path, _ = QFileDialog.getOpenFileName(self, "이미지 선택", "", "이미지 (*.png *.jpg *.jpeg *.gif *.svg *.webp)")
-        if path:
-            self.url.setText(path)
+    # BOM 없는 UTF-16: 영문/기호가 섞이면 한쪽 자리에만 NUL이 몰린다
+    sample = data[:4096]
+    half = len(sample) // 2
+    if half:
+        even, odd = sample[0::2].count(0), sample[1::2].count(0)
+        if odd > half * 0.3 and even < half * 0.05:
+            return 'utf-16-le'
+        if even > half * 0.3 and odd < half * 0.05:
+            return 'utf-16-be'
     
-    def get_markdown(self):
-        alt = self.alt.text() or "이미지"
-        url = self.url.text() or "image.png"
-        md = f"![{alt}]({url})"
-        
-        # HTML 크기 지정
-        w, h = self.width.value(), self.height.value()
-        if w > 0 or h > 0:
-            style = []
-            if w > 0:
-                style.append(f"width: {w}px")
-            if h > 0:
-                style.append(f"height: {h}px")
-            md = f'<img src="{url}" alt="{alt}" style="{"; ".join(style)}">'
-        return md
+    try:
+        data.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        if e.reason == 'unexpected end of data' and e.start >= len(data) - 3:
+            return 'utf-8'
+    try:
+        data.decode('cp949')
+        return 'cp949'
+    except UnicodeDecodeError:
+        return 'utf-8'  # 알 수 없으면 UTF-8로 읽고 깨진 글자는 대체 문자로
 
 
-class EmojiDialog(QDialog):
-    emoji_selected = pyqtSignal(str)
-    
+def decode_text(data, encoding):
+    """바이트 → 에디터용 텍스트 (줄바꿈은 \\n으로 통일)"""
+    text = data.decode(encoding, errors='replace')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class FileLoader(QObject):
+    """파일 읽기와 디코딩을 작업 스레드에서 실행
+
+    요청마다 세대 번호를 붙이고, 취소되었거나 더 새 요청이 있으면 결과를 버린다.
+    """
+    loaded = pyqtSignal(int, str, str)  # 세대, 텍스트, 인코딩
+    failed = pyqtSignal(int, str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("이모지")
-        self.setMinimumSize(400, 350)
-        layout = QVBoxLayout(self)
-        
-        # 검색
-        self.search = QLineEdit()
-        self.search.setPlaceholderText("검색...")
-        self.search.textChanged.connect(self.filter_emoji)
-        layout.addWidget(self.search)
-        
-        tabs = QTabWidget()
-        self.emoji_buttons = []
-        
-        for cat, emojis in EMOJI_LIST.items():
-            w = QWidget()
-            grid = QGridLayout(w)
-            grid.setContentsMargins(8, 8, 8, 8)
-            grid.setSpacing(8)
-            for i, e in enumerate(emojis):
-                btn = QPushButton(e)
-                btn.setFixedSize(56, 56)
-                btn.setFont(QFont("", 28))
-                btn.setStyleSheet("padding: 6px 4px;")
-                name = emoji_display_name(e)
-                tooltip = name if name else cat
-                btn.setToolTip(f"{e} {tooltip}")
-                btn.setProperty("emoji_name", name.lower())
-                btn.setProperty("emoji_category", cat.lower())
-                btn.clicked.connect(lambda _, em=e: self.select(em))
-                grid.addWidget(btn, i // 8, i % 8)
-                self.emoji_buttons.append(btn)
-            tabs.addTab(w, cat)
-        layout.addWidget(tabs)
-
-    def filter_emoji(self, text):
-        query = text.strip().lower()
-        for btn in self.emoji_buttons:
-            name = btn.property("emoji_name") or ""
-            category = btn.property("emoji_category") or ""
-            emoji = btn.text()
-            visible = not query or query in emoji or query in name or query in category
-            btn.setVisible(visible)
-    
-    def select(self, emoji):
-        self.emoji_selected.emit(emoji)
-        self.accept()
+        self.generation = 0
 
+    def load(self, path):
+        self.generation += 1
+        threading.Thread(target=self._read, args=(self.generation, path), daemon=True).start()
+        return self.generation
 
-class SnippetDialog(QDialog):
-    def __init__(self, snippets, parent=None):
-        super().__init__(parent)
+    def cancel(self):
+        self.generation += 1
+
+    def _read(self, generation, path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            encoding = detect_encoding(data)
+            text = decode_text(data, encoding)
+        except Exception as e:  # OSError 말고도 MemoryError, 드문 인코딩의 LookupError/UnicodeDecodeError
+            # 여기서 스레드가 조용히 끝나면 편집기가 읽기 전용으로 로딩 중에 멈춰 있게 된다
+            self.failed.emit(generation, str(e) or type(e).__name__)
+            return
+        if generation == self.generation:
+            self.loaded.emit(generation, text, encoding)
+
+
+# ============== 찾기 색인 ==============
+
+@functools.lru_cache(maxsize=64)
+def compile_search_pattern(query, case_sensitive=False, whole_word=False, regex=False):
+    """찾기 대화상자 옵션 → 컴파일된 패턴 (정규식 오류는 re.error로 올라간다)
+
+    ^/$는 항상 줄 단위(MULTILINE) - 문서 전체를 찾든 편집된 줄만 다시 찾든 결과가 같도록.
+    """
+    pattern = query if regex else re.escape(query)
+    if whole_word:
+        pattern = rf'(?<!\w)(?:{pattern})(?!\w)'
+    return re.compile(pattern, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+
+
+REGEX_TIME_BUDGET = 2.0  # 정규식 작업 하나에 허용하는 시간 (초) - 큰 문서는 100만 자마다 1초씩 더 준다
+REGEX_RETRY_DELAYS = (2, 10, 60)  # 프로세스를 띄우지 못했을 때 다시 시도하기까지 기다릴 시간 (초, 연속 실패 횟수별)
+
+
+def start_without_main(process):
+    """spawn 프로세스 시작 - 자식이 부모의 __main__(이 파일)을 다시 import해 QtWebEngine까지 불러오지 않게 한다
+
+    작업 함수는 Qt 없는 모듈(regex_jobs, markdown_render)에 있으므로, 시작하는 동안 __main__의 경로를 가려
+    자식이 그 모듈만 불러오게 한다. 묶어서 배포한 실행 파일은 자식이 __main__을 다시 실행하지 않으므로 그대로 둔다.
+    """
+    main = sys.modules['__main__']
+    main_file = None if getattr(sys, 'frozen', False) else main.__dict__.pop('__file__', None)
+    main_spec, main.__spec__ = getattr(main, '__spec__', None), None
+    try:
+        process.start()
+    finally:
+        if main_file is not None:
+            main.__file__ = main_file
+        main.__spec__ = main_spec
+
+
+class RegexWorker(QObject):
+    """정규식 찾기/바꾸기 전용 프로세스
+
+    re는 실행 중에 멈출 수 없고 GIL도 놓지 않으므로, (a+)+$ 같은 패턴의 폭주 역추적이
+    UI를 얼리지 않도록 별도 프로세스에서 돌린다. 작업이 시간 예산을 넘기거나 취소되면
+    프로세스째 종료하고 새로 띄운다. 작업은 한 번에 하나씩 보낸 순서대로 실행한다.
+    프로세스를 띄울 수 없으면 시간 제한 없이 UI 쪽에서 돌리지 않고 작업을 거절(unavailable)하며,
+    REGEX_RETRY_DELAYS만큼 기다렸다가 다음 작업에서 다시 띄워 본다.
+    작업 안에서 난 예외는 job_error로 알리고 프로세스는 계속 쓴다.
+    """
+    finished = pyqtSignal(int, list)  # 작업 번호, 결과
+    timed_out = pyqtSignal(int)
+    unavailable = pyqtSignal(int)  # 프로세스가 없어 실행하지 못한 작업 번호
+    job_error = pyqtSignal(int, str)  # 작업 번호, 작업 중에 난 예외 메시지 (프로세스는 계속 쓴다)
+    _message = pyqtSignal(int, str, int, object)  # 읽기 스레드 -> UI 스레드 (프로세스 세대, 종류, 작업, 결과)
+
+    def __init__(self, budget=REGEX_TIME_BUDGET, parent=None):
+        super().__init__(parent)
+        self.budget = budget
+        self.restarts = 0
+        self.failures = 0       # 연속으로 프로세스를 띄우지 못한 횟수
+        self._retry_at = 0.0    # 이 시각(time.monotonic) 전에는 다시 띄우지 않는다
+        self._job_id = 0
+        self._running = None  # 보낸 작업
+        self._queue = deque()  # 기다리는 작업
+        self._budgets = {}     # 작업 번호 -> 시간 예산 (초)
+        self._process = None
+        self._jobs = None
+        self._generation = 0
+        self._watchdog = QTimer(self)
+        self._watchdog.setSingleShot(True)
+        self._watchdog.timeout.connect(self._on_timeout)
+        self._message.connect(self._on_message)
+
+    def submit(self, kind, pattern, text, *args):
+        """kind='lines'면 find_line_matches, 'edits'면 replacement_edits 결과를 finished로 돌려준다"""
+        self._job_id += 1
+        job = (self._job_id, kind, pattern.pattern, pattern.flags, text, args)
+        self._budgets[self._job_id] = self.budget + len(text) / 1_000_000
+        if self._running is None:
+            self._send(job)
+        else:
+            self._queue.append(job)
+        return self._job_id
+
+    def cancel(self, job_id, terminate=True):
+        """기다리는 작업은 빼고, 실행 중인 작업은 terminate면 프로세스째 멈춘다"""
+        for job in self._queue:
+            if job[0] == job_id:
+                self._queue.remove(job)
+                self._budgets.pop(job_id, None)
+                return
+        if terminate and self._running is not None and self._running[0] == job_id:
+            self._budgets.pop(job_id, None)
+            self._restart()
+            self._send_queued()
+
+    def _start_process(self):
+        # Qt 스레드가 있는 프로세스를 fork하지 않도록 항상 spawn 사용
+        ctx = multiprocessing.get_context('spawn')
+        job_recv, self._jobs = ctx.Pipe(duplex=False)
+        results, result_send = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=regex_server_main, args=(job_recv, result_send), daemon=True)
+        start_without_main(process)
+        self._process = process
+        job_recv.close()
+        result_send.close()
+        self._generation += 1
+        threading.Thread(target=self._read_results, args=(self._generation, results), daemon=True).start()
+
+    def _read_results(self, generation, results):
+        while True:
+            try:
+                kind, job_id, result = results.recv()
+            except (EOFError, OSError):
+                break
+            self._message.emit(generation, kind, job_id, result)
+        results.close()
+        self._message.emit(generation, 'exit', 0, None)
+
+    @property
+    def available(self):
+        """프로세스가 떠 있거나, 지금 다시 띄워 볼 수 있는지"""
+        return self._process is not None or time.monotonic() >= self._retry_at
+
+    def _send(self, job):
+        if self._process is None and time.monotonic() >= self._retry_at:
+            try:
+                self._start_process()
+            except Exception:
+                self._process_failed()
+        if self._process is None:
+            # submit 안에서 바로 신호를 보내면 호출한 쪽이 아직 작업 번호를 모르므로 다음 이벤트로 미룬다
+            self._budgets.pop(job[0], None)
+            QTimer.singleShot(0, lambda: self.unavailable.emit(job[0]))
+            self._send_queued()
+            return
+        self._running = job
+        # 큰 문서는 파이프 버퍼보다 커서 보내는 동안 막히므로 스레드에서 보낸다
+        jobs = self._jobs
+
+        def send():
+            try:
+                jobs.send(job)
+            except (OSError, ValueError):
+                pass
+        threading.Thread(target=send, daemon=True).start()
+
+    def _send_queued(self):
+        if self._queue:
+            self._send(self._queue.popleft())
+
+    def _on_message(self, generation, kind, job_id, result):
+        if generation != self._generation:
+            return
+        if kind == 'exit':
+            # 프로세스가 스스로 끝남 (시작 실패 등) - 실행 중이던 작업은 거절하고 잠시 뒤에 다시 띄운다
+            self._watchdog.stop()
+            self._stop_process()
+            self._process_failed()
+            running, self._running = self._running, None
+            if running is not None:
+                self._budgets.pop(running[0], None)
+                self.unavailable.emit(running[0])
+            self._send_queued()
+            return
+        if self._running is None or self._running[0] != job_id:
+            return
+        if kind == 'start':
+            self.failures = 0
+            self._watchdog.start(int(self._budgets[job_id] * 1000))  # 프로세스 시작 시간은 예산에 넣지 않는다
+            return
+        self._watchdog.stop()
+        self._budgets.pop(job_id, None)
+        self._running = None
+        self._send_queued()
+        if kind == 'error':
+            self.job_error.emit(job_id, result)
+        else:
+            self.finished.emit(job_id, result)
+
+    def _on_timeout(self):
+        if self._running is None:
+            return
+        job_id = self._running[0]
+        self._budgets.pop(job_id, None)
+        self._restart()
+        self._send_queued()
+        self.timed_out.emit(job_id)
+
+    def _process_failed(self):
+        self.failures += 1
+        delay = REGEX_RETRY_DELAYS[min(self.failures, len(REGEX_RETRY_DELAYS)) - 1]
+        self._retry_at = time.monotonic() + delay
+
+    def _restart(self):
+        self._watchdog.stop()
+        self._running = None
+        self.restarts += 1
+        self._stop_process()
+
+    def _stop_process(self):
+        if self._process is None:
+            return
+        self._generation += 1
+        self._process.terminate()
+        self._process.join(1)
+        try:
+            self._jobs.close()
+        except OSError:
+            pass
+        self._process = None
+
+    def shutdown(self):
+        self._queue.clear()
+        self._budgets.clear()
+        self._running = None
+        self._watchdog.stop()
+        self._stop_process()
+
+
+class SearchMatchIndex(QObject):
+    """문서 전체의 찾기 결과 색인 - 줄별 결과 목록
+
+    처음에는 텍스트 스냅샷으로 작업 스레드에서 만들고, 이후에는 DocumentModel.changed가
+    알려주는 편집 구간의 줄만 다시 찾아 갈아 끼운다.
+    정규식은 RegexWorker 프로세스에서 찾는다 - 편집된 줄도 잠시 비워 두었다가 모아서 다시 찾는다.
+    줄을 넘어가는 결과가 있으면 편집 구간만으로는 알 수 없으므로 편집 후 잠시 뒤 전체를 다시 찾는다.
+    """
+    updated = pyqtSignal()
+    _built = pyqtSignal(int, list)  # 작업 스레드 -> UI 스레드
+    
+    REBUILD_LINES = 5000  # 한 번에 이보다 많은 줄이 바뀌면 다시 백그라운드로 만든다
+
+    def __init__(self, doc_model, worker=None, parent=None):
+        super().__init__(parent)
+        self.doc_model = doc_model
+        self.worker = worker
+        self.pattern = None
+        self.isolated = False  # 패턴을 worker 프로세스에서 찾는지
+        self.failed = None     # 색인을 만들지 못한 이유 - 'timeout'(시간 예산 초과), 'unavailable'(프로세스 없음), 'error'(예외)
+        self.error = ""        # failed가 'error'일 때 예외 메시지
+        self.lines = []     # 줄별 [(시작 열, 끝 열), ...]
+        self.counts = []    # 줄별 결과 수
+        self.total = 0
+        self.ready = False
+        self.spanning = False  # 줄을 넘어가는 결과가 있음
+        self._prefix = None    # 줄별 앞선 결과 수 (ordinal용, 바뀌면 다시 만든다)
+        self._generation = 0
+        self._dirty = False
+        self._revision = 0   # 문서 변경 횟수
+        self._job = None     # worker 작업 (번호, 세대, 줄 범위, 스냅샷 당시 revision)
+        self._stale = None   # 아직 다시 찾지 않은 줄 범위 [시작, 끝)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(100)
+        self._rescan_timer.timeout.connect(self._rescan_stale)
+        self._built.connect(self._on_built)
+        doc_model.changed.connect(self._on_changed)
+        if worker is not None:
+            worker.finished.connect(self._on_job_finished)
+            worker.timed_out.connect(lambda job_id: self._on_job_failed(job_id, 'timeout'))
+            worker.unavailable.connect(lambda job_id: self._on_job_failed(job_id, 'unavailable'))
+            worker.job_error.connect(lambda job_id, message: self._on_job_failed(job_id, 'error', message))
+
+    def set_pattern(self, pattern, isolated=False):
+        """pattern=None이면 색인을 비운다, isolated면 worker 프로세스에서 찾는다"""
+        self.pattern = pattern
+        self.isolated = isolated and self.worker is not None
+        self.failed = None
+        self.error = ""
+        self._generation += 1
+        self.lines, self.counts, self.total = [], [], 0
+        self.ready = False
+        self.spanning = False
+        self._prefix = None
+        self._stale = None
+        self._rescan_timer.stop()
+        self._cancel_job()
+        if pattern is None:
+            self.updated.emit()
+            return
+        self._start_build()
+
+    def _start_build(self):
+        self._dirty = False
+        generation = self._generation
+        pattern = self.pattern
+        text = '\n'.join(self.doc_model.lines())
+        if self.isolated:
+            self._cancel_job(terminate=False)
+            self._stale = None
+            job = self.worker.submit('lines', pattern, text)
+            self._job = (job, generation, None, self._revision)
+            return
+        threading.Thread(target=lambda: self._built.emit(generation, find_line_matches(pattern, text)),
+                         daemon=True).start()
+
+    def _on_built(self, generation, lines):
+        if generation != self._generation:
+            return
+        if self._dirty:
+            self._start_build()  # 만드는 동안 문서가 바뀌었으면 새 스냅샷으로 다시
+            return
+        self.lines = lines
+        self.counts = [len(matches) for matches in lines]
+        self.total = sum(self.counts)
+        self.spanning = self._has_spanning(0, lines)
+        self._prefix = None
+        self.ready = True
+        self.updated.emit()
+
+    def _on_changed(self, first, removed, added):
+        if self.pattern is None:
+            return
+        self._revision += 1
+        if not self.ready:
+            self._dirty = True
+            return
+        if added > self.REBUILD_LINES:
+            self._generation += 1
+            self.ready = False
+            self._start_build()
+            return
+        if self.isolated or self.spanning:
+            self._mark_stale(first, removed, added)
+            return
+        # 전체를 찾을 때와 같은 방식으로 - 바뀐 줄들을 이어 붙인 텍스트에서 찾는다
+        texts = self.doc_model.lines()
+        new_lines = find_line_matches(self.pattern, '\n'.join(texts[first:first + added])) if added else []
+        self._splice(first, first + removed, new_lines)
+
+    def _splice(self, start, end, new_lines):
+        new_counts = [len(matches) for matches in new_lines]
+        self.total += sum(new_counts) - sum(self.counts[start:end])
+        self.lines[start:end] = new_lines
+        self.counts[start:end] = new_counts
+        self._prefix = None
+        if not self.spanning and self._has_spanning(start, new_lines):
+            self.spanning = True
+            self._rescan_timer.start()  # 이번 편집 구간 밖으로 이어지는 결과가 있을 수 있다
+        self.updated.emit()
+
+    def _has_spanning(self, first, lines):
+        """lines(first번 줄부터)에 줄 끝을 넘어가는 결과가 있는지"""
+        texts = self.doc_model.lines()
+        for i, matches in enumerate(lines, first):
+            # 결과는 겹치지 않고 순서대로이므로 마지막 결과의 끝이 가장 뒤 (UTF-16 길이는 글자 수 이상)
+            if (matches and i < len(texts) and matches[-1][1] > len(texts[i])
+                    and matches[-1][1] > len(texts[i].encode('utf-16-le')) // 2):
+                return True
+        return False
+
+    # ----- worker 프로세스 (정규식) -----
+    def _mark_stale(self, first, removed, added):
+        """바뀐 줄은 결과를 비워 두고, 다시 찾을 범위를 현재 줄 번호 기준으로 넓힌다"""
+        self._splice(first, first + removed, [()] * added)
+        end = first + added
+        if self._stale is None:
+            self._stale = (first, end)
+        else:
+            def shift(line):
+                return line if line <= first else max(end, line + added - removed)
+            start, stop = self._stale
+            self._stale = (min(shift(start), first), max(shift(stop), end))
+        self._rescan_timer.start()
+
+    def _rescan_stale(self):
+        if not self.ready or (self._stale is None and not self.spanning):
+            return
+        start, end = self._stale or (0, 0)
+        if self.spanning or end - start > self.REBUILD_LINES:
+            # 전체를 다시 - 그동안의 편집은 _dirty로 모아 끝난 뒤 한 번 더 만든다
+            self._generation += 1
+            self.ready = False
+            self._start_build()
+            return
+        text = '\n'.join(self.doc_model.lines()[start:end])
+        self._cancel_job(terminate=False)
+        job = self.worker.submit('lines', self.pattern, text)
+        self._job = (job, self._generation, (start, end), self._revision)
+
+    def _cancel_job(self, terminate=True):
+        """terminate=False면 실행 중인 작업은 그대로 두고 결과만 버린다 (짧은 작업마다 프로세스를 다시 띄우지 않도록)"""
+        if self._job is not None:
+            self.worker.cancel(self._job[0], terminate)
+            self._job = None
+
+    def _on_job_finished(self, job_id, lines):
+        if self._job is None or self._job[0] != job_id:
+            return
+        _, generation, span, revision = self._job
+        self._job = None
+        if span is None:
+            self._on_built(generation, lines)
+        elif revision == self._revision and generation == self._generation:
+            self._stale = None
+            self._splice(span[0], span[1], lines)
+        # 그 사이 문서가 바뀌었으면 넓어진 _stale 범위로 타이머가 다시 찾는다
+
+    def _on_job_failed(self, job_id, reason, message=""):
+        if self._job is None or self._job[0] != job_id:
+            return
+        self._job = None
+        self._stale = None
+        self._rescan_timer.stop()
+        self.failed = reason
+        self.error = message
+        self.lines, self.counts, self.total = [], [], 0
+        self.ready = False
+        self.updated.emit()
+
+    # ----- 조회 -----
+    def ordinal(self, line, col):
+        """(line, col)에서 시작하는 결과의 순번 (1부터), 없으면 0"""
+        matches = self.lines[line] if 0 <= line < len(self.lines) else ()
+        i = bisect_left(matches, (col,))
+        if i == len(matches) or matches[i][0] != col:
+            return 0
+        if self._prefix is None:
+            self._prefix = [0, *itertools.accumulate(self.counts)]
+        return self._prefix[line] + i + 1
+
+    def next_match(self, line, col, backward=False):
+        """(line, col) 다음(backward면 이전) 결과 (줄, 시작 열, 끝 열) - 끝에 닿으면 처음부터"""
+        if not self.total:
+            return None
+        lines = self.lines
+        count = len(lines)
+        if backward:
+            for i in range(line, line - count - 1, -1):
+                matches = lines[i % count]
+                for start, end in reversed(matches):
+                    if i != line or start < col:
+                        return i % count, start, end
+        else:
+            for i in range(line, line + count + 1):
+                matches = lines[i % count]
+                for start, end in matches:
+                    if i != line or start >= col:
+                        return i % count, start, end
+        return None
+
+    def matches_in(self, first, last):
+        """줄 [first, last] 안의 결과 (줄, 시작 열, 끝 열)"""
+        for line in range(max(0, first), min(last + 1, len(self.lines))):
+            for start, end in self.lines[line]:
+                yield line, start, end
+
+
+# ============== 폴더 검색 ==============
+
+WORKSPACE_EXTENSIONS = ('.md', '.markdown')
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+SEARCH_RESULT_LIMIT = 300   # 결과 목록에 보여 줄 최대 줄 수
+SEARCH_PREFIX_LIMIT = 512   # 앞부분 일치로 넓힐 최대 토큰 수
+SEARCH_POOL_MIN_FILES = 64  # 이보다 많은 파일을 새로 읽을 때만 프로세스 풀 사용
+FIRST_HEADING_PATTERN = re.compile(r'^#{1,6}[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+
+
+def tokenize_markdown_file(path):
+    """파일 하나의 색인 항목 (mtime, 크기, 토큰이 있는 줄 번호, 그 줄의 첫 토큰 위치, {토큰: [위치, ...]}, 첫 제목)
+
+    위치는 파일 안에서 몇 번째 토큰인지다. 못 읽으면 None.
+    ProcessPoolExecutor에서도 부르므로 모듈 수준 함수로 둔다.
+    """
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    text = decode_text(data, detect_encoding(data))
+    heading = FIRST_HEADING_PATTERN.search(text)
+    postings = {}
+    lines, starts = [], []
+    position = 0
+    for number, line in enumerate(text.lower().split('\n')):
+        tokens = SEARCH_TOKEN_PATTERN.findall(line)
+        if not tokens:
+            continue
+        lines.append(number)
+        starts.append(position)
+        for token in tokens:
+            postings.setdefault(token, []).append(position)
+            position += 1
+    return stat.st_mtime, stat.st_size, lines, starts, postings, heading.group(1).strip() if heading else ''
+
+
+def parse_search_query(query):
+    """검색어 → 구절 목록 [([토큰, ...], 따옴표 여부), ...] - "따옴표"로 묶거나 기호로 이어진 단어는 한 구절"""
+    phrases = []
+    for quoted, word in re.findall(r'"([^"]*)"|(\S+)', query.lower()):
+        tokens = SEARCH_TOKEN_PATTERN.findall(quoted or word)
+        if tokens:
+            phrases.append((tokens, bool(quoted)))
+    return phrases
+
+
+class WorkspaceIndex(QObject):
+    """폴더 안 Markdown 파일의 위치 역색인 - SEARCH_INDEX_DIR에 폴더별로 저장
+
+    토큰마다 {파일 번호: [토큰 위치, ...]}를 두어 여러 단어는 파일 교집합, 구절은 연속 위치로 찾는다.
+    처음에는 프로세스 풀로 나눠 만들고, 이후에는 수정 시각/크기가 바뀐 파일만 다시 읽는다.
+    색인 작업은 전용 스레드 하나가 차례로 처리하고, 검색은 잠금을 잡고 UI 스레드에서 한다.
+    """
+    VERSION = 2
+    SAVE_DELAY = 3.0  # 마지막 변경 후 이만큼(초) 조용하면 디스크에 쓴다
+    progress = pyqtSignal(int, int)   # 읽은 파일 수, 전체
+    updated = pyqtSignal()            # 색인 내용이 바뀌었거나 처음 준비됨
+    failed = pyqtSignal(str)          # 색인 작업 오류 (error에도 남는다)
+    _dirs_found = pyqtSignal(list)    # 작업 스레드 -> UI 스레드 (감시할 폴더)
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = os.path.abspath(root)
+        key = hashlib.sha1(self.root.encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(SEARCH_INDEX_DIR, f"{key}.json")
+        self.ready = False
+        self.error = None     # 마지막 색인 작업의 오류 메시지 (다음 훑기가 성공하면 지운다)
+        self.entries = []     # 파일 번호 -> [상대 경로, mtime, 크기, 줄 번호 목록, 첫 토큰 위치 목록, 첫 제목] (삭제되면 None)
+        self.ids = {}         # 상대 경로 -> 파일 번호
+        self.postings = {}    # 토큰 -> {파일 번호: [위치, ...]}
+        self.file_tokens = {} # 파일 번호 -> 토큰 목록 (파일을 뺄 때 사용)
+        self._vocabulary = None  # 정렬된 토큰 목록 (앞부분 일치용, 바뀌면 다시 만든다)
+        self._lock = threading.Lock()
+        self._tasks = queue.Queue()
+        self._sweep_queued = False
+        self._unsaved = False
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(lambda _: self.sweep_timer.start())
+        self.sweep_timer = QTimer(self)
+        self.sweep_timer.setSingleShot(True)
+        self.sweep_timer.setInterval(1000)
+        self.sweep_timer.timeout.connect(self.refresh)
+        self._dirs_found.connect(self._watch_dirs)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    # ----- 작업 요청 (UI 스레드) -----
+    def open(self):
+        """저장된 색인을 읽고, 바뀐 파일만 다시 색인한다"""
+        self._tasks.put(('load', None))
+        self.refresh()
+
+    def refresh(self):
+        """폴더 전체의 mtime/크기를 훑어 바뀐 파일을 반영 (이미 대기 중이면 합친다)"""
+        if not self._sweep_queued:
+            self._sweep_queued = True
+            self._tasks.put(('sweep', None))
+
+    def update_paths(self, paths):
+        """저장한 파일 등 특정 파일만 다시 색인 (폴더 밖이나 Markdown이 아닌 파일은 무시)"""
+        paths = [os.path.abspath(p) for p in paths]
+        paths = [p for p in paths if p.lower().endswith(WORKSPACE_EXTENSIONS) and self.contains(p)]
+        if paths:
+            self._tasks.put(('files', paths))
+
+    def contains(self, path):
+        """절대 경로 path가 이 폴더 안에 있는지"""
+        try:
+            return os.path.commonpath([self.root, path]) == self.root
+        except ValueError:  # Windows에서 다른 드라이브
+            return False
+
+    def shutdown(self):
+        self.sweep_timer.stop()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self._tasks.put(('stop', None))
+
+    def _watch_dirs(self, dirs):
+        watched = set(self.watcher.directories())
+        missing = [d for d in dirs if d not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    # ----- 작업 스레드 -----
+    def _run(self):
+        while True:
+            try:
+                task, arg = self._tasks.get(timeout=self.SAVE_DELAY if self._unsaved else None)
+            except queue.Empty:
+                self._save()
+                continue
+            if task == 'stop':
+                if self._unsaved:
+                    self._save()
+                return
+            try:
+                if task == 'load':
+                    self._load()
+                elif task == 'sweep':
+                    self._sweep_queued = False
+                    self._sweep()
+                else:
+                    self._reindex(arg, [])
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self.failed.emit(self.error)
+            else:
+                if task == 'sweep':
+                    self.error = None
+            if not self.ready and task != 'load':
+                self.ready = True
+                self.updated.emit()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION or data.get('root') != self.root:
+                return
+        except:
+            return
+        entries = data['entries']
+        postings = {}
+        file_tokens = {fid: [] for fid, entry in enumerate(entries) if entry is not None}
+        for token, flat in data['postings'].items():
+            files = dict(zip(flat[0::2], flat[1::2]))
+            postings[token] = files
+            for fid in files:
+                file_tokens[fid].append(token)
+        with self._lock:
+            self.entries = entries
+            self.ids = {entry[0]: fid for fid, entry in enumerate(entries) if entry is not None}
+            self.postings = postings
+            self.file_tokens = file_tokens
+            self._vocabulary = None
+        self.ready = True
+        self.updated.emit()
+
+    def _save(self):
+        # 색인은 이 작업 스레드에서만 바뀌므로 잠금 없이 읽어도 된다
+        self._unsaved = False
+        postings = {token: [x for fid, positions in files.items() for x in (fid, positions)]
+                    for token, files in self.postings.items()}
+        data = {'version': self.VERSION, 'root': self.root, 'entries': self.entries, 'postings': postings}
+        try:
+            os.makedirs(SEARCH_INDEX_DIR, exist_ok=True)
+            temp = self.path + '.tmp'
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp, self.path)
+        except:
+            pass
+
+    def _sweep(self):
+        found = {}
+        dirs = []
+        for folder, subdirs, names in os.walk(self.root):
+            subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+            dirs.append(folder)
+            for name in names:
+                if name.lower().endswith(WORKSPACE_EXTENSIONS):
+                    path = os.path.join(folder, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found[os.path.relpath(path, self.root)] = (stat.st_mtime, stat.st_size)
+        self._dirs_found.emit(dirs)
+        
+        with self._lock:
+            changed = [rel for rel, (mtime, size) in found.items()
+                       if rel not in self.ids or self.entries[self.ids[rel]][1:3] != [mtime, size]]
+            removed = [rel for rel in self.ids if rel not in found]
+        if changed or removed:
+            self._reindex([os.path.join(self.root, rel) for rel in changed], removed)
+
+    def _reindex(self, paths, removed):
+        """paths를 다시 읽어 갈아 끼우고 removed(상대 경로)는 뺀다"""
+        results = []
+        total = len(paths)
+        workers = min(os.cpu_count() or 1, 8)
+        if total >= SEARCH_POOL_MIN_FILES and workers > 1:
+            # 처음 색인처럼 파일이 많으면 프로세스 풀로 나눠 읽는다 (Qt 스레드가 있으므로 spawn)
+            try:
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                    for path, entry in zip(paths, pool.map(tokenize_markdown_file, paths, chunksize=16)):
+                        results.append((path, entry))
+                        if len(results) % 256 == 0:
+                            self.progress.emit(len(results), total)
+            except Exception:
+                results = []
+        if len(results) < total:
+            results = []
+            for path in paths:
+                results.append((path, tokenize_markdown_file(path)))
+                if len(results) % 256 == 0:
+                    self.progress.emit(len(results), total)
+        self.progress.emit(total, total)
+        
+        with self._lock:
+            for rel in removed:
+                self._remove(rel)
+            for path, entry in results:
+                rel = os.path.relpath(path, self.root)
+                fid = self.ids.get(rel, len(self.entries))  # 다시 읽은 파일은 같은 번호를 쓴다
+                self._remove(rel)
+                if entry is None:
+                    continue
+                mtime, size, lines, starts, postings, title = entry
+                if fid == len(self.entries):
+                    self.entries.append(None)
+                self.entries[fid] = [rel, mtime, size, lines, starts, title]
+                self.ids[rel] = fid
+                self.file_tokens[fid] = list(postings)
+                for token, positions in postings.items():
+                    self.postings.setdefault(token, {})[fid] = positions
+            self._vocabulary = None
+        self._unsaved = True
+        self.updated.emit()
+
+    def _remove(self, rel):
+        fid = self.ids.pop(rel, None)
+        if fid is None:
+            return
+        self.entries[fid] = None
+        for token in self.file_tokens.pop(fid, ()):
+            files = self.postings.get(token)
+            if files is not None:
+                files.pop(fid, None)
+                if not files:
+                    del self.postings[token]
+
+    # ----- 검색 -----
+    def file_count(self):
+        return len(self.ids)
+
+    def files(self):
+        """[(상대 경로, 첫 제목), ...] 스냅샷"""
+        with self._lock:
+            return [(entry[0], entry[5]) for entry in self.entries if entry is not None]
+
+    def _token_positions(self, token, prefix=True):
+        """토큰(prefix이고 2글자 이상이면 앞부분 일치) → {파일 번호: 정렬된 위치 목록}"""
+        exact = self.postings.get(token, {})
+        if not prefix or len(token) < 2:
+            return exact
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, token)
+        end = bisect_left(vocabulary, token + '\U0010ffff', start, min(len(vocabulary), start + SEARCH_PREFIX_LIMIT))
+        if end - start <= 1:
+            return self.postings[vocabulary[start]] if end > start else exact
+        merged = {}
+        for word in vocabulary[start:end]:
+            for fid, positions in self.postings[word].items():
+                merged.setdefault(fid, []).append(positions)
+        return {fid: lists[0] if len(lists) == 1 else sorted(p for positions in lists for p in positions)
+                for fid, lists in merged.items()}
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """검색어 → ([(상대 경로, 줄 번호, 그 줄의 결과 수), ...], 결과 파일 수)
+
+        파일은 결과가 많은 순서, 같은 파일 안에서는 줄 순서다.
+        따옴표로 묶은 구절은 토큰이 정확히 같아야 하고, 그 밖의 단어는 앞부분만 같아도 된다.
+        """
+        phrases = parse_search_query(query)
+        if not phrases:
+            return [], 0
+        with self._lock:
+            lookups = [[self._token_positions(token, not quoted) for token in tokens] for tokens, quoted in phrases]
+            candidates = None
+            for lookup in lookups:
+                files = set(lookup[0])
+                for positions in lookup[1:]:
+                    files &= positions.keys()
+                candidates = files if candidates is None else candidates & files
+            
+            hits = []
+            entries = self.entries
+            for fid in candidates:
+                starts = []
+                for lookup in lookups:
+                    first = lookup[0][fid]
+                    if len(lookup) > 1:
+                        following = [set(positions[fid]) for positions in lookup[1:]]
+                        first = [p for p in first if all(p + i in s for i, s in enumerate(following, 1))]
+                        if not first:
+                            break
+                    starts.extend(first)
+                else:
+                    hits.append((-len(starts), entries[fid][0], fid, starts))
+            hits.sort()  # 결과 수, 경로 순서 (경로는 겹치지 않는다)
+            
+            results = []
+            for _, _, fid, starts in hits:
+                rel, _, _, lines, line_starts, _ = entries[fid]
+                per_line = Counter(lines[bisect_right(line_starts, p) - 1] for p in starts)
+                results.extend((rel, line, count) for line, count in sorted(per_line.items()))
+                if len(results) >= limit:
+                    break
+        return results[:limit], len(hits)
+
+
+QUICK_OPEN_LIMIT = 50       # 빠른 열기 목록에 보여 줄 최대 항목 수
+QUICK_OPEN_RECENT_WEIGHT = 0.5  # 가장 최근 파일에 더하는 점수 (순위가 내려갈수록 줄어든다)
+QUICK_OPEN_TYPO_RATIO = 0.8     # 검색어 글자가 이 비율 이상 순서대로 파일 이름에 있으면 오타로 본다
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def common_subsequence(a, b):
+    """a와 b의 가장 긴 공통 부분 수열 길이 - 글자가 빠지거나 자리가 바뀐 오타도 대부분 남는다"""
+    row = [0] * (len(b) + 1)
+    for ch in a:
+        prev = 0
+        for j, other in enumerate(b, 1):
+            prev, row[j] = row[j], prev + 1 if ch == other else max(row[j], row[j - 1])
+    return row[-1]
+
+
+class QuickOpenIndex(QObject):
+    """빠른 열기 색인 - 폴더 파일의 '상대 경로 첫 제목'을 3글자 조각(trigram) 역색인으로
+
+    검색어 조각과 많이 겹치는 항목을 후보로 뽑은 뒤 (단어 순서가 달라도 찾는다),
+    부분 문자열 일치, 파일 이름과의 공통 부분 수열(오타), 최근 파일 순위를 더해 점수를 매긴다.
+    색인은 WorkspaceIndex가 바뀔 때 작업 스레드에서 새로 만들어 바꿔 끼운다.
+    """
+    updated = pyqtSignal()
+    _built = pyqtSignal(int, object)  # 작업 스레드 -> UI 스레드
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.rels = []      # 항목 번호 -> 상대 경로
+        self.titles = []    # 항목 번호 -> 첫 제목
+        self.keys = []      # 소문자 '상대 경로 제목'
+        self.names = []     # 소문자 파일 이름
+        self.postings = {}  # trigram -> [항목 번호, ...]
+        self.workspace = None
+        self._generation = 0
+        self._built.connect(self._on_built)
+        self.build_timer = QTimer(self)
+        self.build_timer.setSingleShot(True)
+        self.build_timer.setInterval(500)
+        self.build_timer.timeout.connect(self._start_build)
+
+    def set_workspace(self, workspace):
+        if self.workspace is not None:
+            self.workspace.updated.disconnect(self.build_timer.start)
+        self.workspace = workspace
+        workspace.updated.connect(self.build_timer.start)
+        self.build_timer.start()
+
+    def _start_build(self):
+        self._generation += 1
+        generation, workspace = self._generation, self.workspace
+        threading.Thread(target=lambda: self._built.emit(generation, self.build(workspace.root, workspace.files())),
+                         daemon=True).start()
+
+    @staticmethod
+    def build(root, files):
+        rels, titles, keys, names = [], [], [], []
+        postings = {}
+        for item, (rel, title) in enumerate(sorted(files)):
+            key = f"{rel} {title}".lower()
+            rels.append(rel)
+            titles.append(title)
+            keys.append(key)
+            names.append(os.path.basename(rel).lower())
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(item)
+        return root, rels, titles, keys, names, postings
+
+    def _on_built(self, generation, data):
+        if generation != self._generation:
+            return
+        self.root, self.rels, self.titles, self.keys, self.names, self.postings = data
+        self.updated.emit()
+
+    def item_for(self, path):
+        """폴더 안 파일이면 항목 번호 (rels는 정렬되어 있다), 아니면 None"""
+        if self.root is None:
+            return None
+        try:
+            rel = os.path.relpath(path, self.root)
+        except ValueError:  # Windows에서 다른 드라이브
+            return None
+        item = bisect_left(self.rels, rel)
+        return item if item < len(self.rels) and self.rels[item] == rel else None
+
+    @staticmethod
+    def score(query, terms, grams, key, name):
+        """일치 점수 - trigram 겹친 비율 + 단어가 모두 들어 있으면 0.5 + 파일 이름 일치 보너스, 0.5 미만은 제외
+
+        단어가 그대로 들어 있지 않으면 파일 이름과의 공통 부분 수열 비율로 오타를 봐준다 (raedme → readme.md).
+        """
+        score = sum(gram in key for gram in grams) / len(grams) if grams else 0.0
+        if all(term in key for term in terms):
+            score += 0.5
+        elif len(query) >= 3:
+            compact = query.replace(' ', '')
+            ratio = common_subsequence(compact, name) / len(compact)
+            if ratio >= QUICK_OPEN_TYPO_RATIO:
+                score += 0.5 * ratio
+        if query in name:
+            score += 0.8 if name.startswith(query) else 0.5
+        return score if score >= 0.5 else 0.0
+
+    def candidates(self, query, grams, limit):
+        """점수를 매길 항목 번호 - 흔한 조각(항목의 1/4 이상)은 빼고 겹친 수로 추린다"""
+        count = len(self.keys)
+        if not grams:
+            # 조각이 없는 짧은 검색어 - 점수가 높은 순서(파일 이름 앞부분, 파일 이름, 경로/제목)대로 모은다
+            prefix, inside, other = [], [], []
+            for i, key in enumerate(self.keys):
+                if query in key:
+                    name = self.names[i]
+                    (prefix if name.startswith(query) else inside if query in name else other).append(i)
+            return (prefix + inside + other)[:limit * 20]
+        lists = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        rare = [items for items in lists if len(items) <= count // 4]
+        if rare:
+            counts = Counter()
+            for items in rare:
+                counts.update(items)
+            return [i for i, _ in counts.most_common(limit * 4)]
+        if not lists[0]:
+            return []
+        common = set(lists[0])
+        for items in lists[1:]:
+            common.intersection_update(items)
+        return sorted(common)[:limit * 20]
+
+    def search(self, query, recent=(), limit=QUICK_OPEN_LIMIT):
+        """검색어 → [(절대 경로, 표시 경로, 제목), ...] 점수 순
+
+        recent는 최근 파일 목록(절대 경로, 최근 순) - 순위만큼 점수를 더하고, 폴더 밖 파일도 후보로 넣는다.
+        """
+        query = query.strip().lower()
+        recent_rank = {os.path.normcase(path): rank for rank, path in enumerate(recent)}
+        if not query:
+            return [(path, path, '') for path in recent[:limit]]
+        terms = query.split()
+        grams = set()
+        for term in terms:
+            grams |= trigrams(term)
+        
+        def recency(path):
+            rank = recent_rank.get(os.path.normcase(path))
+            return 0.0 if rank is None else QUICK_OPEN_RECENT_WEIGHT * (1 - rank / len(recent_rank))
+        
+        scored = {}
+        root = self.root
+        for item in self.candidates(query, grams, limit):
+            score = self.score(query, terms, grams, self.keys[item], self.names[item])
+            if score:
+                path = os.path.join(root, self.rels[item])
+                scored[os.path.normcase(path)] = (score + recency(path), path, self.rels[item], self.titles[item])
+        for path in recent:
+            key = os.path.normcase(path)
+            if key in scored:
+                continue
+            item = self.item_for(path)
+            if item is None:
+                score = self.score(query, terms, grams, path.lower(), os.path.basename(path).lower())
+                if score:
+                    scored[key] = (score + recency(path), path, path, '')
+            else:
+                score = self.score(query, terms, grams, self.keys[item], self.names[item])
+                if score:
+                    scored[key] = (score + recency(path), path, self.rels[item], self.titles[item])
+        ranked = sorted(scored.values(), key=lambda entry: (-entry[0], entry[2]))
+        return [(path, shown, title) for _, path, shown, title in ranked[:limit]]
+
+
+# ============== 미리보기 렌더링 ==============
+
+# 블록 변환(render_markdown_block 등)은 렌더 서버 프로세스도 쓰므로 Qt 없는 markdown_render에 있다
+
+HEADING_ID_PATTERN = re.compile(r'(<h[1-6] id=")([^"]*)(")')
+HEADING_ID_COUNT_PATTERN = re.compile(r'^(.*)_([0-9]+)$')
+
+
+class HeadingIds:
+    """블록마다 따로 변환한 제목 id를 문서 전체에서 겹치지 않게 고친다
+
+    toc 확장의 unique()처럼 이미 쓴 id면 _1, _2... 꼬리를 붙인다. 렌더마다 새로 만들어 문서 순서대로 fix()를 부른다.
+    """
+
+    def __init__(self):
+        self.used = set()
+
+    def _unique(self, match):
+        ident = match.group(2)
+        while ident in self.used or not ident:
+            m = HEADING_ID_COUNT_PATTERN.match(ident)
+            ident = f"{m.group(1)}_{int(m.group(2)) + 1}" if m else f"{ident}_1"
+        self.used.add(ident)
+        return match.group(1) + ident + match.group(3)
+
+    def fix(self, html):
+        if '<h' not in html:
+            return html
+        return HEADING_ID_PATTERN.sub(self._unique, html)
+
+
+def mermaid_theme(dark_mode):
+    return "dark" if dark_mode else "default"
+
+
+MERMAID_DIV_PATTERN = re.compile(r'<div class="mermaid" data-src="([0-9a-f]{40})">[\s\S]*?</div>')
+
+# 미리보기에서 화면 밖 다이어그램을 몇 개까지 그려둔 채로 둘지 (넘으면 먼 것부터 자리표시자로 되돌림)
+MERMAID_LIVE_LIMIT = 24
+
+
+class MermaidSvgCache:
+    """렌더링된 Mermaid SVG 캐시 - (소스, 테마, Mermaid 버전) 해시를 키로 메모리 LRU + 디스크에 저장
+
+    미리보기, 뷰어, HTML 내보내기가 공유하며, 디스크 사용량이 한도를 넘으면 오래된 파일부터 지운다.
+    """
+    _shared = None
+
+    def __init__(self, directory=MERMAID_CACHE_DIR, max_entries=200, max_disk_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._disk_bytes = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def key(source_key, theme):
+        return hashlib.sha1(f"{MERMAID_VERSION}|{theme}|{source_key}".encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".svg")
+
+    def get(self, source_key, theme):
+        key = self.key(source_key, theme)
+        svg = self._memory.get(key)
+        if svg is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return svg
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                svg = f.read()
+            os.utime(path)  # 디스크 정리 시 최근 사용으로 취급
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, svg)
+        return svg
+
+    def put(self, source_key, theme, svg):
+        key = self.key(source_key, theme)
+        self._remember(key, svg)
+        path = self._path(key)
+        try:
+            old_size = os.path.getsize(path)  # 같은 키를 다시 쓰면 이전 크기는 빼야 한다
+        except OSError:
+            old_size = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(svg)
+            new_size = os.path.getsize(path)
+        except OSError:
+            return
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan_disk()[1]
+        else:
+            self._disk_bytes += new_size - old_size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _remember(self, key, svg):
+        self._memory[key] = svg
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _scan_disk(self):
+        entries = []
+        total = 0
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".svg"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            pass
+        return entries, total
+
+    def _evict_disk(self):
+        """오래 쓰지 않은 파일부터 한도의 80%까지 삭제"""
+        entries, total = self._scan_disk()
+        entries.sort()
+        target = self.max_disk_bytes * 0.8
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def inject(self, html, theme):
+        """캐시에 있는 다이어그램은 SVG로 바꿔 넣어 다시 레이아웃하지 않게 한다"""
+        if 'class="mermaid"' not in html:
+            return html
+
+        def substitute(m):
+            svg = self.get(m.group(1), theme)
+            if svg is None:
+                return m.group(0)
+            return f'<div class="mermaid-svg" data-src="{m.group(1)}">{svg}</div>'
+
+        return MERMAID_DIV_PATTERN.sub(substitute, html)
+
+
+class BlockRenderCache:
+    """블록 단위 HTML 캐시 - 내용 해시를 키로 하는 LRU
+
+    바뀐 블록만 다시 변환하므로 렌더링 비용이 문서 크기가 아니라 편집 크기에 비례한다.
+    """
+
+    def __init__(self, max_entries=20000, max_chars=16_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+
+    def split(self, text, scan=None):
+        """[(키, 시작 줄, 블록 텍스트), ...] - 이미 스캔한 결과가 있으면 scan으로 넘긴다"""
+        if scan is None:
+            scan = scan_markdown(text)
+        blocks = [(0, text)] if scan.doc_scope else scan.block_texts()
+        return [(hashlib.sha1(block.encode('utf-8')).hexdigest(), line, block) for line, block in blocks]
+
+    def get(self, key):
+        html = self._entries.get(key)
+        if html is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return html
+
+    def put(self, key, html):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._chars -= len(old)
+        self._entries[key] = html
+        self._chars += len(html)
+        while len(self._entries) > self.max_entries or (self._chars > self.max_chars and len(self._entries) > 1):
+            _, old = self._entries.popitem(last=False)
+            self._chars -= len(old)
+
+    def render(self, text):
+        """[(키, 시작 줄, HTML), ...] 반환"""
+        result = []
+        heading_ids = HeadingIds()
+        for key, line, block in self.split(text):
+            html = self.get(key)
+            if html is None:
+                html = render_markdown_block(block)
+                self.put(key, html)
+            result.append((key, line, heading_ids.fix(html)))
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self._chars = 0
+
+
+def preview_css(dark_mode):
+    """미리보기와 HTML 내보내기가 함께 쓰는 스타일"""
+    bg = "#1e1e1e" if dark_mode else "#ffffff"
+    fg = "#d4d4d4" if dark_mode else "#333333"
+    code_bg = "#2d2d2d" if dark_mode else "#f5f5f5"
+    return f'''
+{pygments_css("monokai" if dark_mode else "default")}
+body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
+       line-height: 1.7; padding: 25px; max-width: 850px; margin: 0 auto; 
+       background: {bg}; color: {fg}; }}
+h1,h2,h3,h4,h5,h6 {{ margin-top: 1.5em; margin-bottom: 0.5em; font-weight: 600; }}
+h1 {{ font-size: 2em; border-bottom: 2px solid {code_bg}; padding-bottom: 0.3em; }}
+h2 {{ font-size: 1.5em; border-bottom: 1px solid {code_bg}; padding-bottom: 0.3em; }}
+code {{ background: {code_bg}; padding: 0.2em 0.4em; border-radius: 3px; font-family: 'Consolas', monospace; font-size: 0.9em; }}
+pre {{ background: {code_bg}; padding: 16px; border-radius: 8px; overflow-x: auto; }}
+pre code {{ background: none; padding: 0; }}
+blockquote {{ border-left: 4px solid #007AFF; margin: 1em 0; padding: 0.5em 1em; background: {code_bg}; border-radius: 0 8px 8px 0; }}
+table {{ border-collapse: collapse; width: 100%; margin: 1em 0; }}
+th, td {{ border: 1px solid {"#444" if dark_mode else "#ddd"}; padding: 10px 14px; text-align: left; }}
+th {{ background: {code_bg}; font-weight: 600; }}
+tr:nth-child(even) {{ background: {code_bg}; }}
+img {{ max-width: 100%; border-radius: 8px; }}
+a {{ color: #007AFF; text-decoration: none; }}
+a:hover {{ text-decoration: underline; }}
+ul, ol {{ padding-left: 2em; }}
+li {{ margin: 0.3em 0; }}
+hr {{ border: none; border-top: 1px solid {code_bg}; margin: 2em 0; }}
+.mermaid, .mermaid-svg {{ background: transparent; text-align: center; margin: 1em 0; }}
+input[type="checkbox"] {{ margin-right: 8px; }}
+'''
+
+
+def markdown_to_html_document(text, dark_mode=False, cache=None):
+    """독립 실행형 HTML 문서 생성 (HTML 내보내기용)"""
+    blocks = (cache if cache is not None else BlockRenderCache()).render(text)
+    theme = mermaid_theme(dark_mode)
+    svg_cache = MermaidSvgCache.shared()
+    body = '\n'.join(svg_cache.inject(html, theme) for _, _, html in blocks)
+    return f'''<!DOCTYPE html>
+<html><head><meta charset="UTF-8">
+<script src="{MERMAID_CDN_URL}"></script>
+<style>
+{preview_css(dark_mode)}</style></head><body>
+{body}
+<script>mermaid.initialize({{ startOnLoad: true, theme: '{theme}' }});</script>
+</body></html>'''
+
+
+class RenderServer(QObject):
+    """Markdown 변환 전용 프로세스
+
+    Python-Markdown/Pygments 변환이 UI 스레드에서 GIL을 잡고 있지 않도록 별도 프로세스에서 실행한다.
+    작업마다 세대 번호를 붙이고, 결과는 rendered 시그널로 UI 스레드에 전달된다.
+    """
+    rendered = pyqtSignal(int, list, bool)  # 세대, [(키, HTML)], 완료 여부
+    failed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Qt 스레드가 있는 프로세스를 fork하지 않도록 항상 spawn 사용
+        ctx = multiprocessing.get_context('spawn')
+        job_recv, self._jobs = ctx.Pipe(duplex=False)
+        self._results, result_send = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(
+            target=render_server_main, args=(job_recv, result_send), daemon=True)
+        start_without_main(self._process)
+        job_recv.close()
+        result_send.close()
+        self._reader = threading.Thread(target=self._read_results, daemon=True)
+        self._reader.start()
+
+    def submit(self, generation, blocks):
+        try:
+            self._jobs.send((generation, blocks))
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _read_results(self):
+        while True:
+            try:
+                generation, rendered, complete = self._results.recv()
+            except (EOFError, OSError):
+                break
+            self.rendered.emit(generation, rendered, complete)
+        self.failed.emit()
+
+    def shutdown(self):
+        try:
+            self._jobs.send(None)
+        except (OSError, ValueError):
+            pass
+        self._process.join(1)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+class RenderScheduler(QObject):
+    """미리보기 렌더 스케줄러
+
+    재시작 가능한 타이머 하나로 연속 요청을 합치고, 렌더는 한 번에 하나만 실행한다.
+    대기 시간은 측정된 렌더 시간(지수 이동 평균)에 맞춰 늘고 줄어든다.
+    render 콜백이 참을 반환하면 비동기로 진행 중이라는 뜻이며, 끝나면 finished()를 호출해야 한다.
+    """
+
+    def __init__(self, render, parent=None, min_delay=50, max_delay=1500):
+        super().__init__(parent)
+        self._render = render
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min_delay
+        self.avg_render_ms = 0.0
+        self.last_render_ms = 0.0
+        self.requested = 0
+        self.coalesced = 0
+        self.executed = 0
+        self._in_flight = False
+        self._pending = False
+        self._started = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+    def request(self):
+        self.requested += 1
+        if self._timer.isActive() or self._pending:
+            self.coalesced += 1
+        if self._in_flight:
+            self._pending = True
+            return
+        self._timer.start(self.delay)
+
+    def _fire(self):
+        if self._in_flight:
+            self._pending = True
+            return
+        self._in_flight = True
+        self._started = time.perf_counter()
+        self.executed += 1
+        if not self._render():
+            self.finished()
+
+    def finished(self):
+        """렌더 완료 - 소요 시간을 반영해 다음 대기 시간을 조정"""
+        if not self._in_flight:
+            return
+        self._in_flight = False
+        self.last_render_ms = (time.perf_counter() - self._started) * 1000
+        if self.executed == 1:
+            self.avg_render_ms = self.last_render_ms
+        else:
+            self.avg_render_ms = 0.7 * self.avg_render_ms + 0.3 * self.last_render_ms
+        self.delay = int(min(self.max_delay, max(self.min_delay, 3 * self.avg_render_ms)))
+        if self._pending:
+            self._pending = False
+            self._timer.start(self.delay)
+
+    def stats(self):
+        return {
+            'requested': self.requested,
+            'coalesced': self.coalesced,
+            'executed': self.executed,
+            'last_render_ms': self.last_render_ms,
+            'avg_render_ms': self.avg_render_ms,
+            'delay': self.delay,
+        }
+
+
+# ============== 다이얼로그 ==============
+
+class TableDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("테이블 삽입")
+        self.setMinimumWidth(300)
+        layout = QVBoxLayout(self)
+        
+        grid = QGridLayout()
+        grid.addWidget(QLabel("행:"), 0, 0)
+        self.rows = QSpinBox()
+        self.rows.setRange(1, 20)
+        self.rows.setValue(3)
+        grid.addWidget(self.rows, 0, 1)
+        
+        grid.addWidget(QLabel("열:"), 1, 0)
+        self.cols = QSpinBox()
+        self.cols.setRange(1, 10)
+        self.cols.setValue(3)
+        grid.addWidget(self.cols, 1, 1)
+        layout.addLayout(grid)
+        
+        self.header_check = QCheckBox("헤더 포함")
+        self.header_check.setChecked(True)
+        layout.addWidget(self.header_check)
+        
+        self.align_combo = QComboBox()
+        self.align_combo.addItems(["왼쪽 정렬", "가운데 정렬", "오른쪽 정렬"])
+        layout.addWidget(self.align_combo)
+        
+        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+    
+    def get_markdown(self):
+        r, c = self.rows.value(), self.cols.value()
+        align = self.align_combo.currentIndex()
+        
+        if align == 0:
+            sep = ":------"
+        elif align == 1:
+            sep = ":------:"
+        else:
+            sep = "------:"
+        
+        lines = []
+        if self.header_check.isChecked():
+            lines.append("| " + " | ".join([f"헤더{i+1}" for i in range(c)]) + " |")
+            lines.append("| " + " | ".join([sep for _ in range(c)]) + " |")
+            r -= 1
+        for _ in range(r):
+            lines.append("| " + " | ".join(["     " for _ in range(c)]) + " |")
+        return "\n".join(lines)
+
+
+class LinkDialog(QDialog):
+    def __init__(self, parent=None, selected=""):
+        super().__init__(parent)
+        self.setWindowTitle("링크 삽입")
+        self.setMinimumWidth(400)
+        layout = QVBoxLayout(self)
+        
+        layout.addWidget(QLabel("표시 텍스트:"))
+        self.text_edit = QLineEdit(selected)
+        layout.addWidget(self.text_edit)
+        
+        layout.addWidget(QLabel("URL:"))
+        self.url_edit = QLineEdit()
+        self.url_edit.setPlaceholderText("https://")
+        layout.addWidget(self.url_edit)
+        
+        layout.addWidget(QLabel("제목 (선택):"))
+        self.title_edit = QLineEdit()
+        self.title_edit.setPlaceholderText("마우스 오버시 표시")
+        layout.addWidget(self.title_edit)
+        
+        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+    
+    def get_markdown(self):
+        text = self.text_edit.text() or "링크"
+        url = self.url_edit.text() or "#"
+        title = self.title_edit.text()
+        if title:
+            return f'[{text}]({url} "{title}")'
+        return f"[{text}]({url})"
+
+
+class ImageDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("이미지 삽입")
+        self.setMinimumWidth(400)
+        layout = QVBoxLayout(self)
+        
+        layout.addWidget(QLabel("대체 텍스트:"))
+        self.alt = QLineEdit()
+        layout.addWidget(self.alt)
+        
+        layout.addWidget(QLabel("경로/URL:"))
+        url_layout = QHBoxLayout()
+        self.url = QLineEdit()
+        url_layout.addWidget(self.url)
+        browse = QPushButton("찾기")
+        browse.clicked.connect(self.browse)
+        url_layout.addWidget(browse)
+        layout.addLayout(url_layout)
+        
+        layout.addWidget(QLabel("크기 (선택):"))
+        size_layout = QHBoxLayout()
+        self.width = QSpinBox()
+        self.width.setRange(0, 2000)
+        self.width.setSpecialValueText("자동")
+        size_layout.addWidget(QLabel("너비:"))
+        size_layout.addWidget(self.width)
+        self.height = QSpinBox()
+        self.height.setRange(0, 2000)
+        self.height.setSpecialValueText("자동")
+        size_layout.addWidget(QLabel("높이:"))
+        size_layout.addWidget(self.height)
+        layout.addLayout(size_layout)
+        
+        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+    
+    def browse(self):
+        path, _ = QFileDialog.getOpenFileName(self, "이미지 선택", "", "이미지 (*.png *.jpg *.jpeg *.gif *.svg *.webp)")
+        if path:
+            self.url.setText(path)
+    
+    def get_markdown(self):
+        alt = self.alt.text() or "이미지"
+        url = self.url.text() or "image.png"
+        md = f"![{alt}]({url})"
+        
+        # HTML 크기 지정
+        w, h = self.width.value(), self.height.value()
+        if w > 0 or h > 0:
+            style = []
+            if w > 0:
+                style.append(f"width: {w}px")
+            if h > 0:
+                style.append(f"height: {h}px")
+            md = f'<img src="{url}" alt="{alt}" style="{"; ".join(style)}">'
+        return md
+
+
+class EmojiIndex:
+    """이모지 카탈로그와 검색 색인 - 처음 한 번 만들어 디스크에 저장하고, 이후에는 읽기만 한다
+
+    검색은 항목마다 '이모지 이름 분류' 한 줄씩 이어 붙인 문자열에서 str.find로 찾고,
+    찾은 위치를 줄 시작 오프셋에 이분 탐색해서 항목 번호로 바꾼다.
+    """
+    VERSION = 1
+    _shared = None
+
+    def __init__(self, entries):
+        self.entries = entries  # [(이모지, 이름, 분류), ...]
+        self.by_category = {}
+        self.offsets = []
+        lines = []
+        pos = 0
+        for row, (emoji, name, category) in enumerate(entries):
+            self.by_category.setdefault(category, []).append(row)
+            line = f"{emoji} {name.lower()} {category}\n"
+            self.offsets.append(pos)
+            lines.append(line)
+            pos += len(line)
+        self.haystack = ''.join(lines)
+        self.categories = list(self.by_category)
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls.load()
+        return cls._shared
+
+    @classmethod
+    def load(cls, path=EMOJI_INDEX_FILE):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == cls.VERSION and data.get('unicode') == unicodedata.unidata_version:
+                return cls([tuple(entry) for entry in data['entries']])
+        except:
+            pass
+        
+        index = cls(cls.build_catalog())
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'version': cls.VERSION, 'unicode': unicodedata.unidata_version,
+                           'entries': index.entries}, f, ensure_ascii=False)
+        except:
+            pass
+        return index
+
+    @staticmethod
+    def build_catalog():
+        """EMOJI_LIST(자주 쓰는 항목) + EMOJI_RANGES의 그림 기호 전체"""
+        entries = []
+        seen = set()
+        for category, emojis in EMOJI_LIST.items():
+            for emoji in emojis:
+                entries.append((emoji, emoji_display_name(emoji), category))
+                seen.add(emoji.rstrip('\ufe0f'))
+        for category, first, last in EMOJI_RANGES:
+            for code in range(first, last + 1):
+                ch = chr(code)
+                name = unicodedata.name(ch, '')
+                if ch in seen or not name or unicodedata.category(ch) != 'So':
+                    continue
+                seen.add(ch)
+                # BMP 기호는 기본이 글자 모양이므로 이모지 모양 선택자를 붙인다
+                entries.append((ch + '\ufe0f' if code < 0x10000 else ch, name.title(), category))
+        return entries
+
+    def search(self, query, category=None):
+        """조건에 맞는 항목 번호 목록 (카탈로그 순서)"""
+        query = query.strip().lower()
+        if not query:
+            return list(self.by_category.get(category, [])) if category else list(range(len(self.entries)))
+        
+        rows = []
+        haystack, offsets = self.haystack, self.offsets
+        count = len(offsets)
+        pos = haystack.find(query)
+        while pos >= 0:
+            row = bisect_right(offsets, pos) - 1
+            if category is None or self.entries[row][2] == category:
+                rows.append(row)
+            if row + 1 >= count:
+                break
+            pos = haystack.find(query, offsets[row + 1])
+        return rows
+
+
+class EmojiModel(QAbstractListModel):
+    """EmojiIndex 검색 결과를 보여주는 목록 모델 - 뷰가 보이는 칸만 그린다"""
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.rows = list(range(len(catalog.entries)))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        emoji, name, category = self.catalog.entries[self.rows[index.row()]]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole):
+            return emoji
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{emoji} {name or category}"
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+
+class EmojiDialog(QDialog):
+    emoji_selected = pyqtSignal(str)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("이모지")
+        self.setMinimumSize(460, 400)
+        layout = QVBoxLayout(self)
+        
+        self.catalog = EmojiIndex.shared()
+        
+        # 검색
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("검색... (영문 이름 또는 분류, Enter로 첫 항목 선택)")
+        self.search.textChanged.connect(self.filter_emoji)
+        self.search.returnPressed.connect(self.select_first)
+        layout.addWidget(self.search)
+        
+        self.tabs = QTabBar()
+        self.tabs.setUsesScrollButtons(True)
+        self.tabs.addTab("전체")
+        for category in self.catalog.categories:
+            self.tabs.addTab(category)
+        self.tabs.currentChanged.connect(self.filter_emoji)
+        layout.addWidget(self.tabs)
+        
+        self.model = EmojiModel(self.catalog, self)
+        self.view = QListView()
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setMovement(QListView.Movement.Static)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setUniformItemSizes(True)
+        self.view.setGridSize(QSize(52, 52))
+        self.view.setFont(QFont("", 24))
+        self.view.setModel(self.model)
+        self.view.clicked.connect(lambda index: self.select(index.data(Qt.ItemDataRole.UserRole)))
+        self.view.activated.connect(lambda index: self.select(index.data(Qt.ItemDataRole.UserRole)))
+        layout.addWidget(self.view)
+        
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        self.filter_emoji()
+
+    def filter_emoji(self, *_):
+        tab = self.tabs.currentIndex()
+        category = self.tabs.tabText(tab) if tab > 0 else None
+        self.model.set_rows(self.catalog.search(self.search.text(), category))
+        self.count_label.setText(f"{self.model.rowCount()}개")
+    
+    def select_first(self):
+        if self.model.rowCount():
+            self.select(self.model.index(0).data(Qt.ItemDataRole.UserRole))
+    
+    def select(self, emoji):
+        self.emoji_selected.emit(emoji)
+        self.accept()
+
+
+class SnippetDialog(QDialog):
+    def __init__(self, snippets, parent=None):
+        super().__init__(parent)
         self.snippets = snippets
         self.setWindowTitle("스니펫 관리")
         self.setMinimumSize(500, 400)
@@ -1218,9 +3683,15 @@ class SnippetDialog(QDialog):
 
 
 class FindReplaceDialog(QDialog):
-    def __init__(self, editor, parent=None):
+    MATCH_COLOR = QColor(255, 213, 0, 90)
+    CURRENT_COLOR = QColor(255, 140, 0, 170)
+    SELECTION_PROPERTY = QTextFormat.Property.UserProperty.value + 1  # 이 대화상자가 만든 ExtraSelection 표시
+    FAILURE_LABELS = {'unavailable': "실행 불가", 'timeout': "너무 느림", 'error': "오류"}  # 색인 실패 이유 -> 개수 표시
+    
+    def __init__(self, editor, doc_model, parent=None):
         super().__init__(parent)
         self.editor = editor
+        self.doc_model = doc_model
         self.setWindowTitle("찾기/바꾸기")
         self.setMinimumWidth(450)
         layout = QVBoxLayout(self)
@@ -1231,6 +3702,9 @@ class FindReplaceDialog(QDialog):
         self.find_edit = QLineEdit()
         self.find_edit.returnPressed.connect(self.find_next)
         find_layout.addWidget(self.find_edit)
+        self.count_label = QLabel("")
+        self.count_label.setMinimumWidth(110)
+        find_layout.addWidget(self.count_label)
         layout.addLayout(find_layout)
         
         # 바꾸기
@@ -1250,6 +3724,31 @@ class FindReplaceDialog(QDialog):
         opt_layout.addWidget(self.regex_check)
         layout.addLayout(opt_layout)
         
+        # 모든 결과 색인 - 검색어/옵션이 바뀌면 잠시 후 다시 만든다
+        # 정규식은 시간 예산이 있는 별도 프로세스에서 찾는다
+        self.regex_worker = RegexWorker(parent=self)
+        self.regex_worker.finished.connect(self.on_replace_scanned)
+        self.regex_worker.timed_out.connect(lambda job_id: self.on_replace_failed(job_id, 'timeout'))
+        self.regex_worker.unavailable.connect(lambda job_id: self.on_replace_failed(job_id, 'unavailable'))
+        self.regex_worker.job_error.connect(lambda job_id, message: self.on_replace_failed(job_id, 'error', message))
+        self.index = SearchMatchIndex(doc_model, self.regex_worker, self)
+        self.index.updated.connect(self.on_index_updated)
+        self._pending_find = None  # 색인이 준비되면 실행할 찾기 방향
+        self._replace_job = None   # 모두 바꾸기 정규식 탐색 작업 번호
+        # 탐색 중에 문서가 바뀌면 (실행 취소, 파일 열기 등은 읽기 전용을 무시한다) 결과 위치가 어긋나므로 버린다
+        doc_model.changed.connect(self.on_document_changed)
+        self.rebuild_timer = QTimer(self)
+        self.rebuild_timer.setSingleShot(True)
+        self.rebuild_timer.setInterval(150)
+        self.rebuild_timer.timeout.connect(self.rebuild_index)
+        self.find_edit.textChanged.connect(self.rebuild_timer.start)
+        for check in (self.case_check, self.whole_check, self.regex_check):
+            check.toggled.connect(self.rebuild_timer.start)
+        
+        # 보이는 범위의 결과만 칠한다
+        self.editor.verticalScrollBar().valueChanged.connect(self.highlight_visible)
+        self.editor.cursorPositionChanged.connect(self.on_cursor_moved)
+        
         # 버튼
         btn_layout = QHBoxLayout()
         
@@ -1281,58 +3780,474 @@ class FindReplaceDialog(QDialog):
     def find_prev(self):
         self._find(backward=True)
     
-    def _find(self, backward=False):
+    def current_pattern(self):
+        """옵션을 반영한 패턴 - 검색어가 없으면 None, 정규식 오류면 결과 표시줄에 알린다"""
         text = self.find_edit.text()
         if not text:
+            return None
+        try:
+            return compile_search_pattern(text, self.case_check.isChecked(),
+                                          self.whole_check.isChecked(), self.regex_check.isChecked())
+        except re.error as e:
+            self.result_label.setText(f"정규식 오류: {e}")
+            return None
+    
+    def rebuild_index(self):
+        self.rebuild_timer.stop()
+        if self._replace_job is not None:
+            self.rebuild_timer.start()  # 모두 바꾸기가 끝난 뒤에
+            return
+        pattern = self.current_pattern()
+        if pattern is None or (self.index.pattern is not None and pattern == self.index.pattern):
+            if pattern is None:
+                self.index.set_pattern(None)
+            return
+        self.count_label.setText("찾는 중...")
+        self.index.set_pattern(pattern, isolated=self.regex_check.isChecked())
+    
+    def _find(self, backward=False):
+        if self.rebuild_timer.isActive():
+            self.rebuild_index()
+        if self.index.pattern is None:
+            return
+        if not self.index.ready:
+            self._pending_find = backward  # 색인이 완성되면 이어서 이동
             return
         
-        flags = QTextDocument.FindFlag(0)
-        if self.case_check.isChecked():
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        if self.whole_check.isChecked():
-            flags |= QTextDocument.FindFlag.FindWholeWords
-        if backward:
-            flags |= QTextDocument.FindFlag.FindBackward
-        
-        found = self.editor.find(text, flags)
-        if not found:
-            cursor = self.editor.textCursor()
-            if backward:
-                cursor.movePosition(QTextCursor.MoveOperation.End)
-            else:
-                cursor.movePosition(QTextCursor.MoveOperation.Start)
-            self.editor.setTextCursor(cursor)
-            found = self.editor.find(text, flags)
+        cursor = self.editor.textCursor()
+        position = cursor.selectionStart() if backward else cursor.selectionEnd()
+        block = self.editor.document().findBlock(position)
+        found = self.index.next_match(block.blockNumber(), position - block.position(), backward)
+        if found is None:
+            self.result_label.setText("결과 없음")
+            self.update_counter()
+            return
         
-        self.result_label.setText("찾음" if found else "결과 없음")
+        line, start, end = found
+        block = self.editor.document().findBlockByNumber(line)
+        cursor.setPosition(block.position() + start)
+        cursor.setPosition(block.position() + end, QTextCursor.MoveMode.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.result_label.setText("찾음")
+        self.update_counter()
+        self.highlight_visible()
+    
+    def failure_message(self, reason, message=""):
+        if reason == 'error':
+            return f"정규식 실행 오류 - {message}"
+        if reason == 'unavailable':
+            return "정규식 실행 불가 - 검사 프로세스를 띄우지 못했습니다 (잠시 뒤 다시 시도합니다)"
+        return "정규식이 너무 느려 시간 제한에서 멈췄습니다 - 패턴을 고쳐 주세요"
+    
+    def on_index_updated(self):
+        if self.index.failed:
+            self._pending_find = None
+            self.result_label.setText(self.failure_message(self.index.failed, self.index.error))
+        if self._pending_find is not None and self.index.ready:
+            backward, self._pending_find = self._pending_find, None
+            self._find(backward)
+            return
+        self.update_counter()
+        self.highlight_visible()
+    
+    def current_match(self):
+        """선택 영역이 결과 하나와 정확히 겹치면 (줄, 시작 열), 아니면 None"""
+        cursor = self.editor.textCursor()
+        if not cursor.hasSelection():
+            return None
+        block = self.editor.document().findBlock(cursor.selectionStart())
+        start = cursor.selectionStart() - block.position()
+        end = cursor.selectionEnd() - block.position()
+        line = block.blockNumber()
+        if 0 <= line < len(self.index.lines) and any(m == (start, end) for m in self.index.lines[line]):
+            return line, start
+        return None
+    
+    def on_cursor_moved(self):
+        if self.isVisible() and self.index.ready:
+            self.update_counter()
+    
+    def update_counter(self):
+        if self.index.pattern is None:
+            self.count_label.setText("")
+        elif self.index.failed:
+            self.count_label.setText(self.FAILURE_LABELS[self.index.failed])
+        elif not self.index.ready:
+            self.count_label.setText("찾는 중...")
+        elif not self.index.total:
+            self.count_label.setText("결과 없음")
+        else:
+            current = self.current_match()
+            n = self.index.ordinal(*current) if current else 0
+            self.count_label.setText(f"{n} / {self.index.total}" if n else f"{self.index.total}개")
+    
+    def highlight_visible(self, *_):
+        """화면에 보이는 줄의 결과만 ExtraSelection으로 표시 (문서 크기와 무관)"""
+        if not self.isVisible() or not self.index.ready:
+            self.set_match_selections([])
+            return
+        first = self.editor.firstVisibleBlock().blockNumber()
+        last = self.editor.cursorForPosition(QPoint(0, self.editor.viewport().height())).blockNumber()
+        doc = self.editor.document()
+        current = self.current_match()
+        selections = []
+        block = doc.findBlockByNumber(first)
+        for line, start, end in self.index.matches_in(first, last):
+            if block.blockNumber() != line:
+                block = doc.findBlockByNumber(line)
+            sel = QTextEdit.ExtraSelection()
+            sel.cursor = QTextCursor(block)
+            sel.cursor.setPosition(block.position() + start)
+            sel.cursor.setPosition(block.position() + end, QTextCursor.MoveMode.KeepAnchor)
+            sel.format.setBackground(self.CURRENT_COLOR if current == (line, start) else self.MATCH_COLOR)
+            sel.format.setProperty(self.SELECTION_PROPERTY, True)
+            selections.append(sel)
+        self.set_match_selections(selections)
+    
+    def set_match_selections(self, selections):
+        """찾기 결과 표시만 바꾼다 - 다른 기능이 넣은 ExtraSelection은 그대로 둔다"""
+        others = [sel for sel in self.editor.extraSelections() if not sel.format.hasProperty(self.SELECTION_PROPERTY)]
+        self.editor.setExtraSelections(others + selections)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.find_edit.setFocus()
+        self.find_edit.selectAll()
+        self.rebuild_index()
+        self.highlight_visible()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.rebuild_timer.stop()
+        self.index.set_pattern(None)
+        self.set_match_selections([])
+        if self._replace_job is not None:
+            self.regex_worker.cancel(self._replace_job)
+            self._replace_job = None
+            self.editor.setReadOnly(False)
     
     def replace_one(self):
         cursor = self.editor.textCursor()
-        if cursor.hasSelection():
-            cursor.insertText(self.replace_edit.text())
+        if cursor.hasSelection() and not self.editor.isReadOnly():
+            replacement = self.replace_edit.text()
+            pattern = self.current_pattern()
+            if pattern is not None and self.regex_check.isChecked():
+                error = template_error(pattern, replacement)
+                if error:
+                    self.result_label.setText(f"바꿀 문자열 오류 - {error}")
+                    return
+                # selectedText는 줄바꿈을 U+2029로 돌려준다 (줄을 넘어가는 결과)
+                match = pattern.fullmatch(cursor.selectedText().replace('\u2029', '\n'))
+                if match:
+                    replacement = match.expand(replacement)
+            cursor.insertText(replacement)
         self.find_next()
     
     def replace_all(self):
-        text = self.find_edit.text()
-        if not text:
+        """찾은 구간만 뒤에서부터 바꾼다 - 실행 취소 한 번으로 되돌릴 수 있고 커서/스크롤도 유지"""
+        if self._replace_job is not None or self.editor.isReadOnly():
+            return
+        pattern = self.current_pattern()
+        if pattern is None:
             return
         
-        content = self.editor.toPlainText()
+        text = '\n'.join(self.doc_model.lines())
+        replacement = self.replace_edit.text()
+        regex = self.regex_check.isChecked()
+        if regex:
+            if self.index.failed == 'timeout' and pattern == self.index.pattern:
+                self.result_label.setText(self.failure_message('timeout'))
+                return
+            error = template_error(pattern, replacement)
+            if error:
+                self.result_label.setText(f"바꿀 문자열 오류 - {error}")
+                return
+        elif not self.regex_worker.available:
+            # 일반 텍스트는 폭주할 일이 없으니, 프로세스를 못 띄우는 동안에는 여기서 찾는다
+            self.start_replace(replacement_edits(pattern, text, replacement))
+            return
+        # 탐색은 worker 프로세스에서 - 색인 작업은 멈추고, 끝날 때까지 문서를 잠가 두어 결과 위치가 어긋나지 않게 한다
+        self.rebuild_timer.stop()
+        self.index.set_pattern(None)
+        self.editor.setReadOnly(True)
+        self.result_label.setText("찾는 중...")
+        self._replace_job = self.regex_worker.submit('edits', pattern, text, replacement, regex)
+    
+    def on_replace_scanned(self, job_id, edits):
+        if job_id != self._replace_job:
+            return
+        self._replace_job = None
+        self.editor.setReadOnly(False)
+        self.start_replace(edits)
+    
+    def on_replace_failed(self, job_id, reason, message=""):
+        if job_id != self._replace_job:
+            return
+        self._replace_job = None
+        self.editor.setReadOnly(False)
+        if reason == 'unavailable' and not self.regex_check.isChecked():
+            pattern = self.current_pattern()
+            if pattern is not None:
+                self.start_replace(replacement_edits(pattern, '\n'.join(self.doc_model.lines()), self.replace_edit.text()))
+                return
+        self.result_label.setText(self.failure_message(reason, message))
+        self.count_label.setText(self.FAILURE_LABELS[reason])
+    
+    def on_document_changed(self, first, removed, added):
+        if self._replace_job is None:
+            return
+        self.regex_worker.cancel(self._replace_job)
+        self._replace_job = None
+        self.editor.setReadOnly(False)
+        self.result_label.setText("찾는 동안 문서가 바뀌어 모두 바꾸기를 취소했습니다")
+        self.rebuild_index()
+    
+    def start_replace(self, edits):
+        if not edits:
+            self.result_label.setText("0개 바꿈")
+            self.rebuild_index()
+            return
         
-        if self.regex_check.isChecked():
-            flags = 0 if self.case_check.isChecked() else re.IGNORECASE
-            new_content, count = re.subn(text, self.replace_edit.text(), content, flags=flags)
-        else:
-            if self.case_check.isChecked():
-                count = content.count(text)
-                new_content = content.replace(text, self.replace_edit.text())
-            else:
-                pattern = re.compile(re.escape(text), re.IGNORECASE)
-                count = len(pattern.findall(content))
-                new_content = pattern.sub(self.replace_edit.text(), content)
+        # 한 편집 블록에서 결과마다 뒤에서부터 바꾼다 - 중간에 다른 편집이 끼어들 틈이 없고 실행 취소도 한 단계,
+        # 결과 사이의 줄은 건드리지 않아 강조 상태와 레이아웃이 남는다
+        # (조각으로 나눠 이벤트 루프에 돌려주면 조각마다 강조기/색인이 다시 돌아 오히려 느리다)
+        self.rebuild_timer.stop()
+        self.index.set_pattern(None)
+        cursor = QTextCursor(self.editor.document())
+        cursor.beginEditBlock()
+        for start, end, replacement in reversed(edits):
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(replacement)
+        cursor.endEditBlock()
+        self.result_label.setText(f"{len(edits)}개 바꿈")
+        self.rebuild_index()
+
+
+class WorkspaceSearchDialog(QDialog):
+    """폴더에서 찾기 - WorkspaceIndex로 찾고, 결과 줄을 고르면 그 파일의 해당 줄을 연다"""
+    open_requested = pyqtSignal(str, int)  # 절대 경로, 줄 번호 (0부터)
+    folder_requested = pyqtSignal()
+    _snippets_read = pyqtSignal(int, dict)  # 작업 스레드 -> UI 스레드 (검색 세대, {(상대 경로, 줄 번호): 줄 내용})
+    
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = None
+        self._generation = 0  # 결과 줄 내용을 읽는 중인 검색
+        self._snippets_read.connect(self.on_snippets_read)
+        self.setWindowTitle("폴더에서 찾기")
+        self.resize(640, 480)
+        layout = QVBoxLayout(self)
+        
+        folder_layout = QHBoxLayout()
+        self.folder_label = QLabel("")
+        folder_layout.addWidget(self.folder_label, 1)
+        folder_btn = QPushButton("폴더 변경...")
+        folder_btn.clicked.connect(self.folder_requested.emit)
+        folder_layout.addWidget(folder_btn)
+        layout.addLayout(folder_layout)
+        
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText('여러 단어는 모두 포함하는 파일, "따옴표"로 묶으면 구절 검색')
+        self.query_edit.returnPressed.connect(self.open_current)
+        layout.addWidget(self.query_edit)
+        
+        self.result_list = QListWidget()
+        self.result_list.itemActivated.connect(self.open_item)
+        layout.addWidget(self.result_list)
+        
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self.search_timer.start)
+        self.set_index(index)
+    
+    def set_index(self, index):
+        if self.index is not None:
+            self.index.updated.disconnect(self.on_index_updated)
+            self.index.failed.disconnect(self.on_index_updated)
+            self.index.progress.disconnect(self.on_progress)
+        self.index = index
+        index.updated.connect(self.on_index_updated)
+        index.failed.connect(self.on_index_updated)
+        index.progress.connect(self.on_progress)
+        self.folder_label.setText(index.root)
+        self.folder_label.setToolTip(index.root)
+        self.run_search()
+    
+    def run_search(self):
+        self.search_timer.stop()
+        self.result_list.clear()
+        self._generation += 1
+        query = self.query_edit.text()
+        if not self.index.ready:
+            self.status_label.setText("색인을 읽는 중...")
+            return
+        if not parse_search_query(query):
+            self.status_label.setText(self.with_error(f"{self.index.file_count()}개 파일 색인됨"))
+            return
+        
+        start = time.perf_counter()
+        results, file_count = self.index.search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        wanted = {}  # 상대 경로 -> 결과 줄 번호 (줄 내용은 작업 스레드에서 읽어 채운다)
+        for rel, line, count in results:
+            wanted.setdefault(rel, set()).add(line)
+            item = QListWidgetItem(self.result_text(rel, line, count))
+            item.setData(Qt.ItemDataRole.UserRole, (rel, line, count))
+            item.setToolTip(os.path.join(self.index.root, rel))
+            self.result_list.addItem(item)
+        if results:
+            self.result_list.setCurrentRow(0)
+            threading.Thread(target=self._read_snippets, args=(self._generation, self.index.root, wanted),
+                             daemon=True).start()
+        message = f"{file_count}개 파일, {len(results)}줄 ({elapsed:.1f} ms)"
+        if len(results) >= SEARCH_RESULT_LIMIT:
+            message += f" - 처음 {SEARCH_RESULT_LIMIT}줄만 표시"
+        self.status_label.setText(self.with_error(message))
+    
+    def with_error(self, message):
+        """색인 작업이 실패했으면 상태 표시에 덧붙인다 - 결과가 빠졌을 수 있음을 알리기 위해"""
+        if self.index.error:
+            return f"{message} - 색인 오류: {self.index.error}"
+        return message
+    
+    def result_text(self, rel, line, count, snippet=""):
+        label = f"{rel}:{line + 1}"
+        if snippet:
+            label += f"  {snippet[:200]}"
+        if count > 1:
+            label += f"  ({count})"
+        return label
+    
+    def _read_snippets(self, generation, root, wanted):
+        snippets = {}
+        for rel, numbers in wanted.items():
+            if generation != self._generation:
+                return  # 새 검색이 시작됨
+            try:
+                with open(os.path.join(root, rel), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            lines = decode_text(data, detect_encoding(data)).split('\n')
+            for line in numbers:
+                if line < len(lines):
+                    snippets[rel, line] = lines[line].strip()
+        self._snippets_read.emit(generation, snippets)
+    
+    def on_snippets_read(self, generation, snippets):
+        if generation != self._generation:
+            return
+        for row in range(self.result_list.count()):
+            item = self.result_list.item(row)
+            rel, line, count = item.data(Qt.ItemDataRole.UserRole)
+            snippet = snippets.get((rel, line))
+            if snippet:
+                item.setText(self.result_text(rel, line, count, snippet))
+    
+    def on_index_updated(self):
+        if self.isVisible():
+            self.run_search()
+    
+    def on_progress(self, done, total):
+        if done < total:
+            self.status_label.setText(f"색인하는 중... {done} / {total}")
+    
+    def open_current(self):
+        item = self.result_list.currentItem()
+        if item is not None:
+            self.open_item(item)
+    
+    def open_item(self, item):
+        rel, line, _ = item.data(Qt.ItemDataRole.UserRole)
+        self.open_requested.emit(os.path.join(self.index.root, rel), line)
+    
+    def keyPressEvent(self, event):
+        # 검색창에서 위/아래로 결과 이동
+        if event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down) and self.result_list.count():
+            row = self.result_list.currentRow() + (1 if event.key() == Qt.Key.Key_Down else -1)
+            self.result_list.setCurrentRow(max(0, min(row, self.result_list.count() - 1)))
+            return
+        super().keyPressEvent(event)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+        self.index.refresh()  # 편집기 밖에서 바뀐 파일 반영
+
+
+class QuickOpenDialog(QDialog):
+    """빠른 열기 (Ctrl+P) - 입력할 때마다 QuickOpenIndex로 바로 찾는다"""
+    open_requested = pyqtSignal(str)
+    
+    def __init__(self, index, recent_files, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.recent_files = recent_files  # 편집기의 최근 파일 목록 (같은 리스트를 공유)
+        self.setWindowTitle("빠른 열기")
+        self.resize(560, 400)
+        layout = QVBoxLayout(self)
         
-        self.editor.setPlainText(new_content)
-        self.result_label.setText(f"{count}개 바꿈")
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("파일 이름, 경로 또는 첫 제목")
+        self.query_edit.textChanged.connect(self.run_search)
+        self.query_edit.returnPressed.connect(self.open_current)
+        layout.addWidget(self.query_edit)
+        
+        self.result_list = QListWidget()
+        self.result_list.itemActivated.connect(self.open_item)
+        layout.addWidget(self.result_list)
+        
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        index.updated.connect(self.on_index_updated)
+    
+    def run_search(self):
+        self.result_list.clear()
+        start = time.perf_counter()
+        results = self.index.search(self.query_edit.text(), self.recent_files)
+        elapsed = (time.perf_counter() - start) * 1000
+        for path, shown, title in results:
+            item = QListWidgetItem(f"{title}  —  {shown}" if title else shown)
+            item.setData(Qt.ItemDataRole.UserRole, path)
+            item.setToolTip(path)
+            self.result_list.addItem(item)
+        if results:
+            self.result_list.setCurrentRow(0)
+        self.status_label.setText(f"{len(self.index.keys)}개 파일 중 {len(results)}개 ({elapsed:.1f} ms)")
+    
+    def on_index_updated(self):
+        if self.isVisible():
+            self.run_search()
+    
+    def open_current(self):
+        item = self.result_list.currentItem()
+        if item is not None:
+            self.open_item(item)
+    
+    def open_item(self, item):
+        self.hide()
+        self.open_requested.emit(item.data(Qt.ItemDataRole.UserRole))
+    
+    def keyPressEvent(self, event):
+        # 검색창에서 위/아래로 결과 이동
+        if event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down) and self.result_list.count():
+            row = self.result_list.currentRow() + (1 if event.key() == Qt.Key.Key_Down else -1)
+            self.result_list.setCurrentRow(max(0, min(row, self.result_list.count() - 1)))
+            return
+        super().keyPressEvent(event)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+        self.run_search()
 
 
 class StatsDialog(QDialog):
@@ -1399,6 +4314,7 @@ class MermaidViewer(QMainWindow):
         self.bridge = WebBridge()
         self.bridge.svg_ready.connect(self.save_svg_data)
         self.bridge.png_ready.connect(self.save_png_data)
+        self.bridge.mermaid_svg_ready.connect(MermaidSvgCache.shared().put)
         self.pending_save_path = None
         self.setup_ui()
         self.render_mermaid()
@@ -1501,12 +4417,22 @@ class MermaidViewer(QMainWindow):
     
     def render_mermaid(self):
         bg = "#1e1e1e" if self.dark_mode else "#ffffff"
-        theme = "dark" if self.dark_mode else "default"
+        theme = mermaid_theme(self.dark_mode)
+        
+        # 뷰어는 미리보기와 설정(useMaxWidth 등)이 달라 별도 키로 캐시
+        source_key = mermaid_source_key(self.mermaid_code)
+        cache_theme = f"{theme}-viewer"
+        svg = MermaidSvgCache.shared().get(source_key, cache_theme)
+        if svg is not None:
+            diagram = f'<div id="diagram">{svg}</div>'
+        else:
+            # mermaid_div와 같이 이스케이프 - 소스 속 </div>, <b> 등이 페이지를 깨지 않도록 (Mermaid가 다시 풀어 읽는다)
+            diagram = f'<div id="diagram" class="mermaid">\n{html_escape(self.mermaid_code, quote=False)}\n</div>'
         
         html = f'''<!DOCTYPE html>
 <html><head><meta charset="UTF-8">
-<script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-<script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+<script src="{ASSET_BASE_URL}mermaid.min.js"></script>
+<script src="{ASSET_BASE_URL}qwebchannel.js"></script>
 <style>
 *{{margin:0;padding:0;box-sizing:border-box}}
 html,body{{width:100%;height:100%;overflow:auto;background:{bg}}}
@@ -1514,11 +4440,9 @@ html,body{{width:100%;height:100%;overflow:auto;background:{bg}}}
 #diagram{{transform-origin:center;transition:transform 0.15s ease-out}}
 .mermaid{{background:transparent}}
 </style></head><body>
-<div id="container"><div id="diagram" class="mermaid">
-{self.mermaid_code}
-</div></div>
+<div id="container">{diagram}</div>
 <script>
-mermaid.initialize({{startOnLoad:true,theme:'{theme}',securityLevel:'loose',
+mermaid.initialize({{startOnLoad:false,theme:'{theme}',securityLevel:'loose',
   flowchart:{{useMaxWidth:false,htmlLabels:true}},
   sequence:{{useMaxWidth:false}},
   gantt:{{useMaxWidth:false}},
@@ -1528,8 +4452,18 @@ mermaid.initialize({{startOnLoad:true,theme:'{theme}',securityLevel:'loose',
   sankey:{{useMaxWidth:false}},
 }});
 
-var bridge=null;
-new QWebChannel(qt.webChannelTransport,function(c){{bridge=c.objects.bridge}});
+var bridge=null,rendered=false;
+function storeSvg(){{
+  var d=document.getElementById('diagram'),svg=d.querySelector('svg');
+  if(bridge&&rendered&&svg&&svg.getAttribute('aria-roledescription')!=='error'){{
+    bridge.storeMermaidSvg('{source_key}','{cache_theme}',d.innerHTML);
+    rendered=false;
+  }}
+}}
+var diagram=document.getElementById('diagram');
+if(diagram.classList.contains('mermaid'))
+  mermaid.run({{nodes:[diagram],suppressErrors:true}}).then(function(){{rendered=true;storeSvg()}});
+new QWebChannel(qt.webChannelTransport,function(c){{bridge=c.objects.bridge;storeSvg()}});
 
 function setZoom(s){{document.getElementById('diagram').style.transform='scale('+(s/100)+')'}}
 
@@ -1578,7 +4512,7 @@ function exportPNG(scale){{
   }}
 }}
 </script></body></html>'''
-        self.web_view.setHtml(html)
+        self.web_view.setHtml(html, QUrl(ASSET_BASE_URL))
     
     def on_zoom_changed(self, value):
         self.zoom_level = value
@@ -1660,6 +4594,230 @@ function exportPNG(scale){{
 
 # ============== 사이드 패널 ==============
 
+class OutlineNode:
+    """개요 트리의 제목 노드"""
+    __slots__ = ('line', 'level', 'title', 'parent', 'children', 'row')
+
+    def __init__(self, line, level, title, parent=None):
+        self.line = line
+        self.level = level
+        self.title = title
+        self.parent = parent
+        self.children = []
+        self.row = 0
+
+
+class OutlineModel(QAbstractItemModel):
+    """제목 목록 위의 트리 모델
+
+    새 제목 목록을 이전 목록과 앞/뒤 공통 구간으로 비교해서
+    가운데 바뀐 구간(과 그 영향으로 부모가 바뀌는 뒤쪽 제목)의 행만
+    삽입/삭제한다. 제목 글자만 바뀌면 dataChanged만 보낸다.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = OutlineNode(-1, 0, '')
+        self.nodes = []      # 문서 순서의 노드 (제목 목록과 1:1)
+        self._keys = []      # [(레벨, 제목), ...] 비교용
+        self.resets = 0
+        self.row_updates = 0
+
+    # ---- Qt 모델 인터페이스 ----
+    def index(self, row, column, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self.root
+        if column == 0 and 0 <= row < len(node.children):
+            return self.createIndex(row, 0, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        # 뷰가 펼친 행마다 호출하므로 최대한 가볍게
+        node = index.internalPointer() if index.isValid() else None
+        if node is None or node.parent is self.root:
+            return QModelIndex()
+        node = node.parent
+        return self.createIndex(node.row, 0, node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self.root
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.title
+        if role == Qt.ItemDataRole.UserRole:
+            return node.line
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{node.line + 1}번 줄"
+        return None
+
+    def index_of(self, node):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    @staticmethod
+    def key(node):
+        return (node.level, node.title)
+
+    # ---- 갱신 ----
+    def set_headings(self, headings):
+        """headings: [(줄, 레벨, 제목), ...]"""
+        keys = [(level, title) for _, level, title in headings]
+        old = self._keys
+        n_old, n_new = len(old), len(keys)
+        limit = min(n_old, n_new)
+
+        p = 0
+        while p < limit and old[p] == keys[p]:
+            p += 1
+        s = 0
+        while s < limit - p and old[n_old - 1 - s] == keys[n_new - 1 - s]:
+            s += 1
+
+        if p == 0 and s == 0 and (n_old or n_new):
+            # 전부 바뀜 (새 파일 등) - 한 번에 다시 만든다
+            self._reset(headings, keys)
+            return
+
+        if p + s < n_old or p + s < n_new:
+            mid_old = old[p:n_old - s]
+            mid_new = keys[p:n_new - s]
+            if len(mid_old) == len(mid_new) and all(
+                    a[0] == b[0] for a, b in zip(mid_old, mid_new)):
+                # 구조는 그대로, 제목 글자만 바뀜
+                for i in range(p, n_old - s):
+                    node = self.nodes[i]
+                    node.title = keys[i][1]
+                    idx = self.index_of(node)
+                    self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DisplayRole])
+                    self.row_updates += 1
+            else:
+                # 가운데 구간의 가장 얕은 레벨보다 깊은 뒤쪽 제목은
+                # 부모가 바뀔 수 있으므로 함께 다시 붙인다
+                min_level = min(level for level, _ in mid_old + mid_new)
+                end_old, end_new = n_old - s, n_new - s
+                while end_old < n_old and old[end_old][0] > min_level:
+                    end_old += 1
+                    end_new += 1
+                self._keys = keys
+                self._update_lines(headings, 0, p)
+                self._update_lines(headings, end_new, n_new, end_old - end_new)
+                self._replace(p, end_old, headings[p:end_new])
+                return
+
+        self._keys = keys
+        self._update_lines(headings, 0, n_new)
+
+    def _update_lines(self, headings, start, end, shift=0):
+        """줄 번호만 맞춘다 (화면에 보이지 않으므로 신호 없음)"""
+        nodes = self.nodes
+        for i in range(start, end):
+            nodes[i + shift].line = headings[i][0]
+
+    def _reset(self, headings, keys):
+        self.beginResetModel()
+        self.root.children = []
+        self.nodes = []
+        stack = [self.root]
+        for line, level, title in headings:
+            while len(stack) > 1 and stack[-1].level >= level:
+                stack.pop()
+            parent = stack[-1]
+            node = OutlineNode(line, level, title, parent)
+            node.row = len(parent.children)
+            parent.children.append(node)
+            self.nodes.append(node)
+            stack.append(node)
+        self._keys = keys
+        self.resets += 1
+        self.endResetModel()
+
+    def _replace(self, start, end, items):
+        """nodes[start:end]를 items로 만든 새 노드로 바꾼다"""
+        removed = self.nodes[start:end]
+        removed_ids = {id(node) for node in removed}
+
+        # 1. 제거: 부모가 구간 밖인 노드를 부모별 연속 행으로 묶는다
+        runs = []
+        for node in removed:
+            if id(node.parent) in removed_ids:
+                continue
+            if runs and runs[-1][0] is node.parent and runs[-1][2] == node.row - 1:
+                runs[-1][2] = node.row
+            else:
+                runs.append([node.parent, node.row, node.row])
+        for parent, first, last in reversed(runs):
+            self.beginRemoveRows(self.index_of(parent), first, last)
+            del parent.children[first:last + 1]
+            self._renumber(parent, first)
+            self.endRemoveRows()
+            self.row_updates += last - first + 1
+
+        # 2. 삽입: start 직전 제목의 조상 사슬에서 이어서 트리를 쌓는다
+        stack = []
+        node = self.nodes[start - 1] if start > 0 else self.root
+        while node is not None:
+            stack.append(node)
+            node = node.parent
+        stack.reverse()
+
+        new_nodes = []
+        new_ids = set()
+        inserts = []  # [(부모, [노드, ...]), ...]
+        for line, level, title in items:
+            while len(stack) > 1 and stack[-1].level >= level:
+                stack.pop()
+            parent = stack[-1]
+            node = OutlineNode(line, level, title, parent)
+            if id(parent) in new_ids:
+                node.row = len(parent.children)
+                parent.children.append(node)
+            elif inserts and inserts[-1][0] is parent:
+                inserts[-1][1].append(node)
+            else:
+                inserts.append((parent, [node]))
+            new_nodes.append(node)
+            new_ids.add(id(node))
+            stack.append(node)
+
+        self.nodes[start:end] = new_nodes
+        for parent, children in inserts:
+            pos = self._insert_position(parent, children[0].line)
+            self.beginInsertRows(self.index_of(parent), pos, pos + len(children) - 1)
+            parent.children[pos:pos] = children
+            self._renumber(parent, pos)
+            self.endInsertRows()
+            self.row_updates += len(children)
+
+    @staticmethod
+    def _renumber(parent, start):
+        children = parent.children
+        for i in range(start, len(children)):
+            children[i].row = i
+
+    @staticmethod
+    def _insert_position(parent, line):
+        """parent의 자식 중 line보다 앞에 있는 자식 수 (이분 탐색)"""
+        children = parent.children
+        lo, hi = 0, len(children)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if children[mid].line < line:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
 class OutlinePanel(QWidget):
     """문서 개요 (TOC) 패널"""
     heading_clicked = pyqtSignal(int)
@@ -1673,41 +4831,52 @@ class OutlinePanel(QWidget):
         title.setFont(QFont("", 13, QFont.Weight.Bold))
         layout.addWidget(title)
         
-        self.tree = QTreeWidget()
+        # 사용자가 접은 제목 (레벨, 제목) - 행이 다시 만들어져도 유지
+        self.collapsed_keys = set()
+        
+        self.model = OutlineModel(self)
+        self.tree = QTreeView()
         self.tree.setHeaderHidden(True)
-        self.tree.itemClicked.connect(self.on_item_clicked)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setModel(self.model)
+        self.tree.clicked.connect(self.on_item_clicked)
+        self.tree.collapsed.connect(self.on_collapsed)
+        self.tree.expanded.connect(self.on_expanded)
+        self.model.modelReset.connect(self.restore_expansion)
+        self.model.rowsInserted.connect(self.expand_inserted)
         layout.addWidget(self.tree)
     
-    def update_outline(self, text):
-        self.tree.clear()
-        lines = text.split('\n')
-        
-        stack = [(None, -1)]  # (item, level)
-        
-        for i, line in enumerate(lines):
-            match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if match:
-                level = len(match.group(1))
-                title = match.group(2)
-                
-                item = QTreeWidgetItem([title])
-                item.setData(0, Qt.ItemDataRole.UserRole, i)
-                
-                # 들여쓰기
-                while stack and stack[-1][1] >= level:
-                    stack.pop()
-                
-                if stack and stack[-1][0]:
-                    stack[-1][0].addChild(item)
-                else:
-                    self.tree.addTopLevelItem(item)
-                
-                stack.append((item, level))
-        
-        self.tree.expandAll()
+    def update_outline(self, headings):
+        """headings: DocumentModel.headings()의 [(줄, 레벨, 제목), ...]"""
+        self.model.set_headings(headings)
     
-    def on_item_clicked(self, item, column):
-        line_num = item.data(0, Qt.ItemDataRole.UserRole)
+    def on_collapsed(self, index):
+        self.collapsed_keys.add(OutlineModel.key(index.internalPointer()))
+    
+    def on_expanded(self, index):
+        self.collapsed_keys.discard(OutlineModel.key(index.internalPointer()))
+    
+    def restore_expansion(self):
+        self.tree.expandAll()
+        if not self.collapsed_keys:
+            return
+        for node in self.model.nodes:
+            if node.children and OutlineModel.key(node) in self.collapsed_keys:
+                self.tree.collapse(self.model.index_of(node))
+    
+    def expand_inserted(self, parent, first, last):
+        """새로 들어온 행과 그 하위 제목을 펼친다 (사용자가 접은 제목 제외)"""
+        parent_node = parent.internalPointer() if parent.isValid() else self.model.root
+        pending = parent_node.children[first:last + 1]
+        while pending:
+            node = pending.pop()
+            if node.children:
+                if OutlineModel.key(node) not in self.collapsed_keys:
+                    self.tree.expand(self.model.index_of(node))
+                pending.extend(node.children)
+    
+    def on_item_clicked(self, index):
+        line_num = index.data(Qt.ItemDataRole.UserRole)
         if line_num is not None:
             self.heading_clicked.emit(line_num)
 
@@ -1844,14 +5013,40 @@ class MarkdownEditor(QMainWindow):
         self.focus_mode = False
         self.recent_files = []
         self.mermaid_viewer = None
+        self.find_dialog = None
+        self.workspace_dir = None  # 폴더 검색 대상
+        self.workspace_index = None
+        self.search_dialog = None
+        self.quick_open_index = QuickOpenIndex(self)
+        self.quick_open_dialog = None
+        self._goto_after_load = None  # 불러오기가 끝나면 이동할 줄
         self.snippets = DEFAULT_SNIPPETS.copy()
         self.word_goal = 0
+        self.scroll_sync = True
+        self.large_file_mb = LARGE_FILE_MB
+        self.large_file = None  # 대용량 파일 모드의 MappedTextFile
+        self.large_page = 0
+        self.current_encoding = 'utf-8'  # 저장할 때 같은 인코딩으로 쓴다
+        self._load_text = None  # 조각으로 넣는 중인 파일 내용
+        self._load_pos = 0
+        self._load_path = None
         self.auto_save_timer = QTimer()
+        self.render_cache = BlockRenderCache()
+        self.preview_scheduler = RenderScheduler(self.update_preview, self)
+        self._render_generation = 0
+        self._render_pending = None
+        try:
+            self.render_server = RenderServer(self)
+            self.render_server.rendered.connect(self.on_render_result)
+            self.render_server.failed.connect(self.on_render_server_failed)
+        except Exception:
+            self.render_server = None  # 프로세스를 못 띄우면 UI 스레드에서 변환
         self._preview_size = 500
         self._normal_style = ""
         
         self.load_settings()
         self.load_snippets()
+        self.edit_actions = []  # 문서를 고치는 메뉴/도구 모음/단축키 - 대용량 파일 모드에서는 끈다
         self.setup_ui()
         self.setup_menu()
         self.setup_toolbar()
@@ -1859,7 +5054,6 @@ class MarkdownEditor(QMainWindow):
         self.setup_auto_save()
         self.apply_theme()
         self.update_title()
-        self.update_preview()
         
         # 초기화 과정에서 발생했을 수 있는 변경 상태 리셋
         self.is_modified = False
@@ -1872,6 +5066,9 @@ class MarkdownEditor(QMainWindow):
                     self.dark_mode = cfg.get('dark_mode', False)
                     self.recent_files = cfg.get('recent_files', [])
                     self.word_goal = cfg.get('word_goal', 0)
+                    self.scroll_sync = cfg.get('scroll_sync', True)
+                    self.large_file_mb = cfg.get('large_file_mb', LARGE_FILE_MB)
+                    self.workspace_dir = cfg.get('workspace_dir')
         except:
             pass
     
@@ -1882,6 +5079,9 @@ class MarkdownEditor(QMainWindow):
                     'dark_mode': self.dark_mode,
                     'recent_files': self.recent_files[:10],
                     'word_goal': self.word_goal,
+                    'scroll_sync': self.scroll_sync,
+                    'large_file_mb': self.large_file_mb,
+                    'workspace_dir': self.workspace_dir,
                 }, f)
         except:
             pass
@@ -1948,7 +5148,6 @@ class MarkdownEditor(QMainWindow):
         self.editor = QPlainTextEdit()
         self.editor.setPlaceholderText("마크다운을 입력하세요...\n\n💡 팁: Tab을 눌러 스니펫을 확장하세요")
         self.editor.setLineWrapMode(QPlainTextEdit.LineWrapMode.WidgetWidth)
-        self.editor.textChanged.connect(self.on_text_changed)
         self.editor.cursorPositionChanged.connect(self.update_cursor_pos)
         
         # 탭 키 처리 (스니펫)
@@ -1956,6 +5155,23 @@ class MarkdownEditor(QMainWindow):
         
         self.highlighter = MarkdownHighlighter(self.editor.document(), self.dark_mode)
         
+        # 증분 구조 모델 (제목, 펜스, 링크)
+        self.doc_model = DocumentModel(self.editor.document(), self)
+        self.doc_model.headingsChanged.connect(self.update_outline)
+        
+        # 리비전마다 스냅샷/분석 한 번 - 제목, 상태 표시줄, 목표, 미리보기가 같은 결과를 받는다
+        self.doc_bus = DocumentBus(self.editor.document(), self)
+        self.doc_bus.subscribe(self.on_text_changed)
+        self.doc_bus.subscribe(self.update_stats)
+        self.doc_bus.subscribe(self.update_goal_progress)
+        
+        # 전체 통계(링크, 이미지, 코드 블록 등)는 입력이 멈췄을 때만 계산
+        self.stats_idle_timer = QTimer(self)
+        self.stats_idle_timer.setSingleShot(True)
+        self.stats_idle_timer.setInterval(2000)
+        self.stats_idle_timer.timeout.connect(self.update_full_stats)
+        self.doc_bus.subscribe(lambda revision: self.stats_idle_timer.start())
+        
         self.completer = QCompleter(AUTOCOMPLETE_ITEMS)
         self.completer.setWidget(self.editor)
         self.completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
@@ -1970,6 +5186,26 @@ class MarkdownEditor(QMainWindow):
         self.goal_progress.hide()
         el.addWidget(self.goal_progress)
         
+        # 대용량 파일 페이지 이동
+        self.page_bar = QWidget()
+        pbl = QHBoxLayout(self.page_bar)
+        pbl.setContentsMargins(0, 0, 0, 0)
+        self.page_prev_btn = QPushButton("◀ 이전")
+        self.page_prev_btn.clicked.connect(lambda: self.show_large_page(self.large_page - 1))
+        pbl.addWidget(self.page_prev_btn)
+        self.page_spin = QSpinBox()
+        self.page_spin.setMinimum(1)
+        self.page_spin.setKeyboardTracking(False)
+        self.page_spin.valueChanged.connect(lambda v: self.show_large_page(v - 1))
+        pbl.addWidget(self.page_spin)
+        self.page_info = QLabel()
+        pbl.addWidget(self.page_info, 1)
+        self.page_next_btn = QPushButton("다음 ▶")
+        self.page_next_btn.clicked.connect(lambda: self.show_large_page(self.large_page + 1))
+        pbl.addWidget(self.page_next_btn)
+        self.page_bar.hide()
+        el.addWidget(self.page_bar)
+        
         self.splitter.addWidget(editor_w)
         
         # 미리보기
@@ -1978,10 +5214,25 @@ class MarkdownEditor(QMainWindow):
         pl.setContentsMargins(5, 5, 5, 5)
         
         self.preview = QWebEngineView()
+        self.preview_bridge = WebBridge()
+        self.preview_bridge.preview_ready.connect(self.on_preview_ready)
+        self.preview_bridge.mermaid_svg_ready.connect(MermaidSvgCache.shared().put)
+        self.preview_channel = QWebChannel()
+        self.preview_channel.registerObject("bridge", self.preview_bridge)
+        self.preview.page().setWebChannel(self.preview_channel)
+        self._preview_ready = False
+        self._preview_order = []
+        self._preview_lines = []
         pl.addWidget(self.preview)
         
+        # 에디터 <-> 미리보기 스크롤 동기화 (원본 줄 기준)
+        self._scrolling_from_preview = False
+        self.editor.verticalScrollBar().valueChanged.connect(self.sync_preview_scroll)
+        self.preview_bridge.preview_scrolled.connect(self.on_preview_scrolled)
+        
         self.splitter.addWidget(preview_w)
         self.splitter.setSizes([550, 550])
+        self.preview_container = preview_w
         
         main_layout.addWidget(self.splitter)
         
@@ -2000,10 +5251,38 @@ class MarkdownEditor(QMainWindow):
         
         self.pos_label = QLabel("줄: 1, 열: 1")
         self.status_bar.addPermanentWidget(self.pos_label)
+        
+        self.large_file_label = QLabel()
+        self.large_file_label.setStyleSheet("color: #FF9500; font-weight: bold;")
+        self.large_file_label.hide()
+        self.status_bar.addPermanentWidget(self.large_file_label)
+        
+        self.encoding_label = QLabel(ENCODING_NAMES['utf-8'])
+        self.status_bar.addPermanentWidget(self.encoding_label)
+        
+        # 파일 불러오기 진행 (작업 스레드에서 읽고, 여기서 조각 단위로 넣는다)
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(160)
+        self.load_progress.setMaximumHeight(14)
+        self.load_progress.hide()
+        self.status_bar.addWidget(self.load_progress)
+        self.load_cancel_btn = QPushButton("취소")
+        self.load_cancel_btn.clicked.connect(self.cancel_loading)
+        self.load_cancel_btn.hide()
+        self.status_bar.addWidget(self.load_cancel_btn)
+        
+        self.file_loader = FileLoader(self)
+        self.file_loader.loaded.connect(self.on_file_loaded)
+        self.file_loader.failed.connect(self.on_file_load_failed)
+        self.page_indexer = PageIndexer(self)
+        self.page_indexer.progress.connect(self.on_pages_indexed)
+        self.load_timer = QTimer(self)
+        self.load_timer.setInterval(0)
+        self.load_timer.timeout.connect(self.insert_next_chunk)
     
     def eventFilter(self, obj, event):
         """탭 키로 스니펫 확장"""
-        if obj == self.editor and event.type() == event.Type.KeyPress:
+        if obj == self.editor and event.type() == event.Type.KeyPress and not self.editor.isReadOnly():
             if event.key() == Qt.Key.Key_Tab:
                 cursor = self.editor.textCursor()
                 cursor.select(QTextCursor.SelectionType.WordUnderCursor)
@@ -2112,6 +5391,16 @@ class MarkdownEditor(QMainWindow):
         find_act.triggered.connect(self.show_find_dialog)
         edit_menu.addAction(find_act)
         
+        search_act = QAction("폴더에서 찾기...", self)
+        search_act.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        search_act.triggered.connect(self.show_workspace_search)
+        edit_menu.addAction(search_act)
+        
+        quick_open_act = QAction("빠른 열기...", self)
+        quick_open_act.setShortcut(QKeySequence("Ctrl+P"))
+        quick_open_act.triggered.connect(self.show_quick_open)
+        edit_menu.addAction(quick_open_act)
+        
         edit_menu.addSeparator()
         
         snippet_act = QAction("스니펫 관리...", self)
@@ -2120,6 +5409,7 @@ class MarkdownEditor(QMainWindow):
         
         # ===== 삽입 =====
         insert_menu = menubar.addMenu("삽입")
+        self.edit_actions.append(insert_menu.menuAction())
         
         insert_table = QAction("테이블", self)
         insert_table.triggered.connect(self.insert_table)
@@ -2178,6 +5468,7 @@ class MarkdownEditor(QMainWindow):
                 act = QAction(f"삽입: {name}", self)
                 act.triggered.connect(lambda _, n=name: self.insert_at_cursor(MERMAID_EXAMPLES[n]))
                 mermaid_main.addAction(act)
+                self.edit_actions.append(act)
         
         # ===== 보기 =====
         view_menu = menubar.addMenu("보기")
@@ -2194,6 +5485,12 @@ class MarkdownEditor(QMainWindow):
         self.sidebar_act.triggered.connect(self.toggle_sidebar)
         view_menu.addAction(self.sidebar_act)
         
+        self.scroll_sync_act = QAction("스크롤 동기화", self)
+        self.scroll_sync_act.setCheckable(True)
+        self.scroll_sync_act.setChecked(self.scroll_sync)
+        self.scroll_sync_act.triggered.connect(self.toggle_scroll_sync)
+        view_menu.addAction(self.scroll_sync_act)
+        
         view_menu.addSeparator()
         
         self.focus_act = QAction("🎯 포커스 모드", self)
@@ -2223,6 +5520,10 @@ class MarkdownEditor(QMainWindow):
         goal_act.triggered.connect(self.set_word_goal)
         tools_menu.addAction(goal_act)
         
+        large_act = QAction("📦 대용량 파일 기준 크기...", self)
+        large_act.triggered.connect(self.set_large_file_threshold)
+        tools_menu.addAction(large_act)
+        
         tools_menu.addSeparator()
         
         format_table = QAction("표 정렬", self)
@@ -2236,6 +5537,13 @@ class MarkdownEditor(QMainWindow):
         remove_empty = QAction("빈 줄 제거", self)
         remove_empty.triggered.connect(self.remove_empty_lines)
         tools_menu.addAction(remove_empty)
+        self.edit_actions += [format_table, sort_lines, remove_empty]
+        
+        tools_menu.addSeparator()
+        
+        render_stats = QAction("⏱ 렌더링 통계", self)
+        render_stats.triggered.connect(self.show_render_stats)
+        tools_menu.addAction(render_stats)
         
         # ===== 도움말 =====
         help_menu = menubar.addMenu("도움말")
@@ -2287,6 +5595,8 @@ class MarkdownEditor(QMainWindow):
                     btn.setToolTip(tooltip)
                 if action:
                     btn.triggered.connect(action)
+                if action not in (self.open_mermaid_viewer, self.toggle_focus_mode):
+                    self.edit_actions.append(btn)
     
     def setup_shortcuts(self):
         shortcuts = [
@@ -2305,6 +5615,8 @@ class MarkdownEditor(QMainWindow):
         for key, cb in shortcuts:
             s = QShortcut(QKeySequence(key), self)
             s.activated.connect(cb)
+            if cb not in (self.open_mermaid_viewer, self.exit_focus_mode):
+                self.edit_actions.append(s)
     
     def setup_auto_save(self):
         self.auto_save_timer.timeout.connect(self.auto_save)
@@ -2318,14 +5630,19 @@ class MarkdownEditor(QMainWindow):
         self.highlighter.dark_mode = self.dark_mode
         self.highlighter.setup_formats()
         self.highlighter.rehighlight()
-        self.update_preview()
+        self.load_preview_shell()
     
-    def on_text_changed(self):
+    def on_text_changed(self, revision=None):
+        if self.large_file is not None or self._load_text is not None:
+            return  # 페이지 전환/파일 불러오는 중 - 수정 표시도 미리보기도 없음
         self.is_modified = True
         self.update_title()
-        self.update_stats()
-        self.outline_panel.update_outline(self.editor.toPlainText())
-        QTimer.singleShot(350, self.update_preview)
+        self.preview_scheduler.request()
+    
+    def update_outline(self):
+        if self._load_text is not None:
+            return  # 불러오기가 끝나면 한 번에 갱신
+        self.outline_panel.update_outline(self.doc_model.headings())
     
     def update_title(self):
         title = "Nebula Note"
@@ -2335,97 +5652,362 @@ class MarkdownEditor(QMainWindow):
             title = f"*{title}"
         self.setWindowTitle(title)
     
-    def update_stats(self):
-        text = self.editor.toPlainText()
-        stats = DocumentStats.calculate(text)
-        
-        self.word_label.setText(f"단어: {stats['words']}")
-        self.char_label.setText(f"문자: {stats['chars']}")
-        self.read_time_label.setText(f"읽기: ~{stats['read_time']}분")
-        
-        # 워드 목표
+    def update_stats(self, revision=None):
+        """상태 표시줄 - 증분 모델의 단어 수와 문서 글자 수만 읽는다 (문서 크기와 무관)"""
+        words = self.doc_model.word_count
+        self.word_label.setText(f"단어: {words}")
+        self.char_label.setText(f"문자: {self.doc_model.character_count()}")
+        self.read_time_label.setText(f"읽기: ~{max(1, words // 200)}분")
+    
+    def update_full_stats(self):
+        stats = self.doc_bus.analysis().stats
+        self.word_label.setToolTip(
+            f"줄: {stats['lines']:,} · 문단: {stats['paragraphs']:,} · 제목: {stats['headers']:,}\n"
+            f"링크: {stats['links']:,} · 이미지: {stats['images']:,} · "
+            f"코드 블록: {stats['code_blocks']:,} (Mermaid {stats['mermaid_blocks']:,})")
+    
+    def update_goal_progress(self, revision=None):
         if self.word_goal > 0:
+            words = self.doc_model.word_count
             self.goal_progress.show()
-            progress = min(100, int(stats['words'] / self.word_goal * 100))
+            progress = min(100, int(words / self.word_goal * 100))
             self.goal_progress.setValue(progress)
-            self.goal_progress.setToolTip(f"{stats['words']}/{self.word_goal} 단어 ({progress}%)")
+            self.goal_progress.setToolTip(f"{words}/{self.word_goal} 단어 ({progress}%)")
         else:
             self.goal_progress.hide()
     
     def update_cursor_pos(self):
         cursor = self.editor.textCursor()
-        self.pos_label.setText(f"줄: {cursor.blockNumber()+1}, 열: {cursor.columnNumber()+1}")
+        line = cursor.blockNumber()
+        if self.large_file is not None:
+            line += self.large_file.first_line(self.large_page)
+        self.pos_label.setText(f"줄: {line+1}, 열: {cursor.columnNumber()+1}")
     
-    def update_preview(self):
-        text = self.editor.toPlainText()
+    def load_preview_shell(self):
+        """미리보기 셸 페이지를 한 번 로드 - 이후에는 변경된 블록만 DOM에 패치"""
+        theme = mermaid_theme(self.dark_mode)
         
-        # Mermaid 블록 추출
-        mermaid_pattern = r'```mermaid\n([\s\S]*?)```'
-        placeholder_text = text
-        mermaid_blocks = re.findall(mermaid_pattern, text)
+        html = f'''<!DOCTYPE html>
+<html><head><meta charset="UTF-8">
+<script src="{ASSET_BASE_URL}mermaid.min.js"></script>
+<script src="{ASSET_BASE_URL}qwebchannel.js"></script>
+<style>
+{preview_css(self.dark_mode)}
+.mermaid-pending {{ color: transparent; overflow: hidden; white-space: pre; border-radius: 8px;
+                   background: {"#2a2a2a" if self.dark_mode else "#f7f7f7"}; }}
+</style></head><body>
+<div id="content"></div>
+<script>
+mermaid.initialize({{ startOnLoad: false, theme: '{theme}' }});
+
+// 다이어그램은 화면에 들어올 때만 그린다 - 그 전까지는 크기를 맞춘 자리표시자
+var LIVE_LIMIT={MERMAID_LIVE_LIMIT};
+var live=new Set(),pending=new Set(),heights={{}},flushQueued=false,chain=Promise.resolve();
+var observer=new IntersectionObserver(function(entries){{
+  entries.forEach(function(e){{
+    var n=e.target;
+    n._visible=e.isIntersecting;
+    if(e.isIntersecting&&n.classList.contains('mermaid-pending')) pending.add(n);
+    else pending.delete(n);
+  }});
+  if(pending.size&&!flushQueued){{ flushQueued=true; requestAnimationFrame(flushDiagrams); }}
+}},{{rootMargin:'400px 0px'}});
+
+function placeholderHeight(n,src){{
+  if(heights[n.dataset.src]) return heights[n.dataset.src];
+  return Math.min(600,Math.max(120,src.split('\\n').length*36));
+}}
+
+function trackDiagram(n){{
+  if(n.classList.contains('mermaid')){{
+    n._src=n.textContent;
+    n.classList.add('mermaid-pending');
+    n.style.height=placeholderHeight(n,n._src)+'px';
+  }} else live.add(n);
+  observer.observe(n);
+}}
+
+function forgetDiagram(n){{
+  observer.unobserve(n); live.delete(n); pending.delete(n);
+}}
+
+function markLive(n){{
+  n.classList.remove('mermaid-pending');
+  n.style.height='';
+  live.add(n);
+  heights[n.dataset.src]=n.offsetHeight;
+}}
+
+function flushDiagrams(){{
+  flushQueued=false;
+  var fresh=[];
+  pending.forEach(function(n){{
+    if(!n.isConnected) return;
+    if(n._svg){{ n.innerHTML=n._svg; n._svg=null; markLive(n); }}
+    else fresh.push(n);
+  }});
+  pending.clear();
+  if(fresh.length) chain=chain.then(function(){{ return renderDiagrams(fresh); }});
+  chain=chain.then(trimDiagrams);
+}}
+
+// 메모리가 빠듯하면 화면 밖 다이어그램을 모두 내려놓는다 (Chromium 전용 API)
+function memoryTight(){{
+  var m=performance.memory;
+  return !!m&&m.usedJSHeapSize>m.jsHeapSizeLimit*0.6;
+}}
+
+function evictDiagram(n){{
+  live.delete(n);
+  var h=n.offsetHeight;
+  heights[n.dataset.src]=h;
+  if(n._src!==undefined){{ n.removeAttribute('data-processed'); n.textContent=n._src; }}
+  else{{ n._svg=n.innerHTML; n.innerHTML=''; }}
+  n.style.height=h+'px';
+  n.classList.add('mermaid-pending');
+}}
+
+function trimDiagrams(){{
+  var limit=memoryTight()?0:LIVE_LIMIT;
+  if(live.size<=limit) return;
+  var mid=window.scrollY+window.innerHeight/2,off=[];
+  live.forEach(function(n){{
+    if(n._visible===false) off.push([Math.abs(n.getBoundingClientRect().top+window.scrollY-mid),n]);
+  }});
+  off.sort(function(a,b){{ return b[0]-a[0]; }});
+  for(var i=0;i<off.length&&live.size>limit;i++) evictDiagram(off[i][1]);
+}}
+
+// 스크롤 동기화용 색인: 블록 시작 줄(오름차순)과 해당 노드
+var blockLines=[],blockNodes=[],totalLines=1,userScrollUntil=0,scrollQueued=false,scrollTarget=null;
+
+function nodeTop(n){{ return n.getBoundingClientRect().top+window.scrollY; }}
+
+// line 이하에서 시작하는 마지막 블록 (이분 탐색)
+function blockAtLine(line){{
+  var lo=0,hi=blockLines.length-1;
+  while(lo<hi){{ var mid=(lo+hi+1)>>1; if(blockLines[mid]<=line) lo=mid; else hi=mid-1; }}
+  return lo;
+}}
+
+function blockEnd(i){{ return i+1<blockLines.length?blockLines[i+1]:totalLines; }}
+
+function scrollToLine(line){{
+  scrollTarget=line;
+  if(!scrollQueued){{ scrollQueued=true; requestAnimationFrame(applyScroll); }}
+}}
+
+function applyScroll(){{
+  scrollQueued=false;
+  if(!blockNodes.length) return;
+  var i=blockAtLine(scrollTarget),n=blockNodes[i],start=blockLines[i];
+  var frac=Math.min(1,Math.max(0,(scrollTarget-start)/Math.max(1,blockEnd(i)-start)));
+  window.scrollTo(0,nodeTop(n)+frac*n.offsetHeight);
+}}
+
+// 화면 맨 위 위치의 원본 줄 - 블록 위치도 문서 순서대로 증가하므로 이분 탐색
+function lineAtTop(){{
+  var y=window.scrollY,lo=0,hi=blockNodes.length-1;
+  if(hi<0) return 0;
+  while(lo<hi){{ var mid=(lo+hi+1)>>1; if(nodeTop(blockNodes[mid])<=y) lo=mid; else hi=mid-1; }}
+  var n=blockNodes[lo],start=blockLines[lo];
+  var frac=Math.min(1,Math.max(0,(y-nodeTop(n))/Math.max(1,n.offsetHeight)));
+  return start+frac*(blockEnd(lo)-start);
+}}
+
+// 사용자가 직접 스크롤한 경우만 에디터로 알린다 (패치로 인한 레이아웃 이동은 제외)
+['wheel','keydown','mousedown','touchstart'].forEach(function(ev){{
+  window.addEventListener(ev,function(){{ userScrollUntil=performance.now()+800; }},{{passive:true}});
+}});
+window.addEventListener('mousemove',function(e){{ if(e.buttons) userScrollUntil=performance.now()+800; }},{{passive:true}});
+window.addEventListener('scroll',function(){{
+  if(bridge&&performance.now()<userScrollUntil) bridge.previewScrolled(lineAtTop());
+}},{{passive:true}});
+
+// order: 블록 id 순서, lines: 블록 시작 줄, html: 새 블록의 HTML - 기존 노드는 재사용
+function applyPatch(json){{
+  var p=JSON.parse(json),root=document.getElementById('content');
+  var existing={{}};
+  for(var c=root.firstElementChild;c;c=c.nextElementSibling) existing[c.dataset.id]=c;
+  var ref=root.firstElementChild,fresh=[],nodes=[];
+  p.order.forEach(function(id,i){{
+    var node=existing[id];
+    if(node){{ delete existing[id]; }}
+    else{{
+      node=document.createElement('div');
+      node.className='md-block';
+      node.dataset.id=id;
+      node.innerHTML=p.html[id];
+      fresh.push(node);
+    }}
+    if(node===ref) ref=ref.nextElementSibling;
+    else root.insertBefore(node,ref);
+    node.dataset.line=p.lines[i];
+    nodes.push(node);
+  }});
+  blockLines=p.lines; blockNodes=nodes; totalLines=p.total;
+  Object.keys(existing).forEach(function(id){{
+    existing[id].querySelectorAll('.mermaid,.mermaid-svg').forEach(forgetDiagram);
+    existing[id].remove();
+  }});
+  fresh.forEach(function(n){{ n.querySelectorAll('.mermaid,.mermaid-svg').forEach(trackDiagram); }});
+  if(live.size>LIVE_LIMIT) trimDiagrams();
+}}
+
+// 새로 그린 SVG는 Python 쪽 캐시에 저장 (오류 그림은 제외)
+function renderDiagrams(nodes){{
+  nodes=nodes.filter(function(d){{ return d.isConnected; }});
+  if(!nodes.length) return;
+  return mermaid.run({{nodes:nodes,suppressErrors:true}}).then(function(){{
+    nodes.forEach(function(d){{
+      markLive(d);
+      var svg=d.querySelector('svg');
+      if(bridge&&!d._stored&&svg&&svg.getAttribute('aria-roledescription')!=='error'){{
+        d._stored=true;
+        bridge.storeMermaidSvg(d.dataset.src,'{theme}',d.innerHTML);
+      }}
+    }});
+  }}).catch(function(){{}});
+}}
+
+var bridge=null;
+if(window.qt){{
+  new QWebChannel(qt.webChannelTransport,function(c){{
+    bridge=c.objects.bridge;
+    bridge.previewPatch.connect(applyPatch);
+    bridge.previewScroll.connect(scrollToLine);
+    bridge.previewLoaded();
+  }});
+}}
+</script>
+</body></html>'''
         
-        for i, block in enumerate(mermaid_blocks):
-            placeholder_text = placeholder_text.replace(
-                f'```mermaid\n{block}```',
-                f'<div class="mermaid">\n{block}\n</div>'
-            )
+        self._preview_ready = False
+        self._preview_order = []
+        self._preview_lines = []
+        self.preview.setHtml(html, QUrl(ASSET_BASE_URL))
+    
+    def on_preview_ready(self):
+        self._preview_ready = True
+        self._preview_order = []
+        self._preview_lines = []
+        self.update_preview()
+        self.sync_preview_scroll()
+    
+    def update_preview(self):
+        """미리보기 갱신 - 변환이 렌더 서버로 넘어가 비동기로 진행되면 True"""
+        if not self._preview_ready:
+            return False  # 셸 로드가 끝나면 on_preview_ready에서 전체를 보낸다
+        if self.large_file is not None:
+            return False  # 대용량 파일 모드에서는 미리보기 중지
+        
+        superseded = self._render_pending is not None
+        self._render_pending = None
+        self._render_generation += 1
+        
+        scan = self.doc_bus.analysis().scan
+        layout = self.render_cache.split(scan.text, scan)
+        
+        htmls = {}
+        missing = {}
+        for key, _, block in layout:
+            if key in htmls or key in missing:
+                continue
+            html = self.render_cache.get(key)
+            if html is None:
+                missing[key] = block
+            else:
+                htmls[key] = html
         
-        md = markdown.Markdown(extensions=['tables', 'fenced_code', 'codehilite', 'toc', 'nl2br', 'sane_lists'])
-        html_content = md.convert(placeholder_text)
+        # 바뀐 블록만 렌더 서버에서 변환
+        if missing and self.render_server is not None:
+            if self.render_server.submit(self._render_generation, list(missing.items())):
+                self._render_pending = (layout, htmls)
+                return True
         
-        bg = "#1e1e1e" if self.dark_mode else "#ffffff"
-        fg = "#d4d4d4" if self.dark_mode else "#333333"
-        code_bg = "#2d2d2d" if self.dark_mode else "#f5f5f5"
-        theme = "dark" if self.dark_mode else "default"
+        for key, block in missing.items():
+            htmls[key] = render_markdown_block(block)
+            self.render_cache.put(key, htmls[key])
+        self.apply_preview_layout(layout, htmls)
+        if superseded:
+            self.preview_scheduler.finished()
+        return False
+    
+    def on_render_result(self, generation, rendered, complete):
+        for key, html in rendered:
+            self.render_cache.put(key, html)
         
-        html = f'''<!DOCTYPE html>
-<html><head><meta charset="UTF-8">
-<script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-<style>
-body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-       line-height: 1.7; padding: 25px; max-width: 850px; margin: 0 auto; 
-       background: {bg}; color: {fg}; }}
-h1,h2,h3,h4,h5,h6 {{ margin-top: 1.5em; margin-bottom: 0.5em; font-weight: 600; }}
-h1 {{ font-size: 2em; border-bottom: 2px solid {code_bg}; padding-bottom: 0.3em; }}
-h2 {{ font-size: 1.5em; border-bottom: 1px solid {code_bg}; padding-bottom: 0.3em; }}
-code {{ background: {code_bg}; padding: 0.2em 0.4em; border-radius: 3px; font-family: 'Consolas', monospace; font-size: 0.9em; }}
-pre {{ background: {code_bg}; padding: 16px; border-radius: 8px; overflow-x: auto; }}
-pre code {{ background: none; padding: 0; }}
-blockquote {{ border-left: 4px solid #007AFF; margin: 1em 0; padding: 0.5em 1em; background: {code_bg}; border-radius: 0 8px 8px 0; }}
-table {{ border-collapse: collapse; width: 100%; margin: 1em 0; }}
-th, td {{ border: 1px solid {"#444" if self.dark_mode else "#ddd"}; padding: 10px 14px; text-align: left; }}
-th {{ background: {code_bg}; font-weight: 600; }}
-tr:nth-child(even) {{ background: {code_bg}; }}
-img {{ max-width: 100%; border-radius: 8px; }}
-a {{ color: #007AFF; text-decoration: none; }}
-a:hover {{ text-decoration: underline; }}
-ul, ol {{ padding-left: 2em; }}
-li {{ margin: 0.3em 0; }}
-hr {{ border: none; border-top: 1px solid {code_bg}; margin: 2em 0; }}
-.mermaid {{ background: transparent; text-align: center; margin: 1em 0; }}
-input[type="checkbox"] {{ margin-right: 8px; }}
-</style></head><body>
-{html_content}
-<script>mermaid.initialize({{ startOnLoad: true, theme: '{theme}' }});</script>
-</body></html>'''
+        # 지난 세대의 결과는 캐시에만 반영하고 화면에는 쓰지 않는다
+        if generation != self._render_generation or self._render_pending is None or not complete:
+            return
         
-        self.preview.setHtml(html)
+        layout, htmls = self._render_pending
+        self._render_pending = None
+        htmls.update(rendered)
+        self.apply_preview_layout(layout, htmls)
+        self.preview_scheduler.finished()
+    
+    def on_render_server_failed(self):
+        self.render_server = None
+        if self._render_pending is not None:
+            self.update_preview()
+    
+    def apply_preview_layout(self, layout, htmls):
+        # 같은 내용의 블록이 여러 번 나올 수 있으므로 등장 순번을 붙여 id 생성
+        order = []
+        lines = []
+        fresh = {}
+        seen = Counter()
+        shown = set(self._preview_order)
+        svg_cache = MermaidSvgCache.shared()
+        theme = mermaid_theme(self.dark_mode)
+        heading_ids = HeadingIds()
+        for key, line, _ in layout:
+            block_id = f"{key[:16]}-{seen[key]}"
+            seen[key] += 1
+            html = heading_ids.fix(htmls[key])
+            if html != htmls[key]:
+                # 앞 블록 때문에 id가 바뀐 블록은 다른 DOM 노드로 취급
+                block_id += '-' + hashlib.sha1(html.encode('utf-8')).hexdigest()[:8]
+            order.append(block_id)
+            lines.append(line)
+            if block_id not in shown:
+                fresh[block_id] = svg_cache.inject(html, theme)
+        
+        if order == self._preview_order and lines == self._preview_lines:
+            return  # DOM에 이미 반영된 상태
+        
+        self._preview_order = order
+        self._preview_lines = lines
+        self.preview_bridge.previewPatch.emit(json.dumps({
+            'order': order, 'lines': lines, 'total': self.editor.blockCount(), 'html': fresh,
+        }))
     
     def update_recent_menu(self):
+        # 파일이 있는지는 고를 때 확인한다 (네트워크 드라이브 등에서 메뉴를 만들 때 멈추지 않도록)
         self.recent_menu.clear()
         for f in self.recent_files[:10]:
-            if os.path.exists(f):
-                act = QAction(os.path.basename(f), self)
-                act.setToolTip(f)
-                act.triggered.connect(lambda _, p=f: self.open_file(p))
-                self.recent_menu.addAction(act)
+            act = QAction(os.path.basename(f), self)
+            act.setToolTip(f)
+            act.triggered.connect(lambda _, p=f: self.open_recent(p))
+            self.recent_menu.addAction(act)
         
         if self.recent_files:
             self.recent_menu.addSeparator()
             clear = QAction("목록 지우기", self)
-            clear.triggered.connect(lambda: setattr(self, 'recent_files', []) or self.update_recent_menu())
+            clear.triggered.connect(lambda: self.recent_files.clear() or self.update_recent_menu())
             self.recent_menu.addAction(clear)
     
+    def open_recent(self, path):
+        if not os.path.exists(path):
+            if path in self.recent_files:
+                self.recent_files.remove(path)
+            self.update_recent_menu()
+            self.save_settings()
+            self.status_bar.showMessage(f"파일이 없어 최근 목록에서 뺐습니다: {path}", 3000)
+            return
+        self.open_file(path)
+    
     def add_to_recent(self, path):
         if path in self.recent_files:
             self.recent_files.remove(path)
@@ -2434,18 +6016,64 @@ input[type="checkbox"] {{ margin-right: 8px; }}
         self.save_settings()
     
     def goto_line(self, line_num):
-        cursor = self.editor.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        for _ in range(line_num):
-            cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
-        self.editor.setTextCursor(cursor)
+        block = self.editor.document().findBlockByNumber(line_num)
+        if not block.isValid():
+            return
+        self.editor.setTextCursor(QTextCursor(block))
         self.editor.centerCursor()
         self.editor.setFocus()
+        # 제목으로 이동하면 미리보기도 해당 위치로 (동기화가 꺼져 있어도)
+        self.preview_bridge.previewScroll.emit(float(line_num))
+    
+    def goto_file_line(self, line):
+        """파일 전체 기준 줄로 이동 - 대용량 파일 모드면 그 줄이 있는 페이지를 띄운 뒤 페이지 안에서 이동"""
+        if self.large_file is not None:
+            page = self.large_file.page_of_line(line)
+            if page is None:
+                self.status_bar.showMessage(f"{line + 1:,}번 줄까지 아직 세는 중입니다 - 잠시 뒤 다시 시도하세요", 3000)
+                return
+            self.show_large_page(page)
+            line -= self.large_file.first_line(page)
+        self.goto_line(line)
+    
+    def editor_top_line(self):
+        """에디터 맨 위에 보이는 원본 줄 (줄바꿈된 블록은 소수 부분으로 위치 표시)"""
+        block = self.editor.firstVisibleBlock()
+        offset = self.editor.verticalScrollBar().value() - block.firstLineNumber()
+        lines = block.layout().lineCount() if block.layout() else 0
+        return block.blockNumber() + (min(max(offset, 0), lines) / lines if lines > 1 else 0.0)
+    
+    def sync_preview_scroll(self, *_):
+        if self.scroll_sync and not self._scrolling_from_preview and self._preview_ready:
+            self.preview_bridge.previewScroll.emit(self.editor_top_line())
+    
+    def on_preview_scrolled(self, line):
+        """미리보기를 직접 스크롤하면 에디터도 같은 원본 줄로"""
+        if not self.scroll_sync:
+            return
+        block = self.editor.document().findBlockByNumber(int(line))
+        if not block.isValid():
+            return
+        lines = block.layout().lineCount() if block.layout() else 1
+        value = block.firstLineNumber() + int((line - int(line)) * lines)
+        self._scrolling_from_preview = True
+        try:
+            self.editor.verticalScrollBar().setValue(value)
+        finally:
+            self._scrolling_from_preview = False
+    
+    def toggle_scroll_sync(self, checked):
+        self.scroll_sync = checked
+        self.save_settings()
+        self.sync_preview_scroll()
     
     # ===== 파일 작업 =====
     def new_file(self):
         if self.check_save():
+            self.stop_loading()
+            self.close_large_file()
             self.editor.clear()
+            self.set_encoding('utf-8')
             self.current_file = None
             self.is_modified = False
             self.update_title()
@@ -2460,38 +6088,226 @@ input[type="checkbox"] {{ margin-right: 8px; }}
         
         if path:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    self.editor.setPlainText(f.read())
-                self.current_file = path
-                self.is_modified = False
-                self.update_title()
-                self.add_to_recent(path)
+                self.stop_loading()
+                if os.path.getsize(path) >= self.large_file_mb * 1024 * 1024:
+                    with open(path, 'rb') as f:
+                        encoding = detect_encoding(f.read(64 * 1024))
+                    self.open_large_file(path, encoding)
+                    return
+                self.start_loading(path)
             except Exception as e:
                 QMessageBox.critical(self, "오류", str(e))
     
+    def start_loading(self, path):
+        """작업 스레드에서 읽고 디코딩한 뒤 조각 단위로 에디터에 넣는다"""
+        self.close_large_file()
+        self.editor.setUndoRedoEnabled(False)
+        self.editor.setReadOnly(True)
+        self.editor.clear()
+        self._load_path = path
+        self._load_text = ''
+        self._load_pos = 0
+        self.load_progress.setRange(0, 0)  # 읽는 중 - 진행률 모름
+        self.load_progress.show()
+        self.load_cancel_btn.show()
+        self.status_bar.showMessage(f"불러오는 중: {os.path.basename(path)}")
+        self.file_loader.load(path)
+    
+    def on_file_loaded(self, generation, text, encoding):
+        if generation != self.file_loader.generation or self._load_path is None:
+            return
+        self._load_text = text
+        self._load_pos = 0
+        self.set_encoding(encoding)
+        self.load_progress.setRange(0, max(1, len(text)))
+        self.load_timer.start()
+    
+    def on_file_load_failed(self, generation, message):
+        if generation != self.file_loader.generation or self._load_path is None:
+            return
+        self.stop_loading()
+        self.editor.clear()
+        self.is_modified = False
+        self.update_title()
+        QMessageBox.critical(self, "오류", message)
+    
+    def insert_next_chunk(self):
+        text, pos = self._load_text, self._load_pos
+        end = min(len(text), pos + LOAD_CHUNK_CHARS)
+        if end < len(text):
+            newline = text.rfind('\n', pos, end)
+            if newline > pos:
+                end = newline + 1
+        cursor = QTextCursor(self.editor.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text[pos:end])
+        self._load_pos = end
+        self.load_progress.setValue(end)
+        if end >= len(text):
+            self.finish_loading()
+    
+    def finish_loading(self):
+        path = self._load_path
+        goto = self._goto_after_load
+        self.stop_loading()
+        self.editor.moveCursor(QTextCursor.MoveOperation.Start)
+        self.current_file = path
+        self.is_modified = False
+        self.update_title()
+        self.add_to_recent(path)
+        self.update_outline()
+        self.status_bar.showMessage(f"불러옴: {path} ({ENCODING_NAMES.get(self.current_encoding, self.current_encoding)})", 3000)
+        self.preview_scheduler.request()
+        if goto is not None:
+            self.goto_line(goto)
+    
+    def cancel_loading(self):
+        if self._load_path is None:
+            return
+        self.stop_loading()
+        self.editor.clear()
+        self.current_file = None
+        self.set_encoding('utf-8')
+        self.is_modified = False
+        self.update_title()
+        self.status_bar.showMessage("불러오기를 취소했습니다", 3000)
+    
+    def stop_loading(self):
+        """진행 중인 불러오기를 멈추고 편집 가능한 상태로 되돌린다 (내용은 그대로)"""
+        if self._load_path is None:
+            return
+        self.file_loader.cancel()
+        self.load_timer.stop()
+        self._goto_after_load = None
+        self._load_text = None
+        self._load_path = None
+        self.editor.setUndoRedoEnabled(True)
+        self.editor.setReadOnly(False)
+        self.load_progress.hide()
+        self.load_cancel_btn.hide()
+        self.status_bar.clearMessage()
+    
+    def set_encoding(self, encoding):
+        self.current_encoding = encoding
+        self.encoding_label.setText(ENCODING_NAMES.get(encoding, encoding.upper()))
+    
     def save_file(self):
+        if self.large_file is not None:
+            QMessageBox.information(self, "대용량 파일", "대용량 파일 모드에서는 읽기 전용이라 저장할 수 없습니다.")
+            return
         if self.current_file:
             self._save(self.current_file)
         else:
             self.save_file_as()
     
     def save_file_as(self):
+        if self.large_file is not None:
+            self.save_file()
+            return
         path, _ = QFileDialog.getSaveFileName(self, "저장", "", "마크다운 (*.md);;텍스트 (*.txt)")
         if path:
             self._save(path)
     
     def _save(self, path):
+        if self._load_path is not None:
+            return  # 불러오는 중인 내용은 저장하지 않는다
+        text = self.editor.toPlainText()
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(self.editor.toPlainText())
+            text.encode(self.current_encoding)
+        except UnicodeEncodeError:
+            reply = QMessageBox.question(self, "인코딩",
+                f"{ENCODING_NAMES.get(self.current_encoding, self.current_encoding)}(으)로 저장할 수 없는 문자가 있습니다.\n"
+                "UTF-8로 저장하시겠습니까?")
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            self.set_encoding('utf-8')
+        try:
+            with open(path, 'w', encoding=self.current_encoding) as f:
+                f.write(text)
             self.current_file = path
             self.is_modified = False
             self.update_title()
             self.add_to_recent(path)
             self.status_bar.showMessage(f"저장됨: {path}", 3000)
+            if self.workspace_index is not None:
+                self.workspace_index.update_paths([path])
         except Exception as e:
             QMessageBox.critical(self, "오류", str(e))
     
+    def open_large_file(self, path, encoding='utf-8'):
+        """대용량 파일 모드 - mmap으로 열어 페이지 단위로 보고, 미리보기/강조/전체 개요는 중지"""
+        mapped = MappedTextFile(path, encoding=encoding)
+        self.close_large_file()
+        self.large_file = mapped
+        self.highlighter.setDocument(None)
+        self.preview_container.hide()
+        self.editor.setReadOnly(True)
+        
+        self.large_file_label.setText(f"📦 대용량 파일 모드 (읽기 전용, {mapped.size / (1024 * 1024):.1f} MB)")
+        self.large_file_label.show()
+        
+        for action in self.edit_actions:
+            action.setEnabled(False)
+        self.large_page = -1
+        self.show_large_page(0)
+        # 나머지 페이지 경계와 줄 수는 작업 스레드에서 센다 - 첫 페이지는 바로 보인다
+        self.page_indexer.start(mapped)
+        self.set_encoding(encoding)
+        self.current_file = path
+        self.is_modified = False
+        self.update_title()
+        self.add_to_recent(path)
+    
+    def show_large_page(self, page):
+        """페이지 하나만 에디터에 올린다 - 개요는 이 페이지의 제목만 보여준다"""
+        mapped = self.large_file
+        if mapped is None or page == self.large_page or not 0 <= page < mapped.page_count:
+            return
+        self.large_page = page
+        self.editor.setPlainText(mapped.read_page(page))
+        self.update_page_bar()
+        self.update_cursor_pos()
+    
+    def on_pages_indexed(self, mapped):
+        if mapped is self.large_file:
+            self.update_page_bar()
+    
+    def update_page_bar(self):
+        """페이지 표시줄 - 페이지를 옮기거나 페이지를 더 셌을 때"""
+        mapped, page = self.large_file, self.large_page
+        self.page_spin.blockSignals(True)
+        self.page_spin.setMaximum(mapped.page_count)
+        self.page_spin.setValue(page + 1)
+        self.page_spin.blockSignals(False)
+        self.page_bar.setVisible(mapped.page_count > 1 or not mapped.complete)
+        self.page_prev_btn.setEnabled(page > 0)
+        self.page_next_btn.setEnabled(page + 1 < mapped.page_count)
+        counting = "" if mapped.complete else "+ (세는 중)"
+        self.page_info.setText(f"/ {mapped.page_count:,}{counting} 페이지 · {mapped.first_line(page) + 1:,}번 줄부터")
+    
+    def close_large_file(self):
+        if self.large_file is None:
+            return
+        self.large_file.close()
+        self.large_file = None
+        self.large_page = 0
+        # 강조기를 다시 붙이기 전에 페이지를 비워 두어야 불필요한 전체 강조가 없다
+        self.editor.clear()
+        self.editor.setReadOnly(False)
+        for action in self.edit_actions:
+            action.setEnabled(True)
+        self.highlighter.setDocument(self.editor.document())
+        self.preview_container.show()
+        self.page_bar.hide()
+        self.large_file_label.hide()
+    
+    def set_large_file_threshold(self):
+        size, ok = QInputDialog.getInt(self, "대용량 파일", "이 크기(MB) 이상인 파일은 대용량 파일 모드로 엽니다:",
+                                       self.large_file_mb, 1, 100000, 1)
+        if ok:
+            self.large_file_mb = size
+            self.save_settings()
+    
     def auto_save(self):
         if self.current_file and self.is_modified:
             self._save(self.current_file)
@@ -2523,7 +6339,7 @@ input[type="checkbox"] {{ margin-right: 8px; }}
     def export_html(self):
         path, _ = QFileDialog.getSaveFileName(self, "HTML 내보내기", "", "HTML (*.html)")
         if path:
-            self.preview.page().toHtml(lambda html: self._write_file(path, html))
+            self._write_file(path, markdown_to_html_document(self.editor.toPlainText(), self.dark_mode, self.render_cache))
     
     def _write_file(self, path, content):
         with open(path, 'w', encoding='utf-8') as f:
@@ -2572,6 +6388,9 @@ input[type="checkbox"] {{ margin-right: 8px; }}
     
     def insert_template(self, content):
         if self.check_save():
+            # 템플릿은 새 문서로 연다 - 불러오기 중이거나 대용량 파일 모드면 먼저 빠져나온다
+            self.stop_loading()
+            self.close_large_file()
             self.editor.setPlainText(content)
             self.current_file = None
             self.is_modified = True
@@ -2602,203 +6421,70 @@ input[type="checkbox"] {{ margin-right: 8px; }}
         dlg.exec()
     
     def show_find_dialog(self):
-        dlg = FindReplaceDialog(self.editor, self)
-        dlg.show()
-    
-    def manage_snippets(self):
-        dlg = SnippetDialog(self.snippets, self)
-        dlg.exec()
-        self.save_snippets()
-    
-    # ===== 도구 =====
-    def set_word_goal(self):
-        goal, ok = QInputDialog.getInt(self, "단어 목표", "목표 단어 수 (0=비활성화):", 
-                                        self.word_goal, 0, 100000, 100)
-        if ok:
-            self.word_goal = goal
-            self.update_stats()
-            self.save_settings()
-    
-    def format_tables(self):
-        text = self.editor.toPlainText()
-        # 간단한 테이블 정렬 (실제로는 더 복잡한 로직 필요)
-        lines = text.split('\n')
-        # 구현 생략...
-        self.status_bar.showMessage("표 정렬 완료", 2000)
-    
-    def sort_selected_lines(self):
-        cursor = self.editor.textCursor()
-        if cursor.hasSelection():
-            selected = cursor.selectedText()
-            lines = selected.split('\u2029')  # QTextEdit의 줄바꿈
-            lines.sort()
-            cursor.insertText('\n'.join(lines))
-    
-    def remove_empty_lines(self):
-        text = self.editor.toPlainText()
-        lines = [l for l in text.split('\n') if l.strip()]
-        self.editor.setPlainText('\n'.join(lines))
-    
-    def show_stats(self):
-        stats = DocumentStats.calculate(self.editor.toPlainText())
-        dlg = StatsDialog(stats, self)
-        dlg.exec()
-    
-    # ===== Mermaid =====
-    def open_mermaid_viewer(self):
-        text = self.editor.toPlainText()
-        pattern = r'```mermaid\n([\s\S]*?)```'
-        matches = re.findall(pattern, text)
-        
-        code = matches[0].strip() if matches else "flowchart TD\n    A[시작] --> B[끝]"
-        
-        if self.mermaid_viewer is None or not self.mermaid_viewer.isVisible():
-            self.mermaid_viewer = MermaidViewer(code, self.dark_mode, self)
-            self.mermaid_viewer.show()
-        else:
-            self.mermaid_viewer.update_mermaid(code)
-            self.mermaid_viewer.raise_()
-            self.mermaid_viewer.activateWindow()
-    
-    # ===== 보기 =====
-    def toggle_preview(self):
-        sizes = self.splitter.sizes()
-        if sizes[1] > 0:
-            self._preview_size = sizes[1]
-            self.splitter.setSizes([sizes[0] + sizes[1], 0])
-        else:
-            self.splitter.setSizes([sizes[0] - self._preview_size, self._preview_size])
-    
-    def toggle_sidebar(self):
-        self.side_panel.setVisible(not self.side_panel.isVisible())
-    
-    def toggle_focus_mode(self):
-        self.focus_mode = not self.focus_mode
-        self.focus_act.setChecked(self.focus_mode)
-        
-        if self.focus_mode:
-            self.side_panel.hide()
-            self.splitter.widget(1).hide()  # 미리보기 숨김
-            self.menuBar().hide()
-            self.statusBar().hide()
-            self.findChild(QToolBar).hide()
-            
-            style = FOCUS_STYLE_DARK if self.dark_mode else FOCUS_STYLE_LIGHT
-            self.setStyleSheet(style)
-            self.showFullScreen()
-        else:
-            self.exit_focus_mode()
-    
-    def exit_focus_mode(self):
-        if self.focus_mode:
-            self.focus_mode = False
-            self.focus_act.setChecked(False)
-            
-            self.side_panel.show()
-            self.splitter.widget(1).show()
-            self.menuBar().show()
-            self.statusBar().show()
-            self.findChild(QToolBar).show()
-            
-            self.setStyleSheet(self._normal_style)
-            self.showNormal()
-    
-    def toggle_dark_mode(self):
-        self.dark_mode = not self.dark_mode
-        self.dark_act.setChecked(self.dark_mode)
-        self.apply_theme()
+        # 대화상자는 하나만 두고 다시 보여준다 (결과 색인도 그때 다시 만든다)
+        if self.find_dialog is None:
+            self.find_dialog = FindReplaceDialog(self.editor, self.doc_model, self)
+        self.find_dialog.show()
+        self.find_dialog.raise_()
+        self.find_dialog.activateWindow()
+    
+    def show_workspace_search(self):
+        if self.workspace_index is None:
+            folder = self.workspace_dir
+            if not folder or not os.path.isdir(folder):
+                folder = self.choose_workspace()
+                if not folder:
+                    return
+            self.set_workspace(folder)
+        if self.search_dialog is None:
+            self.search_dialog = WorkspaceSearchDialog(self.workspace_index, self)
+            self.search_dialog.open_requested.connect(self.open_search_result)
+            self.search_dialog.folder_requested.connect(self.change_workspace)
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.activateWindow()
+    
+    def choose_workspace(self):
+        start = self.workspace_dir or (os.path.dirname(self.current_file) if self.current_file else "")
+        return QFileDialog.getExistingDirectory(self, "검색할 폴더", start)
+    
+    def change_workspace(self):
+        folder = self.choose_workspace()
+        if folder:
+            self.set_workspace(folder)
+    
+    def set_workspace(self, folder):
+        """폴더 검색 대상을 바꾸고 색인을 연다 (저장된 색인을 읽은 뒤 바뀐 파일만 다시 색인)"""
+        if self.workspace_index is not None:
+            self.workspace_index.shutdown()
+        self.workspace_dir = os.path.abspath(folder)
+        self.workspace_index = WorkspaceIndex(self.workspace_dir, self)
+        self.workspace_index.open()
+        self.quick_open_index.set_workspace(self.workspace_index)
+        if self.search_dialog is not None:
+            self.search_dialog.set_index(self.workspace_index)
         self.save_settings()
-        
-        if self.mermaid_viewer and self.mermaid_viewer.isVisible():
-            self.mermaid_viewer.dark_mode = self.dark_mode
-            self.mermaid_viewer.setStyleSheet(DARK_STYLE if self.dark_mode else LIGHT_STYLE)
-            self.mermaid_viewer.render_mermaid()
-    
-    # ===== 도움말 =====
-    def show_about(self):
-        QMessageBox.about(self, "MarkdownPro", 
-            f"<h2>MarkdownPro v3.0</h2>"
-            f"<p>프로페셔널 마크다운 에디터</p>"
-            f"<hr>"
-            f"<p><b>주요 기능:</b></p>"
-            f"<ul>"
-            f"<li>실시간 미리보기</li>"
-            f"<li>Mermaid 다이어그램 {len(MERMAID_EXAMPLES)}종 지원</li>"
-            f"<li>포커스 모드</li>"
-            f"<li>문서 개요 & 통계</li>"
-            f"<li>스니펫 관리</li>"
-            f"<li>다크 모드</li>"
-            f"</ul>")
-    
-    def show_shortcuts(self):
-        QMessageBox.information(self, "단축키", """
-<h3>단축키 안내</h3>
-<table>
-<tr><td><b>Ctrl+N</b></td><td>새 문서</td></tr>
-<tr><td><b>Ctrl+O</b></td><td>열기</td></tr>
-<tr><td><b>Ctrl+S</b></td><td>저장</td></tr>
-<tr><td><b>Ctrl+F</b></td><td>찾기/바꾸기</td></tr>
-<tr><td><b>Ctrl+1/2/3/4</b></td><td>제목 1/2/3/4</td></tr>
-<tr><td><b>Ctrl+B</b></td><td>굵게</td></tr>
-<tr><td><b>Ctrl+I</b></td><td>기울임</td></tr>
-<tr><td><b>Ctrl+K</b></td><td>링크</td></tr>
-<tr><td><b>Ctrl+M</b></td><td>Mermaid 뷰어</td></tr>
-<tr><td><b>Ctrl+D</b></td><td>날짜 삽입</td></tr>
-<tr><td><b>F11</b></td><td>포커스 모드</td></tr>
-<tr><td><b>Tab</b></td><td>스니펫 확장</td></tr>
-<tr><td><b>Esc</b></td><td>포커스 모드 종료</td></tr>
-</table>
-""")
     
-    def closeEvent(self, event):
-        if not self.check_save():
-            event.ignore()
+    def show_quick_open(self):
+        # 폴더를 정해 두었으면 처음 열 때 색인도 연다 (없으면 최근 파일만)
+        if self.workspace_index is None and self.workspace_dir and os.path.isdir(self.workspace_dir):
+            self.set_workspace(self.workspace_dir)
+        if self.quick_open_dialog is None:
+            self.quick_open_dialog = QuickOpenDialog(self.quick_open_index, self.recent_files, self)
+            self.quick_open_dialog.open_requested.connect(self.open_recent)
+        self.quick_open_dialog.show()
+        self.quick_open_dialog.raise_()
+        self.quick_open_dialog.activateWindow()
+    
+    def open_search_result(self, path, line):
+        if self.current_file and os.path.abspath(self.current_file) == path:
+            self.goto_file_line(line)
             return
-        if selected:
-            cursor.insertText(f"{wrapper}{selected}{wrapper}")
-        else:
-            cursor.insertText(f"{wrapper}{wrapper}")
-            cursor.movePosition(QTextCursor.MoveOperation.Left, n=len(wrapper))
-            self.editor.setTextCursor(cursor)
-        self.editor.setFocus()
-    
-    def insert_completion(self, text):
-        self.editor.textCursor().insertText(text)
-    
-    def insert_template(self, content):
-        if self.check_save():
-            self.editor.setPlainText(content)
-            self.current_file = None
-            self.is_modified = True
-            self.update_title()
-    
-    def insert_table(self):
-        dlg = TableDialog(self)
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            self.insert_at_cursor(dlg.get_markdown())
-    
-    def insert_link(self):
-        cursor = self.editor.textCursor()
-        dlg = LinkDialog(self, cursor.selectedText())
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            if cursor.hasSelection():
-                cursor.insertText(dlg.get_markdown())
-            else:
-                self.insert_text(dlg.get_markdown())
-    
-    def insert_image(self):
-        dlg = ImageDialog(self)
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            self.insert_text(dlg.get_markdown())
-    
-    def insert_emoji(self):
-        dlg = EmojiDialog(self)
-        dlg.emoji_selected.connect(self.insert_text)
-        dlg.exec()
-    
-    def show_find_dialog(self):
-        dlg = FindReplaceDialog(self.editor, self)
-        dlg.show()
+        self.open_file(path)
+        if self._load_path == path:
+            self._goto_after_load = line
+        elif self.large_file is not None and self.current_file == path:
+            self.goto_file_line(line)
     
     def manage_snippets(self):
         dlg = SnippetDialog(self.snippets, self)
@@ -2811,7 +6497,7 @@ input[type="checkbox"] {{ margin-right: 8px; }}
                                         self.word_goal, 0, 100000, 100)
         if ok:
             self.word_goal = goal
-            self.update_stats()
+            self.update_goal_progress()
             self.save_settings()
     
     def format_tables(self):
@@ -2835,17 +6521,34 @@ input[type="checkbox"] {{ margin-right: 8px; }}
         self.editor.setPlainText('\n'.join(lines))
     
     def show_stats(self):
-        stats = DocumentStats.calculate(self.editor.toPlainText())
-        dlg = StatsDialog(stats, self)
+        dlg = StatsDialog(self.doc_bus.analysis().stats, self)
         dlg.exec()
     
+    def show_render_stats(self):
+        st = self.preview_scheduler.stats()
+        cache = self.render_cache
+        code_cache = CodeHighlightCache.shared()
+        bus = self.doc_bus
+        rates = bus.rates()
+        QMessageBox.information(self, "렌더링 통계",
+            f"<b>미리보기 스케줄러</b><br>"
+            f"요청: {st['requested']}<br>"
+            f"병합: {st['coalesced']}<br>"
+            f"실행: {st['executed']}<br>"
+            f"최근 렌더: {st['last_render_ms']:.1f} ms (평균 {st['avg_render_ms']:.1f} ms)<br>"
+            f"대기 시간: {st['delay']} ms<br><br>"
+            f"<b>블록 캐시</b><br>"
+            f"적중: {cache.hits} / 미스: {cache.misses}<br><br>"
+            f"<b>코드 하이라이트 캐시</b><br>"
+            f"적중: {code_cache.hits} / 미스: {code_cache.misses}<br><br>"
+            f"<b>문서 스냅샷/분석</b> (최근 {DocumentBus.RATE_WINDOW:.0f}초)<br>"
+            f"스냅샷: {rates['snapshots']:.1f}/초 (누적 {bus.snapshots})<br>"
+            f"분석: {rates['analyses']:.1f}/초 (누적 {bus.analyses})")
+    
     # ===== Mermaid =====
     def open_mermaid_viewer(self):
-        text = self.editor.toPlainText()
-        pattern = r'```mermaid\n([\s\S]*?)```'
-        matches = re.findall(pattern, text)
-        
-        code = matches[0].strip() if matches else "flowchart TD\n    A[시작] --> B[끝]"
+        sources = self.doc_model.mermaid_sources()
+        code = sources[0].strip() if sources else "flowchart TD\n    A[시작] --> B[끝]"
         
         if self.mermaid_viewer is None or not self.mermaid_viewer.isVisible():
             self.mermaid_viewer = MermaidViewer(code, self.dark_mode, self)
@@ -2933,6 +6636,8 @@ input[type="checkbox"] {{ margin-right: 8px; }}
 <tr><td><b>Ctrl+O</b></td><td>열기</td></tr>
 <tr><td><b>Ctrl+S</b></td><td>저장</td></tr>
 <tr><td><b>Ctrl+F</b></td><td>찾기/바꾸기</td></tr>
+<tr><td><b>Ctrl+Shift+F</b></td><td>폴더에서 찾기</td></tr>
+<tr><td><b>Ctrl+P</b></td><td>빠른 열기</td></tr>
 <tr><td><b>Ctrl+1/2/3/4</b></td><td>제목 1/2/3/4</td></tr>
 <tr><td><b>Ctrl+B</b></td><td>굵게</td></tr>
 <tr><td><b>Ctrl+I</b></td><td>기울임</td></tr>
@@ -2951,6 +6656,12 @@ input[type="checkbox"] {{ margin-right: 8px; }}
             return
         self.save_settings()
         self.save_snippets()
+        if self.render_server is not None:
+            self.render_server.shutdown()
+        if self.find_dialog is not None:
+            self.find_dialog.regex_worker.shutdown()
+        if self.workspace_index is not None:
+            self.workspace_index.shutdown()
         event.accept()
 
 
@@ -2960,7 +6671,8 @@ def resource_path(relative_path):
         # PyInstaller creates a temp folder and stores path in _MEIPASS
         base_path = sys._MEIPASS
     except Exception:
-        base_path = os.path.abspath(".")
+        # 현재 폴더가 아니라 이 파일 옆 - 다른 폴더에서 실행해도 assets/를 찾아 오프라인으로 동작하도록
+        base_path = os.path.dirname(os.path.abspath(__file__))
 
     return os.path.join(base_path, relative_path)
 
@@ -2971,9 +6683,11 @@ def main():
         myappid = 'nebulanote.editor.v1' # arbitrary string
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
 
+    register_asset_scheme()
     app = QApplication(sys.argv)
     app.setApplicationName("Nebula Note")
     app.setOrganizationName("Nebula Note")
+    install_asset_scheme_handler(app)
     
     # Set Window Icon
     from PyQt6.QtGui import QIcon
@@ -2998,11 +6712,12 @@ def main():
                 window.is_modified = False
                 window.open_file(file_path)
             
-            # Use QTimer to open file after the window is shown and event loop starts
-            QTimer.singleShot(100, open_initial)
+            # 창을 먼저 띄우고, 파일은 이벤트 루프가 돌기 시작하면 백그라운드로 불러온다
+            QTimer.singleShot(0, open_initial)
     
     sys.exit(app.exec())
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Markdown 블록 변환 - 미리보기, HTML 내보내기, RenderServer가 spawn한 프로세스에서 함께 쓴다
+
+자식 프로세스가 이 모듈만 불러오도록 Qt를 import하지 않는다.
+"""
+
+import hashlib
+import functools
+from html import escape as html_escape
+from collections import OrderedDict
+
+import markdown
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.util import ClassNotFound
+
+# 마크다운 변환 설정 (미리보기, 렌더 서버, HTML 내보내기 공용)
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code', 'codehilite', 'toc', 'nl2br', 'sane_lists']
+
+# codehilite 기본 설정과 같은 Pygments 스타일 (클래스 방식이라 HTML에는 영향 없고 CSS만 달라짐)
+CODE_HIGHLIGHT_STYLE = 'default'
+
+
+@functools.lru_cache(maxsize=256)
+def pygments_lexer(lang):
+    """언어 이름 -> Pygments 렉서 (모르는 언어면 None)"""
+    try:
+        return get_lexer_by_name(lang)
+    except ClassNotFound:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def pygments_css(style):
+    return HtmlFormatter(style=style).get_style_defs('.codehilite')
+
+
+class CodeHighlightCache:
+    """펜스 코드 블록 하이라이트 결과 LRU - (언어, 코드, 스타일) 키
+
+    codehilite와 같은 옵션으로 변환하므로 HTML이 그대로 같다.
+    프로세스마다 shared() 하나를 미리보기와 HTML 내보내기가 함께 쓴다.
+    """
+    _shared = None
+
+    def __init__(self, max_entries=4000, max_chars=8_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._formatters = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def highlight(self, code, lang=None, style=CODE_HIGHLIGHT_STYLE):
+        key = (lang or '', code, style)
+        html = self._entries.get(key)
+        if html is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return html
+
+        self.misses += 1
+        src = code.strip('\n')
+        lexer = pygments_lexer(lang) if lang else None
+        if lexer is None:
+            try:
+                lexer = guess_lexer(src)  # codehilite guess_lang 기본값과 동일
+            except ClassNotFound:
+                lexer = pygments_lexer('text')
+        formatter = self._formatters.get(style)
+        if formatter is None:
+            formatter = self._formatters[style] = HtmlFormatter(cssclass='codehilite', style=style, wrapcode=True)
+        html = highlight(src, lexer, formatter)
+
+        self._entries[key] = html
+        self._chars += len(code) + len(html)
+        while self._entries and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+            (_, old_code, _), old_html = self._entries.popitem(last=False)
+            self._chars -= len(old_code) + len(old_html)
+        return html
+
+    def clear(self):
+        self._entries.clear()
+        self._chars = 0
+
+
+class CachedFencedBlockPreprocessor(FencedBlockPreprocessor):
+    """속성 없는 펜스는 CodeHighlightCache로 바로 바꾸고, 속성/hl_lines가 있는 펜스만 fenced_code에 맡긴다"""
+
+    def __init__(self, md, config, cache):
+        super().__init__(md, config)
+        self.cache = cache
+
+    def run(self, lines):
+        text = '\n'.join(lines)
+        parts = []
+        index = 0
+        for m in self.FENCED_BLOCK_RE.finditer(text):
+            if m.group('lang') == 'mermaid':
+                # 문서 전체를 한 번에 변환할 때([TOC] 등)도 다이어그램은 mermaid.js용 div로
+                html = mermaid_div(m.group('code').rstrip('\n'))
+            elif m.group('attrs') or m.group('hl_lines'):
+                continue
+            else:
+                html = self.cache.highlight(m.group('code'), m.group('lang'))
+            parts.append(text[index:m.start()])
+            parts.append(f'\n{self.md.htmlStash.store(html)}\n')
+            index = m.end()
+        if parts:
+            parts.append(text[index:])
+            text = ''.join(parts)
+        return super().run(text.split('\n'))
+
+
+class MarkdownConverter:
+    """재사용하는 Markdown 변환기
+
+    확장 로딩과 레지스트리 구성은 생성할 때 한 번만 하고, 변환마다 reset()만 한다.
+    스레드 안전하지 않으므로 프로세스(렌더 서버 포함)마다 shared() 인스턴스를 UI 스레드에서만 쓴다.
+    """
+    _shared = None
+
+    def __init__(self):
+        self._md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        fenced = self._md.preprocessors['fenced_code_block']
+        self._md.preprocessors.register(
+            CachedFencedBlockPreprocessor(self._md, fenced.config, CodeHighlightCache.shared()),
+            'fenced_code_block', 25)
+        self.conversions = 0
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def convert(self, text):
+        self.conversions += 1
+        self._md.reset()
+        return self._md.convert(text)
+
+
+def render_markdown_block(block, converter=None):
+    """블록 하나를 HTML로 변환 (Mermaid 블록은 mermaid.js용 div로, 코드 펜스 하나뿐인 블록은 하이라이트 캐시에서)
+
+    펜스는 CachedFencedBlockPreprocessor와 같은 FENCED_BLOCK_RE로 알아본다 - ~~~, 네 개 이상의 `도
+    문서 전체 변환과 똑같이 다이어그램이 되도록.
+    """
+    m = FencedBlockPreprocessor.FENCED_BLOCK_RE.match(block)
+    if m and m.end() == len(block):
+        if m.group('lang') == 'mermaid':
+            return mermaid_div(m.group('code').rstrip('\n'))
+        if not m.group('attrs') and not m.group('hl_lines'):
+            return CodeHighlightCache.shared().highlight(m.group('code'), m.group('lang')).rstrip('\n')
+    return (converter or MarkdownConverter.shared()).convert(block)
+
+
+def mermaid_div(code):
+    # 소스는 이스케이프해 둔다 - 소스 속 </div>가 div를 닫지 않도록 (Mermaid는 textContent로 읽는다)
+    return f'<div class="mermaid" data-src="{mermaid_source_key(code)}">\n{html_escape(code, quote=False)}\n</div>'
+
+
+def mermaid_source_key(source):
+    return hashlib.sha1(source.strip().encode('utf-8')).hexdigest()
+
+
+def render_server_main(jobs, results):
+    """렌더 서버 프로세스 본체 - 밀린 작업은 건너뛰고 최신 작업만 변환한다"""
+    job = None
+    while True:
+        if job is None:
+            try:
+                job = jobs.recv()
+            except (EOFError, OSError):
+                return
+        while jobs.poll():
+            job = jobs.recv()
+        if job is None:
+            return
+        generation, blocks = job
+        job = None
+        rendered = []
+        complete = True
+        for key, block in blocks:
+            # 더 새로운 작업이 오면 지금까지의 결과만 보내고 중단
+            if jobs.poll():
+                complete = False
+                break
+            rendered.append((key, render_markdown_block(block)))
+        results.send((generation, rendered, complete))
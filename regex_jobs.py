@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+정규식 찾기/바꾸기 작업 - RegexWorker가 spawn한 프로세스에서도 실행된다
+
+자식 프로세스가 이 모듈만 불러오도록 Qt를 import하지 않는다.
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+
+ASTRAL_PATTERN = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def find_line_matches(pattern, text):
+    """text에서 찾은 결과를 줄별 [(시작 열, 끝 열), ...] 목록으로
+
+    열은 Qt 위치와 같은 UTF-16 단위다. 빈 결과는 뺀다.
+    줄을 넘어가는 결과는 시작 줄에 두고, 끝 열은 시작 줄 기준으로 센다 (줄바꿈도 한 칸이라 줄 길이보다 크다).
+    """
+    lines = text.split('\n')
+    result = [()] * len(lines)
+    wide = ASTRAL_PATTERN.search(text) is not None
+    line = 0
+    line_start = 0
+    line_end = len(lines[0])
+    bucket = None
+    astral = None  # 현재 줄의 BMP 밖 문자 위치 (UTF-16에서 2칸)
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if start == end:
+            continue
+        # 결과는 위치 순서로 나오므로 줄은 앞으로만 이동
+        while start > line_end:
+            line += 1
+            line_start = line_end + 1
+            line_end = line_start + len(lines[line])
+            bucket = astral = None
+        col, end_col = start - line_start, end - line_start
+        if wide:
+            if astral is None:
+                astral = [m.start() for m in ASTRAL_PATTERN.finditer(lines[line])]
+            if astral:
+                col += bisect_left(astral, col)
+                end_col += bisect_left(astral, end_col)
+        if end > line_end and wide:
+            end_col = col + end - start + len(ASTRAL_PATTERN.findall(text, start, end))
+        if bucket is None:
+            bucket = result[line] = []
+        bucket.append((col, end_col))
+    return result
+
+
+def replacement_edits(pattern, text, replacement, expand=False):
+    """모두 바꾸기 편집 목록 [(시작, 끝, 바꿀 문자열), ...] - 한 번의 탐색, 위치는 Qt(UTF-16) 단위
+
+    expand가 True면 replacement의 \\1, \\g<이름> 같은 참조를 결과마다 채운다 (정규식 모드).
+    """
+    astral = [m.start() for m in ASTRAL_PATTERN.finditer(text)]
+    edits = []
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if astral:
+            start += bisect_left(astral, start)
+            end += bisect_left(astral, end)
+        edits.append((start, end, match.expand(replacement) if expand else replacement))
+    return edits
+
+
+def template_error(pattern, template):
+    """template의 \\1, \\g<이름> 같은 참조가 pattern에 맞지 않으면 오류 메시지, 맞으면 None"""
+    try:
+        pattern.sub(template, '')  # 찾은 결과가 없어도 바꿀 문자열은 먼저 해석한다
+    except (re.error, IndexError) as e:  # 없는 그룹 이름은 IndexError
+        return str(e)
+    return None
+
+
+def regex_server_main(jobs, results):
+    """정규식 작업 프로세스 본체 - 컴파일한 패턴은 작업 사이에 재사용한다"""
+    compiled = OrderedDict()
+    while True:
+        try:
+            job = jobs.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        job_id, kind, source, flags, text, args = job
+        results.send(('start', job_id, None))
+        # 작업 하나의 예외로 프로세스가 끝나면 다음 작업까지 거절되므로, 오류는 결과로 돌려준다
+        try:
+            key = (source, flags)
+            pattern = compiled.pop(key, None) or re.compile(source, flags)
+            compiled[key] = pattern
+            if len(compiled) > 32:
+                compiled.popitem(last=False)
+            result = run_regex_job(kind, pattern, text, args)
+        except Exception as e:
+            results.send(('error', job_id, str(e) or type(e).__name__))
+            continue
+        results.send(('done', job_id, result))
+
+
+def run_regex_job(kind, pattern, text, args):
+    """kind='lines'면 find_line_matches, 그 밖에는 replacement_edits"""
+    if kind == 'lines':
+        return find_line_matches(pattern, text)
+    return replacement_edits(pattern, text, *args)
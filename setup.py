@@ -6,7 +6,7 @@ py2app 설정 파일 - MarkdownPro macOS 앱 빌드
 from setuptools import setup
 
 APP = ['markdown_editor.py']
-DATA_FILES = ['icon.ico']
+DATA_FILES = ['icon.ico', ('assets', ['assets/mermaid.min.js'])]
 
 OPTIONS = {
     'argv_emulation': False,
@@ -53,6 +53,7 @@ OPTIONS = {
         'PyQt6.QtWidgets', 
         'PyQt6.QtGui',
         'PyQt6.QtWebEngineWidgets',
+        'PyQt6.QtWebEngineCore',
         'PyQt6.QtWebChannel',
         'PyQt6.QtPrintSupport',
         'markdown.extensions.tables',
@@ -61,6 +62,8 @@ OPTIONS = {
         'markdown.extensions.toc',
         'markdown.extensions.nl2br',
         'markdown.extensions.sane_lists',
+        'regex_jobs',
+        'markdown_render',
     ],
     'excludes': ['tkinter', 'test'],
     'resources': ['icon.ico'],
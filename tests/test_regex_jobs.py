@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""regex_jobs 위치 계산 테스트 - Qt 없이 실행된다 (python -m pytest)"""
+
+import re
+import threading
+from multiprocessing import Pipe
+
+import pytest
+
+from regex_jobs import find_line_matches, regex_server_main, replacement_edits, run_regex_job, template_error
+
+
+def apply_edits(text, edits):
+    """edits(Qt/UTF-16 위치)를 뒤에서부터 적용 - 에디터의 모두 바꾸기와 같은 순서"""
+    buf = text.encode('utf-16-le')
+    for start, end, replacement in reversed(edits):
+        buf = buf[:2 * start] + replacement.encode('utf-16-le') + buf[2 * end:]
+    return buf.decode('utf-16-le')
+
+
+# ============== find_line_matches ==============
+
+def test_line_matches_are_grouped_by_line():
+    assert find_line_matches(re.compile('o'), "foo\nbar\nbo") == [[(1, 2), (2, 3)], (), [(1, 2)]]
+
+
+def test_columns_count_astral_characters_as_two_units():
+    # 😀는 UTF-16에서 2칸이므로 뒤의 결과 열이 한 칸씩 밀린다
+    assert find_line_matches(re.compile('a'), "a😀a\n😀😀a") == [[(0, 1), (3, 4)], [(4, 5)]]
+
+
+def test_astral_characters_inside_the_match_widen_it():
+    assert find_line_matches(re.compile('x😀+'), "x😀😀y") == [[(0, 5)]]
+
+
+def test_empty_matches_are_skipped():
+    assert find_line_matches(re.compile('^', re.MULTILINE), "a\nb") == [(), ()]
+
+
+def test_multiline_anchors_match_every_line():
+    assert find_line_matches(re.compile('^b', re.MULTILINE), "ab\nb\nbb") == [(), [(0, 1)], [(0, 1)]]
+
+
+def test_cross_line_match_stays_on_its_start_line():
+    # 끝 열은 시작 줄 기준이라 줄 길이보다 크다 (줄바꿈도 한 칸)
+    assert find_line_matches(re.compile('a\nb'), "xa\nb\nc") == [[(1, 4)], (), ()]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("😀a\nb", [[(2, 5)], ()]),    # 앞에 BMP 밖 문자
+    ("a\n😀b", [[(0, 5)], ()]),    # 결과 안에 BMP 밖 문자
+])
+def test_cross_line_match_with_astral_characters(text, expected):
+    assert find_line_matches(re.compile('a\n😀?b'), text) == expected
+
+
+def test_no_match_keeps_one_entry_per_line():
+    assert find_line_matches(re.compile('z'), "a\n\nb") == [(), (), ()]
+
+
+# ============== replacement_edits ==============
+
+def test_literal_edits_use_utf16_positions():
+    assert replacement_edits(re.compile('a'), "a😀a", 'X') == [(0, 1, 'X'), (3, 4, 'X')]
+
+
+def test_literal_replacement_is_not_expanded():
+    assert replacement_edits(re.compile('(a)'), "a", r'\1') == [(0, 1, r'\1')]
+
+
+def test_expand_fills_group_references():
+    pattern = re.compile(r'(?P<word>[a-z]+)(\d)')
+    assert replacement_edits(pattern, "ab1 c2", r'\2\g<word>', expand=True) == [(0, 3, '1ab'), (4, 6, '2c')]
+
+
+@pytest.mark.parametrize('pattern, template, text', [
+    (r'foo', '😀bar', "😀 foo x\nfoo😀foo\n"),
+    (r'f(o+)(\d*)', r'<\2|\1>', "foo1 😀 fooo\nfo22"),
+    (r'^', '> ', "a\n😀\n\nb"),
+    (r'a\nb', '-', "a\nb😀a\nb"),
+    (r'(?<!\w)x(?!\w)', 'Y', "x xx 😀x x"),
+])
+def test_edits_reproduce_re_sub(pattern, template, text):
+    compiled = re.compile(pattern, re.MULTILINE)
+    edits = replacement_edits(compiled, text, template, expand=True)
+    assert apply_edits(text, edits) == compiled.sub(template, text)
+
+
+def test_run_regex_job_dispatches_by_kind():
+    pattern = re.compile('b')
+    assert run_regex_job('lines', pattern, "ab\nb", ()) == [[(1, 2)], [(0, 1)]]
+    assert run_regex_job('edits', pattern, "ab", ('c', False)) == [(1, 2, 'c')]
+
+
+# ============== template_error ==============
+
+@pytest.mark.parametrize('template', [r'\2', r'\g<name>', 'x\\', r'\g<1'])
+def test_template_error_reports_bad_templates(template):
+    assert template_error(re.compile('(a)'), template)
+
+
+@pytest.mark.parametrize('template', ['', 'plain', r'\1', r'\g<0>', r'[\1]\n'])
+def test_template_error_accepts_valid_templates(template):
+    assert template_error(re.compile('(a)'), template) is None
+
+
+# ============== regex_server_main ==============
+
+def test_server_reports_job_errors_and_keeps_running():
+    job_recv, jobs = Pipe(duplex=False)
+    results, result_send = Pipe(duplex=False)
+    server = threading.Thread(target=regex_server_main, args=(job_recv, result_send), daemon=True)
+    server.start()
+
+    jobs.send((1, 'edits', '(a)', 0, "aa", (r'\2', True)))
+    assert results.recv() == ('start', 1, None)
+    kind, job_id, message = results.recv()
+    assert (kind, job_id) == ('error', 1) and 'group' in message
+
+    jobs.send((2, 'lines', '(a)', 0, "aa", ()))
+    assert results.recv() == ('start', 2, None)
+    assert results.recv() == ('done', 2, [[(0, 1), (1, 2)]])
+
+    jobs.send(None)
+    server.join(5)
+    assert not server.is_alive()